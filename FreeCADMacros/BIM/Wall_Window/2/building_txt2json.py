@@ -1,5 +1,9 @@
 import json
-import math
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from wall_grammar import parse_wall
 
 INPUT_FILE = "building.txt"
 OUTPUT_FILE = "parseddata.json"
@@ -57,80 +61,31 @@ def parse_types(lines, defaults, is_window=False):
 
     return result
 
-def direction_to_angle(direction):
-    return {
-        "N": 90,
-        "E": 0,
-        "S": 270,
-        "W": 180
-    }.get(direction.upper())
-
 def parse_wall_line(line, defaults):
     label, rest = map(str.strip, line.split(":", 1))
-    tokens = rest.split()
-    start = tokens.pop(0)
-    x0, y0 = map(float, start.split(","))
-    start_point = [x0, y0]
-    curr_angle = None
-    points = [start_point[:]]
+    wall = parse_wall(rest)
 
     height = float(defaults.get("wall_height", 3000))
     thickness_factor = float(defaults.get("wall_thickness", 1.0))
     brick = float(defaults.get("brick", 230.0))
     thickness = round(thickness_factor * brick, 4)
-    closed = False
-
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        if token.lower() == 'c':
-            closed = True
-            i += 1
-            continue
-        if token.lower() == 'o':
-            i += 1
-            continue
-        if '=' in token:
-            key, val = token.split("=")
-            if key == "height":
-                height = float(val)
-            elif key in ("thick", "thickness"):
-                thickness = round(float(val) * brick, 4)
-            i += 1
-            continue
-
-        if token[-1].upper() in "NSEW":
-            length = float(token[:-1])
-            angle = direction_to_angle(token[-1])
-        elif "<" in token:
-            parts = token.split("<")
-            length = float(parts[0])
-            delta_angle = float(parts[1])
-            if curr_angle is None:
-                raise ValueError("First segment must use absolute direction (e.g. 3000E)")
-            angle = (curr_angle + delta_angle) % 360
-        else:
-            raise ValueError(f"Invalid segment format: {token}")
-
-        curr_angle = angle
-        radians = math.radians(angle)
-        dx = length * math.cos(radians)
-        dy = length * math.sin(radians)
-        x0 += dx
-        y0 += dy
-        points.append([round(x0, 4), round(y0, 4)])
-        i += 1
+    for key, val in wall["options"].items():
+        if key == "height":
+            height = float(val)
+        elif key in ("thick", "thickness"):
+            thickness = round(float(val) * brick, 4)
 
-    if closed and points[-1] != start_point:
-        points.append(start_point[:])  # explicitly close the wall path
+    points = [[round(x, 4), round(y, 4)] for x, y in wall["points"]]
+    if wall["closed"]:
+        points[-1] = wall["start"][:]  # explicitly close the wall path
 
     return {
         "label": label,
-        "start": start_point,
+        "start": wall["start"],
         "path": points,
         "height": round(height, 4),
         "thickness": thickness,
-        "closed": closed,
+        "closed": wall["closed"],
         "openings": []
     }
 
@@ -1,166 +1,73 @@
-import FreeCAD, Draft, Arch
-import csv
-
-DEBUG = False  # Global flag for enabling/disabling debugging
-red = (1.0, 0.0, 0.0)
-
-def create_walls_from_csv(filepath):
-    """Creates walls and doors/windows from structured CSV data with optional debugging."""
-    
-    global DEBUG
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from build_plan import plan_from_csv, stream_csv, execute_plan, execute_chunks, FreeCADBackend, PlanError
+
+CSV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.csv")  # Replace with your CSV file path
+LOG_LEVEL = logging.INFO  # logging.DEBUG prints every CSV row
+CHUNK_WALLS = 500         # Walls built per recompute while the file is read; 0 validates the whole file first
+
+def setup_logging(level=LOG_LEVEL):
+    log = logging.getLogger("build_plan")
+    log.setLevel(level)
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)  # FreeCAD's report view
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+
+def create_walls_from_csv(filepath, chunk_walls=CHUNK_WALLS):
+    """Creates walls and doors/windows from structured CSV data.
+
+    With `chunk_walls` the file is streamed (see `build_plan.stream_csv`):
+    walls are built in chunks as soon as their rows are read, and walls with
+    bad rows are skipped and reported at the end.  With 0 the whole file is
+    planned and validated first, so a bad row is reported before any Arch
+    geometry is built.
+    """
     print("\n--- Starting Wall & Opening Creation ---\n")
-
-    try:
-        with open(filepath, 'r') as csvfile:
-            reader = csv.reader(csvfile)
-            rows = list(reader)
-
-            if not rows:
-                print("❌ Error: CSV file is empty.")
-                return
-
-            print("✅ CSV file loaded successfully.\n")
-
-            i = 0
-            while i < len(rows):
-                row = rows[i]
-
-                # ✅ **Check for empty rows before accessing `row[0]`**
-                if not row or len(row) == 0:  
-                    if DEBUG: print(f"⚠️  Skipping completely empty row at {i+1}.")
-                    i += 1
-                    continue
-
-                print(f"🔍 Processing Row {i+1}: {row}")  # Debug log for each row
-
-                # Check for debugging mode
-                if row[0].strip().lower() == "debugging":
-                    if len(row) > 1 and row[1].strip().lower() in ["y", "yes"]:
-                        DEBUG = True
-                        print("🛠️  Debugging Mode Enabled 🛠️")
-                    else:
-                        DEBUG = False
-                    i += 1
-                    continue
-
-                # Skip comment lines
-                if row[0].startswith("#"):  
-                    if DEBUG: print(f"🔹 Skipping comment at row {i+1}.")
-                    i += 1
-                    continue
-
-                if row[0].strip().lower() == "walllabel":  # Skip main headers
-                    if DEBUG: print(f"🔹 Skipping main header row at {i+1}.")
-                    i += 1
-                    continue
-
-                if row[0] == "":  # Door/window header or entry
-                    if len(row) < 7:
-                        print(f"⚠️ Skipping incomplete door/window row at {i+1}: {row}")
-                        i += 1
-                        continue
-
-                    if "doorWindowLabel" in row:  # Secondary header for openings
-                        if DEBUG: print(f"🔹 Skipping door/window header row at {i+1}.")
-                    else:
-                        if DEBUG: print(f"⚠️ Unexpected blank first column at row {i+1}: {row}")
-                    i += 1
-                    continue
-
-                # If a new wall starts
-                if row[0].strip():  
-                    if len(row) < 8:
-                        print(f"❌ Error: Insufficient data for wall at row {i+1}. Skipping...")
-                        i += 1
-                        continue
-
-                    print(f"\n🔹 Creating Wall: {row[0]}")
-                    current_wall = create_wall(row)
-                    i += 1  
-
-                    # Process associated doors/windows
-                    while i < len(rows) and rows[i] and rows[i][0] == "":
-                        if DEBUG: print(f"   ➡ Processing door/window at Row {i+1}: {rows[i]}")
-                        create_door_window(rows[i], current_wall)
-                        i += 1  
-
-                    # Move and orient the wall after all doors/windows are created
-                    reposition_wall(current_wall, row)
-
-                else:
-                    if DEBUG: print(f"⚠️  Unexpected blank first column at row {i+1}. Skipping...")
-                    i += 1  
-    
-    except FileNotFoundError:
+    if not os.path.exists(filepath):
         print(f"❌ Error: File not found at {filepath}")
-    except Exception as e:
-        print(f"❌ An error occurred: {e}")
+        return
+
+    if chunk_walls:
+        errors = []
+        try:
+            count = execute_chunks(stream_csv(filepath, chunk_walls, errors), FreeCADBackend())
+            print(f"🔹 Created {count} walls")
+        except Exception as e:
+            print(f"❌ An error occurred: {e}")
+        if errors:
+            print(f"⚠️ {len(errors)} problem(s) in {filepath}, those walls were skipped:")
+            for error in errors:
+                print(f"   {error}")
+        print("\n✅ Wall & Opening Creation Completed!\n")
+        return
 
-    print("\n✅ Wall & Opening Creation Completed!\n")
-
-def create_wall(row):
-    """Creates a wall in FreeCAD."""
     try:
-        label, x, y, z, angle, length, width, height = row
-        x, y, z, angle, length, width, height = map(float, [x, y, z, angle, length, width, height])
-
-        p1 = FreeCAD.Vector(0, 0, 0)
-        p2 = FreeCAD.Vector(length, 0, 0)
-        baseline = Draft.makeLine(p1, p2)
-        wall = Arch.makeWall(baseline, length=None, width=width, height=height, align="Right")
+        ops = plan_from_csv(filepath)
+    except PlanError as e:
+        print(f"❌ {len(e.errors)} problem(s) in {filepath}, nothing was created:")
+        for error in e.errors:
+            print(f"   {error}")
+        return
+
+    if not ops:
+        print("❌ Error: CSV file has no walls.")
+        return
+    print(f"✅ CSV file planned successfully: {len(ops)} operations.\n")
 
-        wall.Label = label
-
-        if DEBUG: print(f"   ✅ Wall Created: {label} at ({x}, {y}, {z}) with angle {angle}°")
-        
-        FreeCAD.ActiveDocument.recompute()
-        return wall
-    except Exception as e:
-        print(f"❌ Error creating wall '{row[0]}': {e}")
-        return None
-
-def create_door_window(row, wall):
-    """Creates a door/window in FreeCAD and attaches it to a wall."""
     try:
-        _, label, type, width, height, x, z = row
-        width, height, x, z = map(float, [width, height, x, z])
-
-        base = FreeCAD.Vector(x, 0, z)
-        axis = FreeCAD.Vector(1, 0, 0)
-        place = FreeCAD.Placement(base, FreeCAD.Rotation(axis, 90))
-
-        door_window = Arch.makeWindowPreset(
-            type, width=width, height=height, h1=100, h2=100, h3=100, w1=200, w2=100, o1=0, o2=100, placement=place
-        )
-
-        door_window.Label = label
-        door_window.Hosts = [wall]
-        view = door_window.ViewObject
-        view.ShapeColor = red      # Sets the solid shape color
-        view.LineColor = red       # Sets line color (wireframe)
-        view.PointColor = red      # Sets color of points (if any)
-
-        if DEBUG: print(f"   ✅ {type} '{label}' added at ({x}, 0, {z}) to Wall: {wall.Label}")
-        
-        FreeCAD.ActiveDocument.recompute()
+        walls = execute_plan(ops, FreeCADBackend())
+        print(f"🔹 Created {len(walls)} walls")
     except Exception as e:
-        print(f"❌ Error creating {row[1]}: {e}")
-
-def reposition_wall(wall, row):
-    """Moves and rotates the wall to its final position."""
-    try:
-        _, x, y, z, angle, _, _, _ = row
-        x, y, z, angle = map(float, [x, y, z, angle])
-
-        wall.Placement = FreeCAD.Placement(FreeCAD.Vector(x, y, z), FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), angle))
-        FreeCAD.ActiveDocument.recompute()
+        print(f"❌ An error occurred: {e}")
 
-        if DEBUG: print(f"   🔄 Wall '{wall.Label}' repositioned to ({x}, {y}, {z}) with {angle}° rotation")
-    except Exception as e:
-        print(f"❌ Error repositioning wall '{wall.Label}': {e}")
+    print("\n✅ Wall & Opening Creation Completed!\n")
 
-# Example usage
-csv_file_path = "C:/Users/GNE3/Downloads/data21B.csv"  # Replace with your CSV file path
-# csv_file_path = "/home/hsrai/FreeCAD/data.csv"  # Replace with your CSV file path
-create_walls_from_csv(csv_file_path)
-print(f"\n🔹 Macro execution is over: Good CSV\n")
+# FreeCAD runs macros as __main__; importing this file builds nothing
+if __name__ == "__main__":
+    setup_logging()
+    create_walls_from_csv(CSV_FILE)
+    print(f"\n🔹 Macro execution is over: Good CSV\n")
@@ -0,0 +1,543 @@
+"""Headless planning stage for the wall/opening macros.
+
+The CSV macro (`Walls_n_Windows.py`) and `2/building.FCMacro` used to parse,
+validate and build FreeCAD objects in one pass.  This module does the first two
+steps without FreeCAD: it turns the input into a flat list of operations that
+has already been validated, and `execute_plan` then hands every operation to a
+backend.  `FreeCADBackend` builds the real Arch objects, `RecordingBackend`
+only records the calls so the whole pipeline can run (and be timed) anywhere.
+
+Operations are plain dicts:
+
+    {"op": "wall", "id", "label", "path", "width", "height", "align"}
+    {"op": "opening", "wall", "label", "preset", "width", "height",
+     "base", "axis", "angle", "color"}
+    {"op": "place", "wall", "base", "angle"}
+
+CSV files can also be streamed: `stream_csv` yields the operations in chunks
+of complete walls while the file is still being read, and `execute_chunks`
+builds each chunk as it arrives, so memory stays flat for large site files.
+
+Usage: python build_plan.py data.csv|parseddata.json [repeat] [--stream [walls]]
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import math
+import sys
+import time
+import tracemalloc
+
+log = logging.getLogger(__name__)
+
+RED = (1.0, 0.0, 0.0)
+CHUNK_WALLS = 500  # Walls per chunk when streaming
+
+# Fixed frame parameters passed to Arch.makeWindowPreset by every macro
+WINDOW_FRAME = {"h1": 100, "h2": 100, "h3": 100, "w1": 200, "w2": 100, "o1": 0, "o2": 100}
+
+
+class PlanError(ValueError):
+    """Raised when the input has rows that cannot be built; `errors` lists them all."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("\n".join(self.errors))
+
+
+def _floats(values, names, where, errors):
+    try:
+        return [float(v) for v in values]
+    except ValueError:
+        errors.append(f"{where}: non-numeric value in {', '.join(names)}: {list(values)}")
+        return None
+
+
+# ----------------------------- CSV input -----------------------------------
+
+def _plan_csv_wall(row, where, wall_id, errors):
+    if len(row) != 8:
+        errors.append(f"{where}: wall needs 8 columns, got {len(row)}: {row}")
+        return None
+    label = row[0].strip()
+    nums = _floats(row[1:], ("WallX", "WallY", "WallZ", "WallAngle", "WallLength", "WallWidth", "WallHeight"), where, errors)
+    if nums is None:
+        return None
+    x, y, z, angle, length, width, height = nums
+    if length <= 0 or width <= 0 or height <= 0:
+        errors.append(f"{where}: wall '{label}' needs positive length, width and height")
+        return None
+    wall = {
+        "op": "wall", "id": wall_id, "label": label,
+        "path": [[0.0, 0.0], [length, 0.0]],
+        "width": width, "height": height, "align": "Right",
+    }
+    place = {"op": "place", "wall": wall_id, "base": [x, y, z], "angle": angle}
+    return wall, place
+
+
+def _plan_csv_opening(row, where, wall, errors):
+    if len(row) != 7:
+        errors.append(f"{where}: door/window needs 7 columns, got {len(row)}: {row}")
+        return None
+    _, label, preset, *rest = row
+    nums = _floats(rest, ("doorWindowWidth", "doorWindowHeight", "doorWindowX", "doorWindowZ"), where, errors)
+    if nums is None:
+        return None
+    width, height, x, z = nums
+    length = wall["path"][-1][0]
+    if width <= 0 or height <= 0:
+        errors.append(f"{where}: '{label}' needs positive width and height")
+        return None
+    if x < 0 or x + width > length:
+        errors.append(f"{where}: '{label}' ({x} + {width}) does not fit in wall '{wall['label']}' of length {length}")
+        return None
+    if z < 0 or z + height > wall["height"]:
+        errors.append(f"{where}: '{label}' ({z} + {height}) does not fit in wall '{wall['label']}' of height {wall['height']}")
+        return None
+    return {
+        "op": "opening", "wall": wall["id"], "label": label.strip(), "preset": preset.strip(),
+        "width": width, "height": height,
+        "base": [x, 0.0, z], "axis": [1, 0, 0], "angle": 90, "color": RED,
+    }
+
+
+def iter_groups(rows, errors):
+    """Yields the operations of each wall, [wall, *openings, place], from CSV rows.
+
+    A wall is yielded as soon as the next wall row (or the end of the input)
+    is read.  Problems are appended to `errors` and a wall with a problem in
+    any of its rows is not yielded.  Rows are logged at DEBUG level, or at
+    INFO after a `Debugging,y` row in the file.
+    """
+    group = None  # False while the rows under a rejected wall are skipped
+    place = None
+    group_errors = 0
+    wall_count = 0
+    row_level = logging.DEBUG
+    for i, row in enumerate(rows, start=1):
+        where = f"row {i}"
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        log.log(row_level, "%s: %s", where, row)
+        head = row[0].strip()
+        if head.lower() == "debugging":
+            row_level = logging.INFO if len(row) > 1 and row[1].strip().lower() in ("y", "yes") else logging.DEBUG
+            continue
+        if head.lower() == "walllabel" or head.startswith("#"):
+            continue
+        if head == "":
+            if "doorWindowLabel" in row:
+                continue
+            if group is None:
+                errors.append(f"{where}: door/window row without a wall above it: {row}")
+                continue
+            if group is False:
+                continue
+            opening = _plan_csv_opening(row, where, group[0], errors)
+            if opening:
+                group.append(opening)
+            continue
+
+        # A new wall closes the previous one: it is moved into place after its openings
+        if group and len(errors) == group_errors:
+            yield group + [place]
+        group, place = False, None
+        planned = _plan_csv_wall(row, where, wall_count, errors)
+        if planned:
+            wall, place = planned
+            group = [wall]
+            group_errors = len(errors)
+            wall_count += 1
+    if group and len(errors) == group_errors:
+        yield group + [place]
+
+
+def plan_from_rows(rows):
+    """Turns CSV rows (lists of strings) into a validated list of operations."""
+    errors = []
+    ops = [op for group in iter_groups(rows, errors) for op in group]
+    if errors:
+        raise PlanError(errors)
+    return ops
+
+
+def csv_rows(filepath):
+    """Rows of a CSV file, read as they are consumed."""
+    with open(filepath, newline="") as csvfile:
+        yield from csv.reader(csvfile)
+
+
+def plan_from_csv(filepath):
+    """Reads a wall/opening CSV file and returns its validated operations."""
+    return plan_from_rows(csv_rows(filepath))
+
+
+def chunked(groups, walls=CHUNK_WALLS):
+    """Joins wall groups (see `iter_groups`) into lists of operations of `walls` walls each."""
+    chunk = []
+    count = 0
+    for group in groups:
+        chunk.extend(group)
+        count += 1
+        if count == walls:
+            yield chunk
+            chunk, count = [], 0
+    if chunk:
+        yield chunk
+
+
+def stream_csv(filepath, walls=CHUNK_WALLS, errors=None):
+    """Operations of a CSV file in chunks of complete walls, while it is read.
+
+    Unlike `plan_from_csv` nothing is validated up front: problems are
+    appended to `errors` and their walls are left out.
+    """
+    errors = [] if errors is None else errors
+    return chunked(iter_groups(csv_rows(filepath), errors), walls)
+
+
+# ----------------------------- JSON input ----------------------------------
+
+def plan_from_json(data):
+    """Turns parsed building data (see `building_txt2json.py`) into validated operations."""
+    ops = []
+    errors = []
+    window_types = data.get("window_types", {})
+    door_types = data.get("door_types", {})
+
+    for wall_id, wall in enumerate(data["walls"]):
+        label = wall["label"]
+        path = wall["path"]
+        height = wall.get("height", 3000)
+        thickness = wall.get("thickness", 230)
+        if len(path) < 2:
+            errors.append(f"wall {label}: path needs at least two points")
+            continue
+        if height <= 0 or thickness <= 0:
+            errors.append(f"wall {label}: height and thickness must be positive")
+            continue
+        ops.append({
+            "op": "wall", "id": wall_id, "label": label,
+            "path": [list(p) for p in path],
+            "width": thickness, "height": height, "align": "Center",
+        })
+
+        for opening in wall.get("openings", []):
+            seg_idx = opening["segment_index"]
+            pos = opening["position"]
+            ref = opening["ref"]
+            where = f"wall {label}, opening {ref}"
+
+            if seg_idx < 0 or seg_idx >= len(path) - 1:
+                errors.append(f"{where}: segment index {seg_idx} out of bounds")
+                continue
+            (x0, y0), (x1, y1) = path[seg_idx][:2], path[seg_idx + 1][:2]
+            length = math.hypot(x1 - x0, y1 - y0)
+            if pos < 0 or pos >= length:
+                errors.append(f"{where}: position {pos} outside segment of length {length:.1f}")
+                continue
+
+            types = window_types if opening["type"] == "window" else door_types
+            preset_info = types.get(ref)
+            if not preset_info:
+                errors.append(f"{where}: no preset found for {ref}")
+                continue
+
+            ux, uy = (x1 - x0) / length, (y1 - y0) / length
+            ops.append({
+                "op": "opening", "wall": wall_id, "label": f"{label}_{ref}",
+                "preset": preset_info["preset"],
+                "width": float(preset_info["width"]), "height": float(preset_info["height"]),
+                "base": [x0 + ux * pos, y0 + uy * pos, 0.0],
+                "axis": [1, 0, 0], "angle": math.degrees(math.atan2(uy, ux)), "color": None,
+            })
+
+    if errors:
+        raise PlanError(errors)
+    return ops
+
+
+def plan_from_json_file(json_file):
+    with open(json_file) as f:
+        return plan_from_json(json.load(f))
+
+
+# ----------------------------- Execution -----------------------------------
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def preset_key(op):
+    """Digest of the full parameter tuple that decides the geometry of an opening."""
+    return _digest([op["preset"], op["width"], op["height"], WINDOW_FRAME])
+
+
+# ------------------------------- Sync --------------------------------------
+
+def tag_ops(ops):
+    """Gives every operation the `key` of its wall and every wall a content `digest`.
+
+    The key is the wall label (suffixed with #2, #3... for repeated labels) and
+    the digest covers the wall, its openings and its placement but not the
+    ids, so inserting a wall does not change the digests of the others.
+    """
+    keys = {}
+    groups = {}
+    seen = {}
+    for op in ops:
+        if op["op"] == "wall":
+            label = op["label"]
+            seen[label] = seen.get(label, 0) + 1
+            keys[op["id"]] = label if seen[label] == 1 else f"{label}#{seen[label]}"
+            op["key"] = keys[op["id"]]
+            groups[op["key"]] = [op]
+        else:
+            op["key"] = keys[op["wall"]]
+            groups[op["key"]].append(op)
+    for key, group in groups.items():
+        content = [{k: v for k, v in op.items() if k not in ("id", "wall", "key", "digest")} for op in group]
+        group[0]["digest"] = _digest(content)
+    return ops
+
+
+def sync_plan(ops, existing, rebuild=()):
+    """Diffs planned walls against `existing` {key: digest} from the document.
+
+    Returns the operations that still have to run and a dict with the
+    `create`, `update`, `delete` and `keep` wall keys.  Walls listed in
+    `rebuild` are updated even when their digest is unchanged.
+    """
+    tag_ops(ops)
+    planned = {op["key"]: op["digest"] for op in ops if op["op"] == "wall"}
+    diff = {"create": [], "update": [], "delete": [], "keep": []}
+    for key, digest in planned.items():
+        if key not in existing:
+            diff["create"].append(key)
+        elif existing[key] != digest or key in rebuild:
+            diff["update"].append(key)
+        else:
+            diff["keep"].append(key)
+    diff["delete"] = [key for key in existing if key not in planned]
+    todo = set(diff["create"]) | set(diff["update"])
+    return [op for op in ops if op["key"] in todo], diff
+
+
+# ----------------------------- Execution -----------------------------------
+
+def _run_ops(ops, backend, masters, cache_presets):
+    walls = {}
+    for op in ops:
+        kind = op["op"]
+        if kind == "wall":
+            walls[op["id"]] = backend.make_wall(op)
+        elif kind == "opening":
+            key = preset_key(op)
+            if cache_presets and key in masters:
+                backend.clone_opening(op, masters[key], walls[op["wall"]])
+            else:
+                masters[key] = backend.make_opening(op, walls[op["wall"]])
+        elif kind == "place":
+            backend.place_wall(op, walls[op["wall"]])
+        else:
+            raise ValueError(f"Unknown operation: {kind}")
+    return walls
+
+
+def execute_plan(ops, backend, cache_presets=True, masters=None):
+    """Runs every operation on `backend` in order and returns the created walls by id.
+
+    With `cache_presets` each distinct window/door preset is built once and
+    every repeat becomes a clone of it; pass False for independent objects.
+    `masters` maps `preset_key` digests to openings already in the document.
+    """
+    walls = _run_ops(ops, backend, dict(masters or {}), cache_presets)
+    backend.finish()
+    return walls
+
+
+def execute_chunks(chunks, backend, cache_presets=True, masters=None):
+    """Runs chunks of operations (see `stream_csv`) as they arrive; returns the wall count.
+
+    Every chunk holds complete walls, so only the preset masters are kept
+    from one chunk to the next.  The backend finishes after each chunk.
+    """
+    masters = dict(masters or {})
+    total = 0
+    for n, ops in enumerate(chunks, start=1):
+        total += len(_run_ops(ops, backend, masters, cache_presets))
+        backend.finish()
+        log.info("chunk %d: %d walls built", n, total)
+    return total
+
+
+class RecordingBackend:
+    """Backend that only records the calls; used for CI runs and benchmarks.
+
+    With `keep=False` only the number of calls of each kind is kept.
+    """
+
+    def __init__(self, keep=True):
+        self.calls = []
+        self.counts = {}
+        self.keep = keep
+
+    def _record(self, name, op):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self.keep:
+            self.calls.append((name, op))
+        return sum(self.counts.values())
+
+    def make_wall(self, op):
+        return self._record("make_wall", op)
+
+    def make_opening(self, op, wall):
+        return self._record("make_opening", op)
+
+    def clone_opening(self, op, master, wall):
+        return self._record("clone_opening", op)
+
+    def place_wall(self, op, wall):
+        self._record("place_wall", op)
+
+    def finish(self):
+        self._record("finish", None)
+
+
+class FreeCADBackend:
+    """Builds Arch walls and windows in a FreeCAD document."""
+
+    def __init__(self, doc=None):
+        import FreeCAD
+        import Draft
+        import Arch
+        self.App, self.Draft, self.Arch = FreeCAD, Draft, Arch
+        self.doc = doc or FreeCAD.ActiveDocument or FreeCAD.newDocument("BIM_Model")
+
+    def make_wall(self, op):
+        verts = [self.App.Vector(p[0], p[1], 0) for p in op["path"]]
+        if len(verts) == 2:
+            base = self.Draft.makeLine(verts[0], verts[1])
+        else:
+            base = self.Draft.makeWire(verts, closed=False, face=False, support=None)
+        wall = self.Arch.makeWall(base, width=op["width"], height=op["height"], align=op["align"])
+        wall.Label = op["label"]
+        if "key" in op:
+            tag_object(base, op["key"])
+            tag_object(wall, op["key"], CivilHash=op["digest"])
+        return wall
+
+    def make_opening(self, op, wall):
+        App = self.App
+        placement = App.Placement(App.Vector(*op["base"]), App.Rotation(App.Vector(*op["axis"]), op["angle"]))
+        obj = self.Arch.makeWindowPreset(
+            op["preset"], width=op["width"], height=op["height"], placement=placement, **WINDOW_FRAME
+        )
+        if "key" in op:
+            tag_object(obj, op["key"], CivilPreset=preset_key(op))
+        return self._host(obj, op, wall)
+
+    def clone_opening(self, op, master, wall):
+        # Draft.clone of an Arch window is an Arch window with CloneOf set:
+        # it shares the master's geometry but has its own placement and hosts
+        App = self.App
+        obj = self.Draft.clone(master)
+        obj.Placement = App.Placement(App.Vector(*op["base"]), App.Rotation(App.Vector(*op["axis"]), op["angle"]))
+        if "key" in op:
+            tag_object(obj, op["key"])
+        return self._host(obj, op, wall)
+
+    def _host(self, obj, op, wall):
+        obj.Label = op["label"]
+        obj.Hosts = [wall]
+        if op["color"] and obj.ViewObject:
+            view = obj.ViewObject
+            view.ShapeColor = view.LineColor = view.PointColor = tuple(op["color"])
+        return obj
+
+    def place_wall(self, op, wall):
+        App = self.App
+        wall.Placement = App.Placement(App.Vector(*op["base"]), App.Rotation(App.Vector(0, 0, 1), op["angle"]))
+
+    def finish(self):
+        self.doc.recompute()
+
+
+def tag_object(obj, key, **props):
+    """Stores the sync key (and digests) on a FreeCAD object as custom string properties."""
+    props["CivilKey"] = key
+    for name, value in props.items():
+        if not hasattr(obj, name):
+            obj.addProperty("App::PropertyString", name, "Civil", "Used by the incremental sync")
+        setattr(obj, name, value)
+
+
+def load_plan(path):
+    if path.lower().endswith(".json"):
+        return plan_from_json_file(path)
+    return plan_from_csv(path)
+
+
+def report_errors(errors, path):
+    print(f"❌ {len(errors)} problem(s) in {path}:")
+    for error in errors:
+        print(f"   {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan a wall/opening file and run it on a recording backend")
+    parser.add_argument("path", help="data.csv or parseddata.json")
+    parser.add_argument("repeat", nargs="?", type=int, default=1)
+    parser.add_argument("--stream", nargs="?", type=int, const=CHUNK_WALLS, metavar="WALLS",
+                        help=f"stream a CSV file in chunks of WALLS walls (default {CHUNK_WALLS})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every row")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(message)s")
+
+    if args.stream:
+        # Time to the first chunk and in total, then peak memory in a second pass
+        # (tracing slows the pipeline down several times)
+        def stream(errors):
+            backend = RecordingBackend(keep=False)
+            start = time.perf_counter()
+            chunks = stream_csv(args.path, args.stream, errors)
+            first = next(chunks, [])
+            first_chunk = time.perf_counter() - start
+            walls = execute_chunks(itertools.chain([first], chunks), backend)
+            return walls, backend.counts, first_chunk, time.perf_counter() - start
+
+        errors = []
+        walls, counts, first_chunk, total = stream(errors)
+        tracemalloc.start()
+        stream([])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if errors:
+            report_errors(errors, args.path)
+        print(f"{'✅' if not errors else '⚠️'} {args.path}: {walls} walls streamed {counts}")
+        print(f"   first chunk: {first_chunk * 1000:.3f} ms")
+        print(f"   total:       {total * 1000:.3f} ms (recording backend)")
+        print(f"   peak memory: {peak / 1e6:.2f} MB")
+        sys.exit(1 if errors else 0)
+
+    try:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            ops = load_plan(args.path)
+        planned = time.perf_counter()
+        for _ in range(args.repeat):
+            backend = RecordingBackend()
+            execute_plan(ops, backend)
+        done = time.perf_counter()
+    except PlanError as e:
+        report_errors(e.errors, args.path)
+        sys.exit(1)
+
+    print(f"✅ {args.path}: {len(ops)} operations {backend.counts}")
+    print(f"   plan:    {(planned - start) / args.repeat * 1000:.3f} ms")
+    print(f"   execute: {(done - planned) / args.repeat * 1000:.3f} ms (recording backend)")
@@ -0,0 +1,210 @@
+"""Headless wall footprint kernel.
+
+Turns a wall polyline plus thickness and alignment into its plan footprint
+without FreeCAD: the two faces of the wall are offset polylines with mitered
+joins at every vertex, closed loops (the `C` flag) give an outer ring with a
+hole, and openings cut rectangular gaps through the wall.  Areas, previews and
+DXF plans can be produced from the result in milliseconds.
+
+Alignment follows ArchWall.getExtrusionData: "Left" grows the wall along
+direction x Z (the right-hand side when walking along the path), "Right" along
+the opposite side and "Center" splits the thickness.
+
+Usage: python footprint.py parseddata.json
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+ALIGN_OFFSETS = {
+    "Center": (0.5, -0.5),
+    "Left": (0.0, -1.0),
+    "Right": (1.0, 0.0),
+}
+
+# Points closer than this are treated as the same vertex (mm)
+TOLERANCE = 1e-6
+
+
+def _prepare(points, closed):
+    pts = np.asarray(points, dtype=float)[:, :2]
+    if closed and len(pts) > 2 and np.hypot(*(pts[-1] - pts[0])) < TOLERANCE:
+        pts = pts[:-1]
+    return pts
+
+
+def _directions(pts, closed):
+    seg = (np.roll(pts, -1, axis=0) - pts) if closed else np.diff(pts, axis=0)
+    length = np.hypot(seg[:, 0], seg[:, 1])
+    if np.any(length < TOLERANCE):
+        raise ValueError("Wall path has a zero-length segment")
+    unit = seg / length[:, None]
+    normal = np.column_stack((-unit[:, 1], unit[:, 0]))  # left-hand normal
+    return unit, normal, length
+
+
+def _miter(n_in, n_out):
+    """Miter vector for unit normals of the incoming and outgoing segments."""
+    dot = np.einsum("ij,ij->i", n_in, n_out)
+    miter = (n_in + n_out) / np.maximum(1.0 + dot, TOLERANCE)[:, None]
+    # A full reversal has no miter: square the end off instead
+    reverse = dot < -1.0 + 1e-9
+    miter[reverse] = n_out[reverse]
+    return miter
+
+
+def wall_offsets(points, thickness, align="Center", closed=False):
+    """Returns the (left, right) face polylines of a wall as (N, 2) arrays.
+
+    Interior vertices (all vertices of a closed loop) are mitered; the ends of
+    an open wall are square.
+    """
+    pts = _prepare(points, closed)
+    _, normal, _ = _directions(pts, closed)
+    if closed:
+        miter = _miter(np.roll(normal, 1, axis=0), normal)
+    else:
+        miter = np.vstack((normal[:1], _miter(normal[:-1], normal[1:]), normal[-1:]))
+    left, right = ALIGN_OFFSETS[align]
+    return pts + miter * (left * thickness), pts + miter * (right * thickness)
+
+
+def _merge_cuts(openings, lengths):
+    """Sorted, merged (segment, start, end) cut intervals clamped to their segments."""
+    by_segment = {}
+    for segment, start, width in openings:
+        a = max(0.0, float(start))
+        b = min(float(lengths[segment]), float(start) + float(width))
+        if b > a:
+            by_segment.setdefault(segment, []).append([a, b])
+    cuts = []
+    for segment in sorted(by_segment):
+        merged = []
+        for a, b in sorted(by_segment[segment]):
+            if merged and a <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], b)
+            else:
+                merged.append([a, b])
+        cuts.extend((segment, a, b) for a, b in merged)
+    return cuts
+
+
+def wall_footprint(points, thickness, align="Center", closed=False, openings=()):
+    """Footprint of one wall as a list of (ring, holes) polygons.
+
+    `openings` are (segment_index, position, width) tuples measured along the
+    wall path; each one leaves a rectangular gap square to its segment.
+    """
+    pts = _prepare(points, closed)
+    unit, normal, lengths = _directions(pts, closed)
+    left, right = wall_offsets(pts, thickness, align, closed)
+    dl, dr = (f * thickness for f in ALIGN_OFFSETS[align])
+    cuts = _merge_cuts(openings, lengths)
+
+    if closed and not cuts:
+        outer, inner = (left, right) if polygon_area(left) > polygon_area(right) else (right, left)
+        return [(_ccw(outer), [_ccw(inner)[::-1]])]
+
+    # Walk the path as a sorted list of events: vertices add their mitered
+    # face points, a cut start closes the current run and a cut end opens
+    # the next one.  A closed loop is walked once, starting at the end of
+    # its first cut.
+    cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+    perimeter = cumulative[-1]
+    CUT_END, VERTEX, CUT_START = 0, 1, 2
+    events = []
+    for segment, a, b in cuts:
+        events.append((cumulative[segment] + a, CUT_START, segment, a))
+        events.append((cumulative[segment] + b, CUT_END, segment, b))
+    events.extend((cumulative[i], VERTEX, i, 0.0) for i in range(len(pts)))
+
+    if closed:
+        origin = cumulative[cuts[0][0]] + cuts[0][2]
+        events = [((t - origin) % perimeter, kind, segment, s) for t, kind, segment, s in events]
+        # The first cut's end opens the walk and its start closes it
+        events = [e for e in events if e[1] != CUT_END or e[0] > TOLERANCE and e[0] < perimeter - TOLERANCE]
+        events.append((0.0, CUT_END, cuts[0][0], cuts[0][2]))
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    runs = []
+    run_left, run_right = None, None
+    for _, kind, index, s in events:
+        if kind == VERTEX:
+            if run_left is None:
+                run_left, run_right = [], []
+            run_left.append(left[index])
+            run_right.append(right[index])
+            continue
+        base = pts[index] + unit[index] * s
+        point_left, point_right = base + normal[index] * dl, base + normal[index] * dr
+        if kind == CUT_START:
+            run_left = (run_left or []) + [point_left]
+            run_right = (run_right or []) + [point_right]
+            runs.append((run_left, run_right))
+            run_left = run_right = None
+        else:
+            run_left, run_right = [point_left], [point_right]
+    if run_left:
+        runs.append((run_left, run_right))
+
+    polygons = []
+    for run_left, run_right in runs:
+        ring = np.vstack((np.asarray(run_left), np.asarray(run_right)[::-1]))
+        polygons.append((_ccw(ring), []))
+    return polygons
+
+
+def _ccw(ring):
+    return ring if polygon_area(ring) >= 0 else ring[::-1]
+
+
+def polygon_area(ring):
+    """Signed (shoelace) area of a closed ring given without its closing point."""
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def footprint_area(polygons):
+    return sum(abs(polygon_area(ring)) - sum(abs(polygon_area(h)) for h in holes) for ring, holes in polygons)
+
+
+def wall_openings(wall, window_types, door_types):
+    """(segment_index, position, width) of the openings of a parsed wall."""
+    result = []
+    for opening in wall.get("openings", []):
+        types = window_types if opening["type"] == "window" else door_types
+        preset = types.get(opening["ref"])
+        if preset:
+            result.append((opening["segment_index"], opening["position"], preset["width"]))
+    return result
+
+
+def building_footprints(data, openings=True, align="Center"):
+    """Polygons of every wall of parsed building data (see `building_txt2json.py`),
+    in the order of data["walls"] (index = wall id of build_plan; labels may repeat)."""
+    window_types = data.get("window_types", {})
+    door_types = data.get("door_types", {})
+    result = []
+    for wall in data["walls"]:
+        cuts = wall_openings(wall, window_types, door_types) if openings else ()
+        result.append(wall_footprint(
+            wall["path"], wall.get("thickness", 230), align, wall.get("closed", False), cuts
+        ))
+    return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python footprint.py parseddata.json")
+        sys.exit(1)
+    with open(sys.argv[1]) as f:
+        data = json.load(f)
+    start = time.perf_counter()
+    footprints = building_footprints(data)
+    elapsed = time.perf_counter() - start
+    for wall, polygons in zip(data["walls"], footprints):
+        print(f"{wall['label']:20s} {len(polygons)} polygon(s) {footprint_area(polygons) / 1e6:10.3f} m²")
+    print(f"Computed in {elapsed * 1000:.2f} ms")
@@ -0,0 +1,35 @@
+"""The wall mini-language against its corpus, and exact cardinal segments.
+
+Usage: python -m pytest FreeCADMacros/BIM/Wall_Window/test_wall_grammar.py
+"""
+
+import json
+
+import pytest
+
+from wall_grammar import CORPUS_FILE, check_corpus, parse_wall
+
+with open(CORPUS_FILE) as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["input"] for case in CORPUS])
+def test_corpus(case, tmp_path):
+    # One file per case, so a failure names its input
+    corpus = tmp_path / "corpus.json"
+    corpus.write_text(json.dumps([case]))
+    assert check_corpus(str(corpus)) == []
+
+
+def test_cardinal_segments_are_exact():
+    # Unrounded: a heading of 90 must not leave cos(90°) in the easting
+    assert parse_wall("0,0 1000E 1000N")["points"] == [[0, 0], [1000, 0], [1000, 1000]]
+    assert parse_wall("0,0 1000E 1000<90 1000<90 1000<90 C")["points"] == \
+        [[0, 0], [1000, 0], [1000, 1000], [0, 1000], [0, 0]]
+    assert parse_wall("10,10 -500S 500W")["points"] == [[10, 10], [10, 510], [-490, 510]]
+
+
+@pytest.mark.parametrize("token", ["1_000E", "nanN", "infE", "1e3_0W"])
+def test_fast_path_takes_numbers_only(token):
+    with pytest.raises(ValueError):
+        parse_wall(f"0,0 {token}")
@@ -0,0 +1,181 @@
+"""Shared tokenizer/evaluator for the wall mini-language.
+
+    "0,0 5000E 3500<90 5000<90 C height=4500 thick=1.5"
+
+  - Easting,Northing: absolute start point.
+  - LengthDirection: segment with a cardinal direction N, S, E or W
+    (case-insensitive), absolute.
+  - Length<Angle: segment turning Angle degrees from the previous segment;
+    the first segment turns from East, i.e. the angle is absolute.
+  - A negative length reverses the segment; later relative angles turn from
+    the reversed direction.
+  - C closes the wall back to the start point, O marks it open (default).
+  - key=value options are returned as strings for the caller to interpret.
+
+Both `2/building_txt2json.py` and `../building_model.FCMacro` use this module,
+so the two tools agree on every input.
+
+Usage: python wall_grammar.py [corpus.json] [segments-for-benchmark]
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import time
+
+CARDINALS = {"E": 0.0, "N": 90.0, "W": 180.0, "S": 270.0}
+# Exact directions of the cardinal headings: cos(90°) is 6e-17, not 0
+UNIT = {0.0: (1.0, 0.0), 90.0: (0.0, 1.0), 180.0: (-1.0, 0.0), 270.0: (0.0, -1.0)}
+
+# Points closer than this are treated as the same vertex (mm)
+TOLERANCE = 1e-7
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+NUMBER = re.compile(_NUMBER)
+TOKEN = re.compile(
+    rf"""
+    (?P<start>{_NUMBER}),(?P<north>{_NUMBER})
+  | (?P<length>{_NUMBER})(?:(?P<cardinal>[NSEWnsew])|<(?P<angle>{_NUMBER}))
+  | (?P<flag>[CcOo])
+  | (?P<key>\w+)=(?P<value>\S+)
+    """,
+    re.VERBOSE,
+)
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wall_grammar_corpus.json")
+
+
+def tokenize(text):
+    """Yields (kind, value) tokens: start, segment, flag and option.
+
+    Segments are (length, cardinal) for absolute directions or
+    (length, angle) for relative turns, with angle a float.
+    """
+    for token in text.split():
+        # Fast path: cardinal segments are by far the most common token
+        # (checked against NUMBER: float() also takes 1_000, nan and inf)
+        last = token[-1]
+        if last in "NSEWnsew" and NUMBER.fullmatch(token, 0, len(token) - 1):
+            yield "segment", (float(token[:-1]), last.upper())
+            continue
+        match = TOKEN.fullmatch(token)
+        if not match:
+            raise ValueError(f"Invalid segment format: '{token}'. Expected 'LengthDirection' or 'Length<Angle'.")
+        if match.group("start") is not None:
+            yield "start", (float(match.group("start")), float(match.group("north")))
+        elif match.group("length") is not None:
+            if match.group("cardinal"):
+                yield "segment", (float(match.group("length")), match.group("cardinal").upper())
+            else:
+                yield "segment", (float(match.group("length")), float(match.group("angle")))
+        elif match.group("flag"):
+            yield "flag", match.group("flag").upper()
+        else:
+            yield "option", (match.group("key"), match.group("value"))
+
+
+def evaluate(tokens):
+    """Evaluates tokens into a wall description.
+
+    Returns a dict with `start`, `segments` as (length, heading in degrees
+    [0, 360)) pairs, `points` (closed walls end with the start point again),
+    `closed` and `options`.
+    """
+    start = None
+    segments = []
+    closed = False
+    options = {}
+    heading = 0.0
+    for kind, value in tokens:
+        if kind == "start":
+            if start is not None:
+                raise ValueError("Wall data has more than one start point")
+            start = value
+        elif kind == "segment":
+            if start is None:
+                raise ValueError("Wall data must begin with the start point 'Easting,Northing'")
+            length, direction = value
+            if isinstance(direction, str):
+                heading = CARDINALS[direction]
+            else:
+                heading = heading + direction
+            if length < 0:
+                length = -length
+                heading += 180.0
+            heading %= 360.0
+            segments.append((length, heading))
+        elif kind == "flag":
+            closed = value == "C"
+        else:
+            options[value[0]] = value[1]
+
+    if start is None:
+        raise ValueError("Wall data must begin with the start point 'Easting,Northing'")
+    if not segments:
+        raise ValueError("Wall data needs at least one segment")
+
+    x, y = start
+    points = [[x, y]]
+    for length, heading in segments:
+        dx, dy = UNIT.get(heading) or (math.cos(math.radians(heading)), math.sin(math.radians(heading)))
+        x += length * dx
+        y += length * dy
+        points.append([x, y])
+    if closed and math.hypot(x - start[0], y - start[1]) > TOLERANCE:
+        points.append([start[0], start[1]])
+
+    return {
+        "start": list(start),
+        "segments": segments,
+        "points": points,
+        "closed": closed,
+        "options": options,
+    }
+
+
+def parse_wall(text):
+    """Parses one wall string such as "0,0 5000E 3500<90 C"."""
+    return evaluate(tokenize(text))
+
+
+def check_corpus(corpus_file=CORPUS_FILE):
+    """Checks every corpus entry; returns the list of failures."""
+    with open(corpus_file) as f:
+        corpus = json.load(f)
+    failures = []
+    for case in corpus:
+        try:
+            wall = parse_wall(case["input"])
+        except ValueError as e:
+            if "error" not in case:
+                failures.append(f"{case['input']!r}: unexpected error {e}")
+            continue
+        if "error" in case:
+            failures.append(f"{case['input']!r}: expected an error")
+            continue
+        points = [[round(c, 4) for c in p] for p in wall["points"]]
+        if points != case["points"] or wall["closed"] != case["closed"]:
+            failures.append(f"{case['input']!r}: got {points}, expected {case['points']}")
+    return failures
+
+
+def benchmark(segments=200000):
+    """Parse throughput in segments per second on a synthetic wall string."""
+    pattern = ["5000E", "3500<90", "-1200N", "2500.5W", "800<-45", "1500S", "300<45", "900e"]
+    text = "0,0 " + " ".join(pattern[i % len(pattern)] for i in range(segments)) + " C"
+    start = time.perf_counter()
+    parse_wall(text)
+    return segments / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    corpus = sys.argv[1] if len(sys.argv) > 1 else CORPUS_FILE
+    segments = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    failures = check_corpus(corpus)
+    for failure in failures:
+        print(f"❌ {failure}")
+    print(f"{'❌' if failures else '✅'} corpus {corpus}: {len(failures)} failure(s)")
+    print(f"Parse throughput: {benchmark(segments):,.0f} segments/s")
+    sys.exit(1 if failures else 0)
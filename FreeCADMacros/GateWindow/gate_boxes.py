@@ -0,0 +1,83 @@
+"""Pipes of the three-panel gate (GateHorVerNoFrame.FCMacro) as plain boxes.
+
+Each box is a dict like those of Kitchen/kitchen_model.py: name, x, y, z
+(the minimum corner), length (X), width (Y), height (Z), color and kind,
+plus the panel index and the panel part ("Horiz" or "Vert") it belongs to.
+"""
+
+# === Constants ===
+inch = 25.4  # mm/inch
+
+# === Pipe Colour Options ===
+PIPE_COLOUR = (0.3, 0.3, 0.3)       # Dark grey
+# PIPE_COLOUR = (0.1, 0.1, 0.1)       # Matte black
+# PIPE_COLOUR = (0.27, 0.51, 0.71)     # Steel blue
+# PIPE_COLOUR = (0.13, 0.55, 0.13)    # Forest green
+# PIPE_COLOUR = (0.55, 0.0, 0.0)      # Oxide red / brick red
+# PIPE_COLOUR = (0.8, 0.8, 0.8)       # Light grey
+
+# === Gate Dimensions ===
+PHH = 3 * inch      # Horizontal pipe height
+PHW = 1.5 * inch    # Horizontal pipe width
+PHL = 59.5 * inch   # Horizontal pipe length
+Z_BASE = 10 * inch
+Z_OFFSET = 50 * inch
+X_TOTAL = 180 * inch
+
+PVH = 20            # Vertical pipe depth (X)
+PVW = 20            # Vertical pipe width (Y)
+PVL = 71 * inch     # Vertical pipe height
+Z_BOTTOM = 1 * inch
+EDGE_SPACING = 25
+
+base_pattern = [25, 35, 35, 50, 50, 50, 75, 75, 75, 75, 50, 50, 50, 35, 35, 25]
+pattern_length = len(base_pattern)
+
+PANELS = 3
+
+
+def pipe(name, x, y, z, length, width, height, panel, part, color=PIPE_COLOUR):
+    return {
+        "name": name,
+        "x": x, "y": y, "z": z,
+        "length": length, "width": width, "height": height,
+        "color": tuple(float(c) for c in color),
+        "kind": "pipe",
+        "panel": panel,
+        "part": part,
+    }
+
+
+def gate_boxes(color=PIPE_COLOUR):
+    boxes = []
+
+    # === Horizontal Pipes ===
+    gap = (X_TOTAL - 3 * PHL) / 2
+    for row in range(2):
+        for i in range(3):
+            x = i * (PHL + gap)
+            y = 0
+            z = Z_BASE + row * Z_OFFSET
+            panel_idx = i  # One horizontal segment per panel
+            boxes.append(pipe(f"HorizPipe_{row}_{i+1}", x, y, z, PHL, PHW, PHH, panel_idx, "Horiz", color))
+
+    # === Vertical Pipes ===
+    x = EDGE_SPACING
+    spacing_index = 0
+    while x + PVH <= X_TOTAL:
+        y = - PVW  # Align inner face of vertical pipe with outer face of horizontal pipe
+        z = Z_BOTTOM
+
+        # Determine which panel the vertical pipe belongs to
+        if x < PHL:
+            panel_idx = 0
+        elif x < 2 * (PHL + gap):
+            panel_idx = 1
+        else:
+            panel_idx = 2
+        boxes.append(pipe(f"VertPipe_{spacing_index+1}", x, y, z, PVH, PVW, PVL, panel_idx, "Vert", color))
+
+        x += PVH + base_pattern[spacing_index % pattern_length]
+        spacing_index += 1
+
+    return boxes
@@ -0,0 +1,269 @@
+"""Infill layout of the diagonal-pipe gate frame (FrameVerticalPipe.FCMacro) without FreeCAD.
+
+The infill pipes are RHS profiles (pipe_w along X, pipe_h along Y) turned
+about Z by atan(pipe_h / pipe_w) around their corner, so that the diagonal
+of the profile lies along X.  In plan every pipe is then a rectangle whose
+corners follow in closed form from its placement, and the layout between
+the frame verticals is exact:
+
+  - the frame's inner boundary is X from L to WoF - L and Y from 0 to B
+    (the depth of the frame members);
+  - a pipe's footprint reaches pipe_h * sin(angle) left of its placement and
+    is one profile diagonal wide, so n pipes with equal clear gaps leave
+    (WoF - 2 L - n * diagonal) / (n + 1) between each other and the frame.
+
+find_clashes() checks footprints against the inner boundary and against
+each other with a separating-axis test over all pairs at once, and sweep()
+solves, places and checks whole catalogues of frame and profile sizes in
+one NumPy batch, so standard designs can be picked before any CAD is built.
+
+Usage: python infill.py [min_gap] [max_gap]   (the macro's frame, then the catalogue below)
+"""
+
+import sys
+import time
+
+import numpy as np
+
+INCH = 25.4
+
+# Gaps within this of the required one are accepted (mm)
+TOLERANCE = 1e-6
+STEEL_DENSITY = 7.85e-6  # kg/mm^3
+
+# Standard sizes swept by `python infill.py`
+HEIGHTS = [(2 * 12 + 2.5) * INCH, 3 * 12 * INCH, 4 * 12 * INCH, 5 * 12 * INCH, 6 * 12 * INCH]  # HoF
+WIDTHS = [36 * INCH, 42 * INCH, 48 * INCH, 53 * INCH, 60 * INCH, 72 * INCH]  # WoF
+FRAME_PROFILES = [(25.4, 38.1), (40, 40), (40, 60), (50, 50), (76.5, 38.1)]  # (L, B)
+PIPE_PROFILES = [(20, 20, 1.5), (25, 20, 1.5), (40, 20, 2), (40, 40, 2), (50, 25, 2)]  # (pipe_w, pipe_h, pipe_t)
+CHUNK = 1 << 18  # Pipes checked per batch, bounds the memory of sweep()
+
+
+def diagonal_angle(pipe_w, pipe_h):
+    """Rotation about Z (radians) that lays the profile diagonal along X."""
+    return np.arctan2(pipe_h, pipe_w)
+
+
+def pipe_corners(x, y, pipe_w, pipe_h, angle):
+    """Plan corners (..., 4, 2) of pipes placed at (x, y) and turned by
+    `angle` about that corner (a FreeCAD Placement of the profile box)."""
+    x, y, w, h, angle = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (x, y, pipe_w, pipe_h, angle)))
+    c, s = np.cos(angle), np.sin(angle)
+    dx = np.stack((np.zeros_like(w), w * c, w * c - h * s, -h * s), axis=-1)
+    dy = np.stack((np.zeros_like(w), w * s, w * s + h * c, h * c), axis=-1)
+    return np.stack((x[..., None] + dx, y[..., None] + dy), axis=-1)
+
+
+def footprint_extent(pipe_w, pipe_h, angle):
+    """(x_lo, x_hi, y_lo, y_hi) of a pipe's footprint relative to its placement."""
+    corners = pipe_corners(0.0, 0.0, pipe_w, pipe_h, angle)
+    return corners[..., 0].min(-1), corners[..., 0].max(-1), corners[..., 1].min(-1), corners[..., 1].max(-1)
+
+
+def inner_boundary(WoF, L, B):
+    """((x_lo, y_lo), (x_hi, y_hi)) of the opening between the frame members in plan."""
+    return (L, 0.0), (WoF - L, B)
+
+
+def max_pipes(width, size, min_gap):
+    """Most pipes of footprint width `size` that fit in `width` with every clear gap >= min_gap."""
+    count = np.floor((np.asarray(width) - min_gap) / (np.asarray(size) + min_gap) + TOLERANCE)
+    return np.maximum(count, 0).astype(int)
+
+
+def min_pipes(width, size, max_gap):
+    """Fewest pipes that bring every clear gap in `width` down to max_gap or less."""
+    count = np.ceil((np.asarray(width) - max_gap) / (np.asarray(size) + max_gap) - TOLERANCE)
+    return np.maximum(count, 0).astype(int)
+
+
+def clear_gap(width, size, count):
+    """Equal clear gap between `count` pipes and the ends of `width`."""
+    return (np.asarray(width) - np.asarray(count) * size) / (np.asarray(count) + 1)
+
+
+def layout(WoF, L, pipe_w, pipe_h, count):
+    """X of the placements of `count` pipes with equal clear gaps, and that gap."""
+    x_lo, x_hi, _, _ = footprint_extent(pipe_w, pipe_h, diagonal_angle(pipe_w, pipe_h))
+    size = x_hi - x_lo
+    gap = clear_gap(WoF - 2 * L, size, count)
+    return L + gap + np.arange(count) * (size + gap) - x_lo, float(gap)
+
+
+def _spread(values):
+    """(min, max) over the last axis of length 4 (elementwise, much faster than a reduce)."""
+    v0, v1, v2, v3 = values[..., 0], values[..., 1], values[..., 2], values[..., 3]
+    return (np.minimum(np.minimum(v0, v1), np.minimum(v2, v3)),
+            np.maximum(np.maximum(v0, v1), np.maximum(v2, v3)))
+
+
+def separation(a, b):
+    """Separating-axis distance between convex quadrilaterals a and b (..., 4, 2).
+
+    The largest gap between their projections on the edge normals of both
+    and on X and Y: positive, the two are at least that far apart (exactly
+    that far when their closest points face each other along one of these
+    axes, as neighbouring pipes do along X); negative, they overlap and it
+    is the smallest depth of the overlap.
+    """
+    a, b = np.broadcast_arrays(a, b)
+    best = None
+    for quad, edge in ((a, 0), (a, 1), (b, 0), (b, 1), (None, 0), (None, 1)):
+        if quad is None:
+            # X or Y
+            pa, pb = a[..., edge], b[..., edge]
+        else:
+            dx, dy = (quad[..., edge + 1, k] - quad[..., edge, k] for k in (0, 1))
+            norm = np.hypot(dx, dy)[..., None]
+            nx, ny = -dy[..., None] / norm, dx[..., None] / norm
+            pa, pb = a[..., 0] * nx + a[..., 1] * ny, b[..., 0] * nx + b[..., 1] * ny
+        (a_lo, a_hi), (b_lo, b_hi) = _spread(pa), _spread(pb)
+        gap = np.maximum(b_lo - a_hi, a_lo - b_hi)
+        best = gap if best is None else np.maximum(best, gap)
+    return best
+
+
+def find_clashes(corners, boundary, min_gap=0.0, names=None):
+    """List of clash dicts (type, a, b, amount in mm) as in Kitchen/clash.py.
+
+    overlap: two pipes intersect (amount: depth); clearance: two pipes, or a
+    pipe and the frame ("frame"), are closer than min_gap (amount: what is
+    missing); outside: a pipe pokes out of the frame (amount: how far).
+    """
+    corners = np.asarray(corners, dtype=float).reshape(-1, 4, 2)
+    names = names or [f"Pipe_{n + 1}" for n in range(len(corners))]
+    (x_lo, y_lo), (x_hi, y_hi) = boundary
+    clashes = []
+
+    i, j = np.triu_indices(len(corners), 1)
+    gap = separation(corners[i], corners[j])
+    for k in np.flatnonzero(gap < min_gap - TOLERANCE):
+        kind, amount = ("overlap", -gap[k]) if gap[k] < 0 else ("clearance", min_gap - gap[k])
+        clashes.append({"type": kind, "a": names[i[k]], "b": names[j[k]], "amount": float(amount)})
+
+    xs, ys = corners[..., 0], corners[..., 1]
+    to_frame = np.minimum(xs.min(-1) - x_lo, x_hi - xs.max(-1))
+    out = np.maximum(np.maximum(y_lo - ys.min(-1), ys.max(-1) - y_hi), -to_frame)
+    for k in np.flatnonzero(out > TOLERANCE):
+        clashes.append({"type": "outside", "a": names[k], "b": None, "amount": float(out[k])})
+    for k in np.flatnonzero((out <= TOLERANCE) & (to_frame < min_gap - TOLERANCE)):
+        clashes.append({"type": "clearance", "a": names[k], "b": "frame", "amount": float(min_gap - to_frame[k])})
+    return clashes
+
+
+def format_clash(clash):
+    if clash["type"] == "overlap":
+        return f"{clash['a']} overlaps {clash['b']} by {clash['amount']:.2f} mm"
+    if clash["type"] == "clearance":
+        return f"{clash['a']} and {clash['b']} are {clash['amount']:.2f} mm short of the clear gap"
+    return f"{clash['a']} is {clash['amount']:.2f} mm outside the frame"
+
+
+def sweep(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t, min_gap, max_gap=None):
+    """Infill of every frame in a catalogue; the arguments broadcast together.
+
+    Each frame gets the most pipes that keep every clear gap >= min_gap or,
+    with max_gap, the fewest that keep it <= max_gap.  The pipes are placed,
+    and every footprint is checked against the frame and its neighbour
+    (pipes further apart are further away).  Returns a dict of flat arrays:
+    the inputs, count, most (the count at min_gap), gap, size (footprint
+    width), depth, length (of one pipe), infill (total pipe length), mass
+    (kg of infill steel), frame and pipe (smallest clear gaps found) and ok.
+    """
+    HoF, WoF, L, B, pipe_w, pipe_h, pipe_t = (np.ravel(a).astype(float) for a in
+                                              np.broadcast_arrays(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t))
+    angle = diagonal_angle(pipe_w, pipe_h)
+    x_lo, x_hi, y_lo, y_hi = footprint_extent(pipe_w, pipe_h, angle)
+    size, depth = x_hi - x_lo, y_hi - y_lo
+    width = WoF - 2 * L
+    most = max_pipes(width, size, min_gap)
+    count = most if max_gap is None else min_pipes(width, size, max_gap)
+    gap = clear_gap(width, size, count)
+
+    # Place the pipes of many frames in one flat batch, frame after frame
+    frame_gap = np.full(len(count), np.inf)
+    pipe_gap = np.full(len(count), np.inf)
+    out = np.zeros(len(count))
+    ends = np.cumsum(count)
+    start = 0
+    while start < len(count):
+        stop = max(int(np.searchsorted(ends, ends[start] - count[start] + CHUNK, "right")), start + 1)
+        rows = np.arange(start, stop)[count[start:stop] > 0]
+        start = stop
+        if not len(rows):
+            continue
+        frame = np.repeat(rows, count[rows])
+        first = np.cumsum(count[rows]) - count[rows]
+        n = np.arange(len(frame)) - np.repeat(first, count[rows])
+        x = L[frame] + gap[frame] + n * (size + gap)[frame] - x_lo[frame]
+        corners = pipe_corners(x, 0.0, pipe_w[frame], pipe_h[frame], angle[frame])
+        (x_min, x_max), (y_min, y_max) = _spread(corners[..., 0]), _spread(corners[..., 1])
+        frame_gap[rows] = np.minimum.reduceat(np.minimum(x_min - L[frame], WoF[frame] - L[frame] - x_max), first)
+        out[rows] = np.maximum.reduceat(np.maximum(-y_min, y_max - B[frame]), first)
+        # Each pipe and the next; the last of a frame has none
+        between = np.append(separation(corners[:-1], corners[1:]), np.inf)
+        between[first[1:] - 1] = np.inf
+        pipe_gap[rows] = np.minimum.reduceat(between, first)
+
+    ok = ((count > 0) & (count <= most) & (HoF > 2 * L) & (out <= TOLERANCE)
+          & (frame_gap >= min_gap - TOLERANCE) & (pipe_gap >= min_gap - TOLERANCE))
+    if max_gap is not None:
+        ok &= gap <= max_gap + TOLERANCE
+    length = HoF - 2 * L
+    section = 2 * pipe_t * (pipe_w + pipe_h) - 4 * pipe_t ** 2
+    return {"HoF": HoF, "WoF": WoF, "L": L, "B": B, "pipe_w": pipe_w, "pipe_h": pipe_h, "pipe_t": pipe_t,
+            "count": count, "most": most, "gap": gap, "size": size, "depth": depth, "length": length,
+            "infill": count * length, "mass": count * length * section * STEEL_DENSITY,
+            "frame": frame_gap, "pipe": pipe_gap, "ok": ok}
+
+
+def solve(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t, min_gap, max_gap=None):
+    """sweep() of a single frame, as a dict of numbers."""
+    designs = sweep(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t, min_gap, max_gap)
+    return {key: value[0].item() for key, value in designs.items()}
+
+
+def catalogue(heights=HEIGHTS, widths=WIDTHS, frames=FRAME_PROFILES, pipes=PIPE_PROFILES):
+    """(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t) arrays of every combination."""
+    h, w, f, p = np.meshgrid(np.arange(len(heights)), np.arange(len(widths)),
+                             np.arange(len(frames)), np.arange(len(pipes)), indexing="ij")
+    frames, pipes = np.asarray(frames, dtype=float), np.asarray(pipes, dtype=float)
+    return (np.asarray(heights, dtype=float)[h], np.asarray(widths, dtype=float)[w],
+            frames[f, 0], frames[f, 1], pipes[p, 0], pipes[p, 1], pipes[p, 2])
+
+
+if __name__ == "__main__":
+    min_gap = float(sys.argv[1]) if len(sys.argv) > 1 else 25.0
+    max_gap = float(sys.argv[2]) if len(sys.argv) > 2 else 75.0
+
+    # The frame of FrameVerticalPipe.FCMacro
+    HoF, WoF, L, B, pipe_w, pipe_h, pipe_t = (2 * 12 + 2.5) * INCH, 53 * INCH, 25.4, 38.1, 25, 20, 1.5
+    design = solve(HoF, WoF, L, B, pipe_w, pipe_h, pipe_t, min_gap, max_gap)
+    xs, gap = layout(WoF, L, pipe_w, pipe_h, design["count"])
+    corners = pipe_corners(xs, 0.0, pipe_w, pipe_h, diagonal_angle(pipe_w, pipe_h))
+    clashes = find_clashes(corners, inner_boundary(WoF, L, B), min_gap)
+    for clash in clashes:
+        print(f"⚠️ {format_clash(clash)}")
+    print(f"{'✅' if design['ok'] and not clashes else '❌'} {WoF:.1f} x {HoF:.1f} mm frame: "
+          f"{design['count']} pipes {pipe_w}x{pipe_h} ({design['size']:.2f} mm wide turned), "
+          f"clear gap {gap:.2f} mm, {design['mass']:.1f} kg, at most {design['most']} pipes at {min_gap:g} mm")
+
+    arrays = catalogue()
+    start = time.perf_counter()
+    designs = sweep(*arrays, min_gap, max_gap)
+    elapsed = time.perf_counter() - start
+    print(f"{len(designs['ok'])} designs swept in {elapsed * 1000:.1f} ms, {designs['ok'].sum()} pass "
+          f"(clear gap {min_gap:g} to {max_gap:g} mm)")
+
+    # Per frame size, the passing design with the lightest infill
+    print(f"\n{'HoF':>7s} {'WoF':>7s} {'frame':>11s} {'pipe':>7s} {'count':>5s} {'gap':>7s} {'infill kg':>9s}")
+    keys = np.column_stack((designs["HoF"], designs["WoF"]))
+    for hof, wof in np.unique(keys, axis=0):
+        rows = np.flatnonzero((keys[:, 0] == hof) & (keys[:, 1] == wof) & designs["ok"])
+        if not len(rows):
+            print(f"{hof:7.0f} {wof:7.0f}   no design")
+            continue
+        k = rows[np.argmin(designs["mass"][rows])]
+        print(f"{hof:7.0f} {wof:7.0f} {designs['L'][k]:5.1f}x{designs['B'][k]:<5.1f} "
+              f"{designs['pipe_w'][k]:3.0f}x{designs['pipe_h'][k]:<3.0f} {designs['count'][k]:5d} "
+              f"{designs['gap'][k]:7.2f} {designs['mass'][k]:9.2f}")
@@ -0,0 +1,108 @@
+"""Persistent on-disk cache of final FreeCAD shapes in BREP format.
+
+Boolean-heavy shapes (walls cut by their openings, bevelled RHS members) are
+stored under a hash of the parameters that generated them, so the next session
+loads them instead of recomputing.  The directory is bounded in size: the least
+recently used files are evicted first (a hit refreshes the file time).
+
+Set CIVIL_SHAPE_CACHE to move the cache and CIVIL_SHAPE_CACHE_BYPASS=1 (or
+pass bypass=True) to always rebuild.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = os.environ.get(
+    "CIVIL_SHAPE_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "civilcoding", "shapes")
+)
+MAX_BYTES = 512 * 1024 * 1024
+BYPASS = os.environ.get("CIVIL_SHAPE_CACHE_BYPASS", "") not in ("", "0")
+
+# Bump when the meaning of the cached parameters changes
+FORMAT = 1
+
+
+class ShapeCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, bypass=BYPASS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+        self.build_time = 0.0
+        if not bypass:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, params):
+        text = json.dumps([FORMAT, params], sort_keys=True, default=repr)
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def path(self, params):
+        return os.path.join(self.directory, self.key(params) + ".brep")
+
+    def get(self, params):
+        """Returns the cached shape for `params`, or None."""
+        if self.bypass:
+            return None
+        path = self.path(params)
+        if not os.path.exists(path):
+            return None
+        import Part
+        start = time.perf_counter()
+        shape = Part.Shape()
+        try:
+            shape.read(path)
+        except Exception:
+            # Truncated or unreadable entry: drop it and rebuild
+            os.remove(path)
+            return None
+        os.utime(path)
+        self.hits += 1
+        self.load_time += time.perf_counter() - start
+        return shape
+
+    def put(self, params, shape):
+        if self.bypass:
+            return
+        path = self.path(params)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        shape.exportBrep(tmp)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_build(self, params, build):
+        """Loads the shape for `params`, or calls `build()` and stores its result."""
+        shape = self.get(params)
+        if shape is not None:
+            return shape
+        start = time.perf_counter()
+        shape = build()
+        self.misses += 1
+        self.build_time += time.perf_counter() - start
+        self.put(params, shape)
+        return shape
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".brep"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def report(self):
+        if self.bypass:
+            return "shape cache bypassed"
+        return (f"shape cache: {self.hits} hits ({self.load_time:.2f} s loading), "
+                f"{self.misses} misses ({self.build_time:.2f} s building)")
@@ -0,0 +1,176 @@
+"""Sweep-and-prune clash detection for axis-aligned boxes.
+
+Boxes are the dicts of kitchen_model.py (name, x, y, z, length, width,
+height, kind).  Three kinds of problem are reported:
+
+  - overlap: two boxes intersect by more than `tolerance` on every axis,
+    unless their kinds are an allowed pair (a window in its wall, the sink
+    set into the countertop).
+  - clearance: two side-by-side boxes (overlapping in height) are closer
+    than the clearance required by either of them.  Clearances are looked
+    up by box name first, then by kind.
+  - outside: a box pokes out of the room bounds by more than `tolerance`.
+
+The plan is cut into Y strips and boxes are swept along X inside each
+strip: a box is only tested against the boxes of its strips whose X interval
+starts before its own ends, and those candidate pairs are checked on the
+other axes in one vectorized pass.
+
+Usage: python clash.py [boxes-for-benchmark]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+# Overlaps and excursions up to this depth are treated as touching (mm)
+TOLERANCE = 1.0
+
+ALLOWED = {
+    ("opening", "wall"),
+    ("counter", "sink"),
+}
+
+# Free space required beside a box, by name or kind (mm)
+CLEARANCES = {
+    "Fridge": 25.0,
+}
+
+# Kinds that are allowed outside the room bounds
+BOUNDS_EXEMPT = {"wall", "opening"}
+
+
+def box_arrays(boxes):
+    """(lo, hi) corner arrays of shape (n, 3)."""
+    lo = np.array([(b["x"], b["y"], b["z"]) for b in boxes], dtype=float).reshape(-1, 3)
+    size = np.array([(b["length"], b["width"], b["height"]) for b in boxes], dtype=float).reshape(-1, 3)
+    return lo, lo + size
+
+
+def candidate_pairs(lo, hi, margin=0.0, strip=None):
+    """Index pairs (i, j) whose boxes, grown by `margin`, touch or overlap.
+
+    Boxes are registered in every Y strip they reach and swept along X inside
+    each strip; a pair is only kept in the first strip both boxes share.
+    `strip` is the strip width (default: about sqrt(n) strips).
+    """
+    n = len(lo)
+    if n < 2:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    y0 = lo[:, 1].min()
+    if strip is None:
+        extent = hi[:, 1] - lo[:, 1]
+        strip = max((hi[:, 1].max() - y0) / np.sqrt(n), float(np.median(extent)), 1.0)
+    first = ((lo[:, 1] - y0) // strip).astype(int)
+    last = ((hi[:, 1] + margin - y0) // strip).astype(int)
+    cells = last - first + 1
+    box = np.repeat(np.arange(n), cells)
+    cell = first[box] + np.arange(len(box)) - np.repeat(np.cumsum(cells) - cells, cells)
+
+    # One sort key: strip, then X start; `width` keeps strips apart
+    x0 = lo[:, 0].min()
+    width = hi[:, 0].max() - x0 + margin + 1.0
+    key = cell * width + (lo[box, 0] - x0)
+    order = np.argsort(key, kind="stable")
+    box, cell, key = box[order], cell[order], key[order]
+    ends = np.searchsorted(key, cell * width + (hi[box, 0] + margin - x0), side="right")
+    counts = np.maximum(ends - np.arange(1, len(key) + 1), 0)
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    a = np.repeat(np.arange(len(key)), counts)
+    # Position of each pair within its run, then offset from the entry itself
+    b = a + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    i, j = box[a], box[b]
+    keep = (cell[a] == np.maximum(first[i], first[j])) & (i != j)
+    i, j = i[keep], j[keep]
+    keep = np.all((lo[i] <= hi[j] + margin) & (lo[j] <= hi[i] + margin), axis=1)
+    return i[keep], j[keep]
+
+
+def find_clashes(boxes, tolerance=TOLERANCE, allowed=ALLOWED, clearances=CLEARANCES,
+                 bounds=None, bounds_exempt=BOUNDS_EXEMPT):
+    """List of clash dicts: type, a, b (None for `outside`) and amount in mm.
+
+    For overlaps the amount is the smallest penetration depth, for clearance
+    violations the missing free space and for `outside` the largest excursion.
+    """
+    lo, hi = box_arrays(boxes)
+    names = [b["name"] for b in boxes]
+    kinds = [b.get("kind", "") for b in boxes]
+    need = np.array([clearances.get(n, clearances.get(k, 0.0)) for n, k in zip(names, kinds)], dtype=float)
+    # Allowed kind pairs as a boolean lookup table on kind codes
+    kind_names = sorted(set(kinds))
+    code = {k: n for n, k in enumerate(kind_names)}
+    kind_codes = np.array([code[k] for k in kinds], dtype=int)
+    permitted = np.zeros((len(kind_names), len(kind_names)), dtype=bool)
+    for a, b in allowed:
+        if a in code and b in code:
+            permitted[code[a], code[b]] = permitted[code[b], code[a]] = True
+    clashes = []
+
+    margin = float(need.max()) if len(need) else 0.0
+    i, j = candidate_pairs(lo, hi, margin)
+    if len(i):
+        # Per-axis overlap depth; negative values are gaps
+        depth = np.minimum(hi[i], hi[j]) - np.maximum(lo[i], lo[j])
+        overlap = depth.min(axis=1)
+        required = np.maximum(need[i], need[j])
+        side_gap = -np.min(depth[:, :2], axis=1)
+        checked = ~permitted[kind_codes[i], kind_codes[j]]
+        side_by_side = (depth[:, 2] > tolerance) & (overlap <= tolerance)
+        for k in np.flatnonzero(checked & (overlap > tolerance)):
+            clashes.append({"type": "overlap", "a": names[i[k]], "b": names[j[k]], "amount": float(overlap[k])})
+        for k in np.flatnonzero(checked & side_by_side & (required > 0) & (side_gap < required)):
+            clashes.append({"type": "clearance", "a": names[i[k]], "b": names[j[k]],
+                            "amount": float(required[k] - max(side_gap[k], 0.0))})
+
+    if bounds is not None:
+        room_lo, room_hi = (np.asarray(c, dtype=float) for c in bounds)
+        excursion = np.maximum(room_lo - lo, hi - room_hi).max(axis=1)
+        for k in np.flatnonzero(excursion > tolerance):
+            if kinds[k] not in bounds_exempt:
+                clashes.append({"type": "outside", "a": names[k], "b": None, "amount": float(excursion[k])})
+    return clashes
+
+
+def format_clash(clash):
+    if clash["type"] == "overlap":
+        return f"{clash['a']} overlaps {clash['b']} by {clash['amount']:.1f} mm"
+    if clash["type"] == "clearance":
+        return f"{clash['a']} and {clash['b']} are {clash['amount']:.1f} mm short of clearance"
+    return f"{clash['a']} is {clash['amount']:.1f} mm outside the room"
+
+
+def synthetic_apartment(count, seed=0):
+    """Roughly `count` boxes: copies of the kitchen on a grid of rooms."""
+    from kitchen_model import c_shape_kitchen
+    rng = np.random.default_rng(seed)
+    kitchen = c_shape_kitchen()
+    boxes = []
+    side = int(np.ceil(np.sqrt(count / len(kitchen))))
+    for n in range(side * side):
+        dx, dy = (n % side) * 6000.0, (n // side) * 8000.0 + 2500.0
+        jitter = rng.normal(0.0, 5.0, size=len(kitchen))
+        for b, dj in zip(kitchen, jitter):
+            boxes.append(dict(b, name=f"{b['name']}#{n}", x=b["x"] + dx + dj, y=b["y"] + dy))
+    return boxes
+
+
+if __name__ == "__main__":
+    from kitchen_model import c_shape_kitchen, room_bounds
+
+    start = time.perf_counter()
+    clashes = find_clashes(c_shape_kitchen(), bounds=room_bounds())
+    elapsed = time.perf_counter() - start
+    for clash in clashes:
+        print(f"⚠️ {format_clash(clash)}")
+    print(f"{len(clashes)} clash(es) in the C-shaped kitchen ({elapsed * 1000:.2f} ms)")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    boxes = synthetic_apartment(count)
+    start = time.perf_counter()
+    clashes = find_clashes(boxes)
+    elapsed = time.perf_counter() - start
+    print(f"{len(boxes)} boxes: {len(clashes)} clash(es) in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,161 @@
+"""C-shaped kitchen as plain data: a list of axis-aligned boxes.
+
+Each box is a dict with name, x, y, z (the minimum corner), length (X),
+width (Y), height (Z), color and kind.  The kind groups boxes for the clash
+rules in clash.py: wall, opening (doors and windows cut into walls), counter,
+cabinet, appliance and sink (set into the countertop).  Nothing here needs
+FreeCAD; C_Shape_FreeCADMacro.py turns the list into Part::Box objects.
+"""
+
+# Unit conversion
+FT = 304.8
+IN = 25.4
+
+DIMENSIONS = {
+    # Kitchen
+    "kitchen_width": 10.875 * FT,  # 10' 10.5"
+    "kitchen_length": 14 * FT,  # 14'
+    "kitchen_height": 10.25 * FT,  # 10' 3"
+    "wall_thickness": 9 * IN,  # 9-inch walls
+
+    # Countertop
+    "counter_height": 2.75 * FT,  # 2' 9"
+    "counter_depth": 2 * FT,  # 2'
+    "counter_thickness": 30 + 2 * IN,  # 30 mm thick granite
+    "counter_start": 0,  # Runs at the open end start this far in (room for the fridge)
+
+    # Wall cabinet
+    "wall_cabinet_height": 2.5 * FT,  # 2' 6"
+    "wall_cabinet_depth": 1.5 * FT,  # 1' 6"
+    "wall_cabinet_top": 7 * FT,  # 7' from floor
+
+    # Appliances
+    "fridge_width": 2.33 * FT,
+    "fridge_depth": 2.25 * FT,
+    "stove_width": 24 * IN,
+    "stove_depth": 20 * IN,
+    "sink_width": 3 * FT,
+    "dishwasher_width": 2 * FT,
+    "microwave_width": 2 * FT,
+    "microwave_depth": 1 * FT,
+    "food_processor_width": 1.5 * FT,
+    "food_processor_depth": 16 * IN,
+    "chimney_height": 6 * IN,
+    "fridge_y": -(2.33 * FT + 3 * FT),
+    "stove_y": 6.5 * FT,
+    # Microwave and food processor at the corner of the back run: y from the
+    # front of the back counter, x from the inside of the long wall
+    "microwave_y": 1 * FT,
+    "food_processor_x": -5 * IN,
+    "food_processor_y": -2 * FT,
+
+    # Island (left out when its width is 0); x from the inside of the long wall
+    "island_x": 5 * FT,
+    "island_y": 3 * FT,
+    "island_width": 0,
+    "island_length": 6 * FT,
+
+    # Door
+    "door_width": 3.5 * FT,
+    "door_height": 7 * FT,
+
+    # Windows
+    "win1_width": 2.5 * FT,
+    "win1_height": 1.75 * FT,
+    "win2_width": 4 * FT + 4.5 * IN,
+    "win2_height": 4.25 * FT,
+}
+
+WALL_COLOR = (0.8, 0.8, 0.8)
+CABINET_COLOR = (0, 0.5, 0)
+WOOD_COLOR = (0.7, 0.4, 0.1)
+
+
+def box(name, x, y, z, length, width, height, color, kind):
+    return {
+        "name": name,
+        "x": x, "y": y, "z": z,
+        "length": length, "width": width, "height": height,
+        "color": tuple(float(c) for c in color),
+        "kind": kind,
+    }
+
+
+def room_bounds(dims=None):
+    """((x, y, z), (x, y, z)) corners of the space inside the walls."""
+    d = dict(DIMENSIONS, **(dims or {}))
+    t = d["wall_thickness"]
+    return (t, 0.0, 0.0), (t + d["kitchen_width"], d["kitchen_length"], d["kitchen_height"])
+
+
+def c_shape_kitchen(dims=None):
+    """Boxes of the C-shaped kitchen; `dims` overrides entries of DIMENSIONS (mm)."""
+    d = dict(DIMENSIONS, **(dims or {}))
+    kitchen_width = d["kitchen_width"]
+    kitchen_length = d["kitchen_length"]
+    kitchen_height = d["kitchen_height"]
+    wall_thickness = d["wall_thickness"]
+    counter_height = d["counter_height"]
+    counter_depth = d["counter_depth"]
+    counter_thickness = d["counter_thickness"]
+    counter_start = d["counter_start"]
+    wall_cabinet_height = d["wall_cabinet_height"]
+    wall_cabinet_depth = d["wall_cabinet_depth"]
+    wall_cabinet_top = d["wall_cabinet_top"]
+    door_width = d["door_width"]
+    sink_width = d["sink_width"]
+    dishwasher_width = d["dishwasher_width"]
+    win1_width = d["win1_width"]
+
+    base_cabinet_height = counter_height - counter_thickness
+    chimney_width = d["stove_width"]
+    chimney_depth = counter_depth
+    # The front run along the open end starts past the long run and the corner
+    front_start = max(counter_depth, counter_start)
+
+    boxes = [
+        # Walls
+        box("Wall_Long1", 0, -7*FT, 0, wall_thickness, kitchen_length + wall_thickness + 7*FT, kitchen_height, WALL_COLOR, "wall"),
+        box("Wall_Long2", kitchen_width + wall_thickness, 0, 0, wall_thickness, kitchen_length + wall_thickness, kitchen_height, WALL_COLOR, "wall"),
+        box("Wall_Short1", wall_thickness, 0, 7*FT, kitchen_width, wall_thickness, 3.25*FT, WALL_COLOR, "wall"),
+        box("Wall_Short2", wall_thickness, kitchen_length, 0, kitchen_width, wall_thickness, kitchen_height, WALL_COLOR, "wall"),
+
+        # Countertop
+        box("CountertopShortBack", wall_thickness, kitchen_length - counter_depth, base_cabinet_height, kitchen_width - door_width - sink_width, counter_depth, counter_thickness, CABINET_COLOR, "counter"),
+        box("CountertopShortFront", wall_thickness + front_start, 0, base_cabinet_height, kitchen_width - door_width - front_start - 1.5*FT, counter_depth, counter_thickness, CABINET_COLOR, "counter"),
+        box("CountertopLong", wall_thickness, counter_start, base_cabinet_height, counter_depth, kitchen_length - counter_depth - counter_start, counter_thickness, CABINET_COLOR, "counter"),
+
+        # Base cabinets
+        box("BaseCabinetShort", wall_thickness, kitchen_length - counter_depth, 0, kitchen_width - door_width, counter_depth, base_cabinet_height, CABINET_COLOR, "cabinet"),
+        box("BaseCabinetShortFront", wall_thickness + front_start, 0, 0, kitchen_width - door_width - front_start - 1.5*FT, counter_depth, base_cabinet_height, CABINET_COLOR, "cabinet"),
+        box("BaseCabinetLong", wall_thickness, counter_start, 0, counter_depth, kitchen_length - counter_depth - counter_start, base_cabinet_height, CABINET_COLOR, "cabinet"),
+
+        # Wall cabinets along long wall
+        box("WallCabL1", wall_thickness, counter_start, wall_cabinet_top - wall_cabinet_height, wall_cabinet_depth, 6.5*FT - counter_start, wall_cabinet_height, CABINET_COLOR, "cabinet"),
+        box("WallCabL2", wall_thickness, 8.5*FT, wall_cabinet_top - wall_cabinet_height, wall_cabinet_depth, (3.75 + 2.5)*FT, wall_cabinet_height, CABINET_COLOR, "cabinet"),
+
+        # Appliances
+        box("Fridge", wall_thickness + 3*IN, d["fridge_y"], 0, d["fridge_depth"], d["fridge_width"], 5.5*FT, (0.2, 0.2, 0.2), "appliance"),
+        box("Sink", wall_thickness + kitchen_width - door_width - sink_width, kitchen_length - counter_depth, counter_height - 100, sink_width, counter_depth, 100, (0, 0, 1), "sink"),
+        # RO inside cabinet under the sink
+        #box("RO", wall_thickness + kitchen_width - door_width - 1.5*FT, kitchen_length - 1.0*FT, counter_height + 150, 1.5*FT, 1.0*FT, 2*FT, (0, 0, 1), "appliance"),
+        box("Dishwasher", wall_thickness + kitchen_width - door_width - sink_width - dishwasher_width, kitchen_length - counter_depth, 0, dishwasher_width, counter_depth, counter_height, (0, 1, 0), "appliance"),
+        box("Stove", wall_thickness + 4*IN, d["stove_y"], counter_height, d["stove_depth"], d["stove_width"], 100, (1, 0, 0), "appliance"),
+        box("Microwave", wall_thickness + 3*IN, kitchen_length - counter_depth + d["microwave_y"], counter_height, d["microwave_width"], d["microwave_depth"], 200, (0.5, 0, 0.5), "appliance"),
+        box("RO", wall_thickness + kitchen_width - door_width - 1.5*FT, kitchen_length - 1*FT, counter_height + 2*FT, 1.5*FT, 1*FT, 2*FT, (0, 0, 1), "appliance"),
+        box("Food Processor", wall_thickness + d["food_processor_x"], kitchen_length - counter_depth + d["food_processor_y"], counter_height, d["food_processor_depth"], d["food_processor_width"], 150, (0.3, 0.2, 0.1), "appliance"),
+        box("Chimney", wall_thickness, d["stove_y"], 4.0*FT + 10.0*IN, chimney_depth, chimney_width, d["chimney_height"], (0.2, 0.2, 0.2), "appliance"),
+
+        # Door
+        box("Door", kitchen_width + wall_thickness - door_width, kitchen_length - 3, 0, door_width, wall_thickness, d["door_height"], WOOD_COLOR, "opening"),
+
+        # Windows
+        box("Win1A", 3, 4*FT, counter_height, wall_thickness, win1_width, d["win1_height"], WOOD_COLOR, "opening"),
+        box("Win1B", 3, 4*FT + win1_width + 2*FT, counter_height, wall_thickness, win1_width, d["win1_height"], WOOD_COLOR, "opening"),
+        box("Win2", wall_thickness + 1.5*FT, kitchen_length - 3, counter_height, d["win2_width"], wall_thickness, d["win2_height"], WOOD_COLOR, "opening"),
+    ]
+
+    # Island
+    if d["island_width"] > 0:
+        boxes.append(box("Island", wall_thickness + d["island_x"], d["island_y"], 0, d["island_width"], d["island_length"], counter_height, (1, 0.5, 0), "cabinet"))
+    return boxes
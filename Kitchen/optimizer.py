@@ -0,0 +1,353 @@
+"""Kitchen layout optimizer for the C-shaped kitchen of kitchens/c_shape.json.
+
+Searches the stove position along the long (west) counter run, the sink
+position along the back run with the dishwasher on either side of it, and
+the island position, then scores every candidate (lower is better) on:
+
+  - work triangle: fridge, stove and sink fronts; each leg 4'-9', perimeter
+    13'-26', shorter is better, and the island may not cut a leg by more
+    than 1',
+  - clearances: 3.5' work aisles between the island and the counters or the
+    fridge, 3' walkways to the walls,
+  - door swing: the entry door, the dishwasher and the oven doors must not
+    sweep into the island,
+  - counter continuity: landing space beside the stove (1.25'/1') and the
+    sink (2'/1.5') and at least 3' of prep counter between them.
+
+Candidates are generated and scored as NumPy arrays in batches spread over a
+process pool; each batch keeps its own best few and the best of all are
+returned as Layout.py layouts.  Near-duplicates (every position within
+DISTINCT of a better layout's, same dishwasher side) are passed over, so the
+top N are N different kitchens.  All dimensions are in feet; ROOM and SIZES
+are those of the kitchen spec (spec.load_spec), and room_of() gives them
+for any other spec model.
+
+Usage: python optimizer.py [width length] [--top N] [-j workers] [-o out_dir]
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kitchen_model import FT
+from spec import kitchen_boxes, load_spec
+
+
+def room_of(model):
+    """(ROOM, SIZES) in feet of a spec model, for optimize(*room_of(model))."""
+    d = {k: v / FT for k, v in model["dimensions"].items()}
+    x = {b["name"]: b["x"] / FT - d["wall_thickness"] for b in kitchen_boxes(model)}
+    room = {
+        "kitchen_width": d["kitchen_width"],
+        "kitchen_length": d["kitchen_length"],
+        "appliance_depth": d["counter_depth"],
+        "counter_start": d["counter_start"],  # Start of the long counter run, beyond the fridge
+        "door_width": d["door_width"],
+    }
+    sizes = {
+        "fridge_width": d["fridge_width"],
+        "fridge_depth": d["fridge_depth"],
+        "fridge_x": x["Fridge"],
+        "sink_width": d["sink_width"],
+        "dishwasher_width": d["dishwasher_width"],
+        "stove_width": d["stove_width"],
+        "stove_depth": d["stove_depth"],
+        "stove_x": x["Stove"],
+        "island_width": d["island_width"],
+        "island_length": d["island_length"],
+    }
+    return room, sizes
+
+
+ROOM, SIZES = room_of(load_spec())
+
+WEIGHTS = {
+    "triangle": 1.0,
+    "legs": 4.0,
+    "obstruction": 6.0,
+    "clearance": 8.0,
+    "door_swing": 6.0,
+    "landing": 4.0,
+    "prep": 3.0,
+}
+
+STEP = 0.25  # Search grid (ft)
+DISTINCT = 1.0  # Layouts closer than this in every position are one layout
+AISLE = 3.5  # Work aisle (42")
+WALKWAY = 3.0  # Walkway to walls (36")
+APPLIANCE_DOOR = 2.0  # Depth swept by dishwasher and oven doors
+
+
+def _axis(lo, hi, step):
+    if hi < lo - 1e-9:
+        return np.empty(0)
+    return np.arange(lo, hi + 1e-9, step)
+
+
+def search_axes(room=ROOM, sizes=SIZES, step=STEP, island=True):
+    """1D grids of the free variables; their Cartesian product is the search space."""
+    W, L, D = room["kitchen_width"], room["kitchen_length"], room["appliance_depth"]
+    back_end = W - room["door_width"]
+    axes = {
+        "stove_y": _axis(room["counter_start"], L - D - sizes["stove_width"], step),
+        "sink_x": _axis(D, back_end - sizes["sink_width"], step),
+        "dw_side": np.array([0.0, 1.0]),  # 0: dishwasher left of the sink, 1: right
+    }
+    if island and sizes["island_width"] > 0:  # A spec without an island has width 0
+        axes["island_x"] = _axis(D, W - sizes["island_width"], step)
+        axes["island_y"] = _axis(0.0, L - D - sizes["island_length"], step)
+    return axes
+
+
+def _segment_in_rect(p, q, lo, hi):
+    """Length of segments p->q inside axis-aligned rectangles (slab clipping)."""
+    d = q - p
+    t0 = np.zeros(len(p))
+    t1 = np.ones(len(p))
+    for k in range(2):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a = (lo[:, k] - p[:, k]) / d[:, k]
+            b = (hi[:, k] - p[:, k]) / d[:, k]
+        parallel = np.abs(d[:, k]) < 1e-12
+        inside = (p[:, k] >= lo[:, k]) & (p[:, k] <= hi[:, k])
+        a = np.where(parallel, np.where(inside, -np.inf, np.inf), a)
+        b = np.where(parallel, np.where(inside, np.inf, -np.inf), b)
+        t0 = np.maximum(t0, np.minimum(a, b))
+        t1 = np.minimum(t1, np.maximum(a, b))
+    return np.maximum(t1 - t0, 0.0) * np.hypot(d[:, 0], d[:, 1])
+
+
+def _rect_gap(lo1, hi1, lo2, hi2):
+    """Distance between rectangles; negative (depth) when they overlap."""
+    gap = np.maximum(lo2 - hi1, lo1 - hi2)
+    outside = np.hypot(*np.maximum(gap, 0.0).T)
+    return np.where((gap > 0).any(axis=1), outside, gap.max(axis=1))
+
+
+def _shortfall(value, required):
+    return np.maximum(required - value, 0.0)
+
+
+def score(c, room=ROOM, sizes=SIZES, weights=WEIGHTS):
+    """Scores candidate arrays `c` (see search_axes).
+
+    Returns (total, valid, components); invalid candidates have overlapping
+    parts and a total of +inf.
+    """
+    W, L, D = room["kitchen_width"], room["kitchen_length"], room["appliance_depth"]
+    back_end = W - room["door_width"]
+    s = sizes
+    n = len(c["stove_y"])
+    stove_y, sink_x = c["stove_y"], c["sink_x"]
+    stove_end = stove_y + s["stove_width"]
+    dw_x = np.where(c["dw_side"] > 0, sink_x + s["sink_width"], sink_x - s["dishwasher_width"])
+    valid = (dw_x >= D - 1e-9) & (dw_x + s["dishwasher_width"] <= back_end + 1e-9)
+
+    # Counter either side of the sink; the dishwasher top counts as counter
+    sink_left = sink_x
+    sink_right = back_end - sink_x - s["sink_width"]
+
+    components = {}
+
+    # Work triangle between the appliance fronts
+    fridge = np.tile([s["fridge_x"] + s["fridge_depth"], s["fridge_width"] / 2], (n, 1))
+    stove = np.column_stack((np.full(n, D), stove_y + s["stove_width"] / 2))
+    sink = np.column_stack((sink_x + s["sink_width"] / 2, np.full(n, L - D)))
+    legs = [(fridge, stove), (stove, sink), (sink, fridge)]
+    lengths = np.column_stack([np.hypot(*(q - p).T) for p, q in legs])
+    perimeter = lengths.sum(axis=1)
+    components["triangle"] = perimeter / 26.0 + _shortfall(perimeter, 13.0) + np.maximum(perimeter - 26.0, 0.0)
+    components["legs"] = (_shortfall(lengths, 4.0) + np.maximum(lengths - 9.0, 0.0)).sum(axis=1)
+
+    # Landing space and prep counter
+    components["landing"] = (
+        _shortfall(np.maximum(stove_y - room["counter_start"], L - D - stove_end), 1.25)
+        + _shortfall(np.minimum(stove_y - room["counter_start"], L - D - stove_end), 1.0)
+        + _shortfall(np.maximum(sink_left, sink_right), 2.0)
+        + _shortfall(np.minimum(sink_left, sink_right), 1.5)
+    )
+    prep = (L - D - stove_end) + (sink_x - D)
+    components["prep"] = _shortfall(prep, 3.0)
+
+    zero = np.zeros(n)
+    if "island_x" in c:
+        lo = np.column_stack((c["island_x"], c["island_y"]))
+        hi = lo + [s["island_width"], s["island_length"]]
+
+        # Aisles to the counter fronts and the fridge, walkways to the walls
+        fridge_lo = np.tile([s["fridge_x"], 0.0], (n, 1))
+        fridge_hi = fridge_lo + [s["fridge_depth"], s["fridge_width"]]
+        west = lo[:, 0] - D
+        north = (L - D) - hi[:, 1]
+        to_fridge = _rect_gap(lo, hi, fridge_lo, fridge_hi)
+        valid &= (west > 0) & (north > 0) & (to_fridge > 0)
+        components["clearance"] = (
+            _shortfall(west, AISLE) ** 2
+            + _shortfall(north, AISLE) ** 2
+            + _shortfall(to_fridge, AISLE) ** 2
+            + _shortfall(W - hi[:, 0], WALKWAY) ** 2
+        )
+
+        # Door swings: entry door about its hinge, dishwasher and oven doors
+        hinge = np.array([W, L])
+        nearest = np.clip(hinge, lo, hi)
+        to_hinge = np.hypot(*(nearest - hinge).T)
+        dw_sweep_lo = np.column_stack((dw_x, np.full(n, L - D - APPLIANCE_DOOR)))
+        dw_sweep_hi = np.column_stack((dw_x + s["dishwasher_width"], np.full(n, L - D)))
+        oven_sweep_lo = np.column_stack((np.full(n, D), stove_y))
+        oven_sweep_hi = np.column_stack((np.full(n, D + APPLIANCE_DOOR), stove_end))
+        components["door_swing"] = (
+            _shortfall(to_hinge, room["door_width"])
+            + _shortfall(_rect_gap(lo, hi, dw_sweep_lo, dw_sweep_hi), 0.0)
+            + _shortfall(_rect_gap(lo, hi, oven_sweep_lo, oven_sweep_hi), 0.0)
+        )
+
+        blocked = sum(_segment_in_rect(p, q, lo, hi) for p, q in legs)
+        components["obstruction"] = np.maximum(blocked - 1.0, 0.0)
+    else:
+        components["clearance"] = components["door_swing"] = components["obstruction"] = zero
+
+    total = sum(weights[k] * v for k, v in components.items())
+    total = np.where(valid, total, np.inf)
+    return total, valid, components
+
+
+def _candidates(axes, chunk):
+    """Cartesian product of the axes with the first axis restricted to `chunk`."""
+    names = list(axes)
+    grids = np.meshgrid(chunk, *(axes[k] for k in names[1:]), indexing="ij")
+    return {k: g.ravel() for k, g in zip(names, grids)}
+
+
+def _distinct(total, c, top, distinct=DISTINCT):
+    """Indices of the best `top` finite candidates, passing over any within
+    `distinct` of a better one in every position."""
+    order = np.argsort(total, kind="stable")
+    order = order[np.isfinite(total[order])]
+    keep = []
+    while len(order) and len(keep) < top:
+        best = order[0]
+        keep.append(best)
+        near = np.ones(len(order), dtype=bool)
+        for k, v in c.items():
+            near &= (v[order] == v[best]) if k == "dw_side" else (np.abs(v[order] - v[best]) < distinct)
+        near[0] = True
+        order = order[~near]
+    return np.array(keep, dtype=int)
+
+
+def _best_of_chunk(args):
+    axes, chunk, room, sizes, weights, top, distinct = args
+    c = _candidates(axes, chunk)
+    total, _, _ = score(c, room, sizes, weights)
+    keep = _distinct(total, c, top, distinct)
+    return total[keep], {k: v[keep] for k, v in c.items()}
+
+
+def optimize(room=None, sizes=None, weights=None, top=5, step=STEP, workers=None, island=True,
+             distinct=DISTINCT):
+    """Best `top` candidates as (score, params) with params a dict of floats,
+    no two within `distinct` of each other in every position (0: keep all).
+
+    When no placement of the island fits, the search is repeated without it.
+    """
+    room = dict(ROOM, **(room or {}))
+    sizes = dict(SIZES, **(sizes or {}))
+    weights = dict(WEIGHTS, **(weights or {}))
+    axes = search_axes(room, sizes, step, island)
+    first = axes["stove_y"]
+    if any(len(a) == 0 for a in axes.values()):
+        return optimize(room, sizes, weights, top, step, workers, False, distinct) if island else []
+
+    chunks = np.array_split(first, min(len(first), (workers or os.cpu_count() or 1) * 4))
+    tasks = [(axes, chunk, room, sizes, weights, top, distinct) for chunk in chunks]
+    if workers == 1 or len(tasks) == 1:
+        results = list(map(_best_of_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_best_of_chunk, tasks))
+
+    totals = np.concatenate([r[0] for r in results])
+    params = {k: np.concatenate([r[1][k] for r in results]) for k in axes}
+    order = _distinct(totals, params, top, distinct)
+    if not len(order) and island:
+        return optimize(room, sizes, weights, top, step, workers, False, distinct)
+    return [(float(totals[i]), {k: float(v[i]) for k, v in params.items()}) for i in order]
+
+
+def breakdown(params, room=None, sizes=None, weights=None):
+    """Weighted score components of one candidate."""
+    room = dict(ROOM, **(room or {}))
+    sizes = dict(SIZES, **(sizes or {}))
+    weights = dict(WEIGHTS, **(weights or {}))
+    _, _, components = score({k: np.array([v]) for k, v in params.items()}, room, sizes, weights)
+    return {k: float(weights[k] * v[0]) for k, v in components.items()}
+
+
+def to_layout(params, room=None, sizes=None, title="Kitchen Layout"):
+    """Layout.py layout of one candidate."""
+    from Layout import door_points
+    room = dict(ROOM, **(room or {}))
+    s = dict(SIZES, **(sizes or {}))
+    W, L, D = room["kitchen_width"], room["kitchen_length"], room["appliance_depth"]
+    sink_x = params["sink_x"]
+    dw_x = sink_x + s["sink_width"] if params["dw_side"] > 0 else sink_x - s["dishwasher_width"]
+    island = None
+    if "island_x" in params:
+        island = (params["island_x"], params["island_y"], s["island_width"], s["island_length"])
+    return {
+        "kitchen_width": W,
+        "kitchen_length": L,
+        "appliance_depth": D,
+        "counter_start": room["counter_start"],
+        "door_width": room["door_width"],
+        "appliances": [
+            ("Fridge", s["fridge_x"], 0.0, s["fridge_depth"], s["fridge_width"], "gray"),
+            ("Sink", sink_x, L - D, s["sink_width"], D, "blue"),
+            ("DW", dw_x, L - D, s["dishwasher_width"], D, "green"),
+            ("Stove", s["stove_x"], params["stove_y"], s["stove_depth"], s["stove_width"], "red"),
+        ],
+        "island": island,
+        "door": door_points(W, L, room["door_width"]),
+        "title": title,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search kitchen layouts for a room size")
+    parser.add_argument("size", nargs="*", type=float, help="kitchen width and length in feet")
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--step", type=float, default=STEP, help="search grid in feet")
+    parser.add_argument("--distinct", type=float, default=DISTINCT,
+                        help="feet a layout must differ from a better one to be listed (0: list all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-o", "--out-dir", default=None, help="render the best layouts as PNGs here")
+    args = parser.parse_args()
+    if len(args.size) not in (0, 2):
+        parser.error("size takes both the kitchen width and length, or neither")
+
+    room = {}
+    if args.size:
+        room = {"kitchen_width": args.size[0], "kitchen_length": args.size[1]}
+    axes = search_axes(dict(ROOM, **room), SIZES, args.step)
+    count = math.prod(len(a) for a in axes.values())
+
+    start = time.perf_counter()
+    best = optimize(room, top=args.top, step=args.step, workers=args.jobs, distinct=args.distinct)
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} candidates in {elapsed:.2f} s")
+    if not best:
+        print("❌ No layout fits this room")
+    for rank, (total, params) in enumerate(best, 1):
+        parts = ", ".join(f"{k} {v:.2f}" for k, v in breakdown(params, room).items() if v > 0.005)
+        print(f"#{rank} score {total:.2f}: " + ", ".join(f"{k}={v:.2f}" for k, v in params.items()) + f" ({parts})")
+        if args.out_dir:
+            from Layout import plot_layout
+            os.makedirs(args.out_dir, exist_ok=True)
+            filename = os.path.join(args.out_dir, f"layout_{rank}.png")
+            plot_layout(to_layout(params, room, title=f"Layout #{rank} (score {total:.2f})"), filename)
+            print(f"  saved {filename}")
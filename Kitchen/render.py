@@ -0,0 +1,149 @@
+"""Kitchen layout rendering without pyplot.
+
+Layouts (see Layout.py) are drawn on a plain matplotlib Figure attached to
+an Agg canvas (PNG) or an SVG canvas (no rasterization), picked by the file
+extension.  Nothing touches pyplot's global state or calls show(), so it
+runs on headless servers.  All appliances go into one PatchCollection and
+all outlines into one LineCollection.  A LayoutRenderer reuses its figure
+for many layouts; render_many spreads the layouts over worker processes.
+
+Usage: python render.py [count] [-o out_dir] [--svg] [-j workers] [--dpi N]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+
+DPI = 300
+FIGSIZE = (8, 10)
+DOOR_THICKNESS = 2  # 5x thicker than normal line
+
+
+class LayoutRenderer:
+    """Renders layouts one after another on the same figure.
+
+    The axes, ticks and grid are kept between layouts of the same room size;
+    only the layout artists are replaced.
+    """
+
+    def __init__(self, dpi=DPI, figsize=FIGSIZE):
+        self.dpi = dpi
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.figure.subplots_adjust(left=0.07, right=0.97, bottom=0.05, top=0.95)
+        self.ax = self.figure.add_subplot()
+        self.ax.grid(True, linestyle="--", alpha=0.5)
+        self.room = None
+        self.artists = []
+
+    def _set_room(self, kitchen_width, kitchen_length):
+        if self.room == (kitchen_width, kitchen_length):
+            return
+        self.room = (kitchen_width, kitchen_length)
+        ax = self.ax
+        ax.set_xlim(0, kitchen_width)
+        ax.set_ylim(0, kitchen_length)
+        ax.set_xticks(range(0, int(kitchen_width) + 2, 2))
+        ax.set_yticks(range(0, int(kitchen_length) + 2, 2))
+
+    def draw(self, layout):
+        ax = self.ax
+        for artist in self.artists:
+            artist.remove()
+        kitchen_width = layout["kitchen_width"]
+        kitchen_length = layout["kitchen_length"]
+        depth = layout["appliance_depth"]
+        counter_start = layout["counter_start"]
+        back_end = kitchen_width - layout["door_width"]
+        self._set_room(kitchen_width, kitchen_length)
+
+        # Kitchen boundary, countertop fronts and the partially open door
+        boundary = [(0, 0), (kitchen_width, 0), (kitchen_width, kitchen_length), (0, kitchen_length), (0, 0)]
+        counter = [(0, counter_start), (depth, counter_start), (depth, kitchen_length - depth),
+                   (back_end, kitchen_length - depth), (back_end, kitchen_length)]
+        artists = [ax.add_collection(LineCollection(
+            [boundary, counter, layout["door"]], colors=["k", "b", "r"], linewidths=[2, 3, DOOR_THICKNESS * 5]
+        ), autolim=False)]
+
+        # Appliances and island
+        rects = [Rectangle((x, y), xx, yy) for _, x, y, xx, yy, _ in layout["appliances"]]
+        colors = [color for *_, color in layout["appliances"]]
+        artists.append(ax.add_collection(PatchCollection(rects, facecolors=colors, edgecolors="none"), autolim=False))
+        if layout.get("island"):
+            island_x, island_y, island_width, island_length = layout["island"]
+            artists.append(ax.add_collection(PatchCollection(
+                [Rectangle((island_x, island_y), island_width, island_length)],
+                facecolors="orange", edgecolors="none", alpha=0.7
+            ), autolim=False))
+            artists.append(ax.text(island_x + island_width / 2, island_y + island_length / 2, "Island",
+                                   fontsize=12, color="black", va="center", ha="center", fontweight="bold"))
+        for name, x, y, xx, yy, _ in layout["appliances"]:
+            artists.append(ax.text(x + xx / 2, y + yy / 2, name, fontsize=10, color="white",
+                                   va="center", ha="center", fontweight="bold"))
+        artists.append(ax.set_title(layout.get("title", "Kitchen Layout"), fontsize=14))
+        # The title is owned by the axes; keep it out of the removal list
+        self.artists = artists[:-1]
+
+    def render(self, layout, filename):
+        """Writes `layout` to a .png (Agg) or .svg file."""
+        self.draw(layout)
+        canvas = FigureCanvasSVG if filename.lower().endswith(".svg") else FigureCanvasAgg
+        canvas(self.figure)
+        self.figure.savefig(filename, dpi=self.dpi)
+
+
+def render_layout(layout, filename, dpi=DPI):
+    LayoutRenderer(dpi).render(layout, filename)
+
+
+def _render_batch(args):
+    layouts, filenames, dpi = args
+    renderer = LayoutRenderer(dpi)
+    for layout, filename in zip(layouts, filenames):
+        renderer.render(layout, filename)
+    return len(filenames)
+
+
+def render_many(layouts, filenames, dpi=DPI, workers=None):
+    """Renders layouts to files, one renderer per worker process."""
+    layouts, filenames = list(layouts), list(filenames)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(layouts) < 2:
+        return _render_batch((layouts, filenames, dpi))
+    size = -(-len(layouts) // (workers * 2))
+    tasks = [(layouts[i:i + size], filenames[i:i + size], dpi) for i in range(0, len(layouts), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_render_batch, tasks))
+
+
+if __name__ == "__main__":
+    from Layout import default_layout
+
+    parser = argparse.ArgumentParser(description="Benchmark batch rendering of kitchen layouts")
+    parser.add_argument("count", nargs="?", type=int, default=200)
+    parser.add_argument("-o", "--out-dir", default="layouts")
+    parser.add_argument("--svg", action="store_true", help="write SVG instead of PNG")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    base = default_layout()
+    layouts = []
+    for n in range(args.count):
+        island = base["island"]
+        shift = (n % 8) * 0.25
+        layouts.append(dict(base, island=(island[0] - shift, *island[1:]), title=f"Layout {n + 1}"))
+    ext = "svg" if args.svg else "png"
+    filenames = [os.path.join(args.out_dir, f"layout_{n + 1:04d}.{ext}") for n in range(args.count)]
+
+    start = time.perf_counter()
+    count = render_many(layouts, filenames, args.dpi, args.jobs)
+    elapsed = time.perf_counter() - start
+    print(f"{count} layouts in {elapsed:.2f} s ({count / elapsed * 60:.0f} per minute)")
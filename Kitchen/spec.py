@@ -0,0 +1,241 @@
+"""Declarative kitchen specs shared by the 2D plan, FreeCAD and mesh outputs.
+
+A spec (JSON, or TOML on Python 3.11+) names the kitchen and gives the
+entries of kitchen_model.DIMENSIONS as numbers in the spec's `units` or as
+strings with their own units: "10' 10.5\"", "24\"", "2.33ft", "610mm",
+"30 + 2\"" (terms are added).  load_spec() parses a file once into a
+normalized model ({"name", "dimensions"} in mm) and caches it until the file
+changes; every output is derived from the model's boxes, so the plan and the
+3D model cannot drift apart.
+
+A catalogue lists variants of a base spec, either explicitly
+("variants": [{"name", "dimensions"}]) or as the Cartesian product of
+"vary": {dimension: [values]}; load_models() reads either kind of file.
+build_catalogue() writes the chosen outputs for every variant across worker
+processes:
+
+  - png / svg: the 2D plan (render.py)
+  - glb / obj / stl: the 3D mesh (mesh/box_mesh.py)
+  - json: the box list for C_Shape_FreeCADMacro.py
+
+Usage: python spec.py {spec|catalogue} [-o out_dir] [-f png,glb,json] [-j workers]
+"""
+
+import argparse
+import copy
+import functools
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from kitchen_model import DIMENSIONS, FT, c_shape_kitchen, room_bounds
+
+KITCHEN_DIR = os.path.dirname(os.path.abspath(__file__))
+MESH_DIR = os.path.normpath(os.path.join(KITCHEN_DIR, "..", "mesh"))
+DEFAULT_SPEC = os.path.join(KITCHEN_DIR, "kitchens", "c_shape.json")
+
+UNITS = {"mm": 1.0, "cm": 10.0, "m": 1000.0, "in": 25.4, '"': 25.4, "ft": FT, "'": FT}
+
+_TERM = re.compile(r"""
+    \s*(?P<value>[-+]?(?:\d+\.?\d*|\.\d+))\s*(?P<unit>mm|cm|m|in|ft|"|')?
+    """, re.VERBOSE)
+
+# Boxes drawn on the 2D plan, with their plan labels and colours
+PLAN_ITEMS = {
+    "Fridge": ("Fridge", "gray"),
+    "Sink": ("Sink", "blue"),
+    "Dishwasher": ("DW", "green"),
+    "Stove": ("Stove", "red"),
+    "Microwave": ("MW", "purple"),
+    "Food Processor": ("FP", "brown"),
+}
+
+FORMATS = ("png", "svg", "glb", "obj", "stl", "json")
+
+
+def parse_length(value, units="mm"):
+    """Length in mm from a number (in `units`) or a string with units.
+
+    A leading sign applies to the whole length: -1' 6" is -(1' + 6").
+    """
+    if isinstance(value, (int, float)):
+        return float(value) * UNITS[units]
+    text = str(value).strip()
+    sign = -1.0 if text.startswith("-") else 1.0
+    if text.startswith(("+", "-")):
+        text = text[1:]
+        if not text.strip():
+            raise ValueError(f"Invalid length '{value}'")
+    total = 0.0
+    pos = 0
+    while pos < len(text):
+        match = _TERM.match(text, pos)
+        if not match or not match.group(0).strip():
+            raise ValueError(f"Invalid length '{value}'")
+        total += float(match.group("value")) * UNITS[match.group("unit") or units]
+        pos = match.end()
+        # Terms are separated by whitespace (feet and inches) or '+'
+        while pos < len(text) and text[pos] in " +":
+            pos += 1
+    return sign * total
+
+
+def normalize(spec, name=None):
+    """Model dict ({"name", "dimensions"} in mm) from a raw spec dict."""
+    units = spec.get("units", "mm")
+    if units not in UNITS:
+        raise ValueError(f"Unknown units '{units}' (use {', '.join(k for k in UNITS if k.isalpha())})")
+    unknown = sorted(set(spec.get("dimensions", {})) - set(DIMENSIONS))
+    if unknown:
+        raise ValueError(f"Unknown dimension(s) in spec: {', '.join(unknown)}")
+    dimensions = dict(DIMENSIONS)
+    for key, value in spec.get("dimensions", {}).items():
+        dimensions[key] = parse_length(value, units)
+    return {"name": name or spec.get("name", "kitchen"), "dimensions": dimensions}
+
+
+def _read(path):
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_spec(path, mtime_ns):
+    return normalize(_read(path))
+
+
+def load_spec(path=DEFAULT_SPEC):
+    """Normalized model of a spec file, parsed once per file version."""
+    path = os.path.abspath(path)
+    return copy.deepcopy(_load_spec(path, os.stat(path).st_mtime_ns))
+
+
+def load_catalogue(path):
+    """Normalized models of every variant of a catalogue file."""
+    catalogue = _read(path)
+    base_path = os.path.join(os.path.dirname(os.path.abspath(path)), catalogue["base"])
+    base = _read(base_path)
+    base_name = base.get("name", "kitchen")
+    variants = list(catalogue.get("variants", []))
+    vary = catalogue.get("vary", {})
+    if vary:
+        keys = list(vary)
+        for n, values in enumerate(itertools.product(*(vary[k] for k in keys)), 1):
+            variants.append({"name": f"{base_name}_{n:04d}", "dimensions": dict(zip(keys, values))})
+    models = []
+    for variant in variants:
+        spec = dict(base, dimensions=dict(base.get("dimensions", {}), **variant.get("dimensions", {})))
+        models.append(normalize(spec, variant.get("name")))
+    return models
+
+
+def load_models(path):
+    """Models of a spec file: every variant of a catalogue (it names a
+    "base" spec), or the one model of a plain spec."""
+    if "base" in _read(path):
+        return load_catalogue(path)
+    return [load_spec(path)]
+
+
+def kitchen_boxes(model):
+    return c_shape_kitchen(model["dimensions"])
+
+
+def plan_layout(model, boxes=None):
+    """Layout.py layout (feet, inside the walls) projected from the model's boxes."""
+    from Layout import door_points
+    d = model["dimensions"]
+    boxes = boxes if boxes is not None else kitchen_boxes(model)
+    x0 = d["wall_thickness"]
+    appliances = []
+    island = None
+    for b in boxes:
+        rect = ((b["x"] - x0) / FT, b["y"] / FT, b["length"] / FT, b["width"] / FT)
+        if b["name"] in PLAN_ITEMS:
+            label, color = PLAN_ITEMS[b["name"]]
+            appliances.append((label, *rect, color))
+        elif b["name"] == "Island":
+            island = rect
+    width, length, door_width = d["kitchen_width"] / FT, d["kitchen_length"] / FT, d["door_width"] / FT
+    return {
+        "kitchen_width": width,
+        "kitchen_length": length,
+        "appliance_depth": d["counter_depth"] / FT,
+        "counter_start": d["counter_start"] / FT,
+        "door_width": door_width,
+        "appliances": appliances,
+        "island": island,
+        "door": door_points(width, length, door_width),
+        "title": model["name"],
+    }
+
+
+def generate(model, out_dir, formats=("png", "glb", "json"), renderer=None):
+    """Writes the outputs of one model; returns (files, clashes)."""
+    from clash import find_clashes
+    boxes = kitchen_boxes(model)
+    clashes = find_clashes(boxes, bounds=room_bounds(model["dimensions"]))
+    files = []
+    for fmt in formats:
+        filename = os.path.join(out_dir, f"{model['name']}.{fmt}")
+        if fmt in ("png", "svg"):
+            from render import LayoutRenderer
+            renderer = renderer or LayoutRenderer(dpi=100)
+            renderer.render(plan_layout(model, boxes), filename)
+        elif fmt in ("glb", "obj", "stl"):
+            if MESH_DIR not in sys.path:
+                sys.path.append(MESH_DIR)
+            from box_mesh import export
+            export(boxes, filename)
+        elif fmt == "json":
+            with open(filename, "w") as f:
+                json.dump({"name": model["name"], "dimensions": model["dimensions"], "boxes": boxes}, f)
+        else:
+            raise ValueError(f"Unknown output format '{fmt}' (use {', '.join(FORMATS)})")
+        files.append(filename)
+    return files, clashes
+
+
+def _generate_batch(args):
+    models, out_dir, formats = args
+    from render import LayoutRenderer
+    renderer = LayoutRenderer(dpi=100)
+    return [(m["name"], len(generate(m, out_dir, formats, renderer)[1])) for m in models]
+
+
+def build_catalogue(models, out_dir, formats=("png", "glb", "json"), workers=None):
+    """Generates every model's outputs in parallel; returns {name: clash count}."""
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(models) < 2:
+        return dict(_generate_batch((models, out_dir, formats)))
+    size = -(-len(models) // (workers * 4))
+    tasks = [(models[i:i + size], out_dir, formats) for i in range(0, len(models), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pair for batch in pool.map(_generate_batch, tasks) for pair in batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate kitchen outputs from a spec or a catalogue of variants")
+    parser.add_argument("path", nargs="?", default=DEFAULT_SPEC, help="spec or catalogue (.json/.toml)")
+    parser.add_argument("-o", "--out-dir", default=".")
+    parser.add_argument("-f", "--formats", default="png,glb,json", help=f"comma-separated: {','.join(FORMATS)}")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    start = time.perf_counter()
+    models = load_models(args.path)
+    results = build_catalogue(models, args.out_dir, formats, args.jobs)
+    elapsed = time.perf_counter() - start
+    clashing = sum(1 for count in results.values() if count)
+    print(f"{len(results)} kitchen(s) in {elapsed:.2f} s ({len(results) / elapsed * 60:.0f} per minute), "
+          f"{clashing} with clashes; outputs in {args.out_dir}")
@@ -0,0 +1,57 @@
+"""The kitchen spec against the model it overrides: no new clashes, and the
+2D plan projected from the same boxes.
+
+Usage: python -m pytest Kitchen/test_spec.py
+"""
+
+import os
+
+import pytest
+
+from clash import find_clashes
+from kitchen_model import FT, c_shape_kitchen, room_bounds
+from spec import DEFAULT_SPEC, KITCHEN_DIR, load_models, load_spec, plan_layout
+
+
+def clashes(dims=None):
+    return {(c["type"], c["a"], c["b"]) for c in find_clashes(c_shape_kitchen(dims), bounds=room_bounds(dims))}
+
+
+@pytest.fixture
+def model():
+    return load_spec()
+
+
+def test_spec_adds_no_clashes(model):
+    # The clashes of the model's own defaults are known and reported (see clash.py)
+    assert clashes(model["dimensions"]) <= clashes()
+
+
+def test_plan_counter_start(model):
+    boxes = {b["name"]: b for b in c_shape_kitchen(model["dimensions"])}
+    layout = plan_layout(model)
+    assert layout["counter_start"] == pytest.approx(model["dimensions"]["counter_start"] / FT)
+    assert layout["counter_start"] == pytest.approx(boxes["CountertopLong"]["y"] / FT)
+
+
+def test_plan_items_inside_room(model):
+    layout = plan_layout(model)
+    for name, x, y, length, width, _ in layout["appliances"]:
+        assert x >= -1e-9 and x + length <= layout["kitchen_width"] + 1e-9, name
+        assert y >= -1e-9 and y + width <= layout["kitchen_length"] + 1e-9, name
+
+
+def test_optimizer_room_from_spec(model):
+    from optimizer import room_of, to_layout
+    room, sizes = room_of(model)
+    plan = plan_layout(model)
+    assert {k: plan[k] for k in room} == pytest.approx(room)
+    layout = to_layout({"stove_y": 6.5, "sink_x": 2.0, "dw_side": 0.0}, room, sizes)
+    fridge = next(a for a in layout["appliances"] if a[0] == "Fridge")
+    assert fridge[1:5] == pytest.approx(next(a for a in plan["appliances"] if a[0] == "Fridge")[1:5])
+
+
+def test_load_models(model):
+    assert load_models(DEFAULT_SPEC) == [model]
+    variants = load_models(os.path.join(KITCHEN_DIR, "kitchens", "catalogue.json"))
+    assert len(variants) == 360 and len({m["name"] for m in variants}) == 360
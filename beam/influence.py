@@ -0,0 +1,196 @@
+"""Moving-load influence lines and envelopes for the cantilever.
+
+The influence line of a section is its shear or moment under a unit load at
+each position along the span (cantilever.unit_point, the formulas of
+cantBMProcess in src/Civil.c).  They are computed once per section on a
+grid of load positions; the effect of an axle train at every position of
+its lead axle is then the convolution of each influence line with the
+train's axle loads.  With few axles this is a handful of shifted array
+sums, with many it is done with an FFT along the position axis, whichever
+costs fewer operations (FFT_COST).
+
+A train is a list of (load, offset) axles, the offset measured back from
+the lead axle.  The lead axle enters at the free end (x = 0) and the train
+runs until its last axle has left the span; `both_ways` also runs it from
+the fixed end.  Envelopes give the max/min shear and moment at every
+section and the lead-axle position that causes each.
+
+Usage: python influence.py [sections] [positions]   (checks against
+                           cantilever.case_effects and benchmarks trains)
+"""
+
+import functools
+import sys
+import time
+
+import numpy as np
+
+from cantilever import case_effects, sections, unit_point
+
+FFT_COST = 0.5  # Cost of an FFT per point and log2(length), in shifted-sum additions (measured)
+CHUNK = 64  # Sections per block: a block's effects over every lead position stay in cache
+
+
+def fft_size(n):
+    """Smallest 2^a 3^b 5^c >= n: the FFT is as fast on these as on powers of
+    two, and the next power of two can be nearly twice the length."""
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+@functools.lru_cache(maxsize=32)
+def _kernel_spectrum(kernel, size):
+    # kernel as bytes: the same train is reused by every block and effect
+    return np.fft.rfft(np.frombuffer(kernel), size)
+
+
+def pick_method(kernel, n):
+    """Method ("shifted" or "fft") that costs less per section for lines of `n` positions."""
+    size = fft_size(n + len(kernel) - 1)
+    return "shifted" if np.count_nonzero(kernel) * n <= FFT_COST * size * np.log2(size) else "fft"
+
+
+class InfluenceLines:
+    """Shear and moment influence lines of sections `x` at load positions 0..span.
+
+    `positions` is the number of load steps along the span; axle offsets are
+    rounded to that step.
+    """
+
+    def __init__(self, span, x, positions=1000):
+        self.span = float(span)
+        self.x = np.asarray(x, dtype=float)
+        self.step = self.span / positions
+        self.positions = np.linspace(0.0, self.span, positions + 1)
+        self.shear, self.moment = unit_point(self.x, self.positions)
+
+    def kernel(self, train, reverse=False):
+        """Axle loads on the position grid, lead axle first: (K + 1,) array."""
+        train = np.atleast_2d(np.asarray(train, dtype=float))
+        steps = np.rint(train[:, 1] / self.step).astype(int)
+        if (steps < 0).any():
+            raise ValueError("Axle offsets are measured back from the lead axle and must not be negative")
+        kernel = np.zeros(steps.max() + 1)
+        np.add.at(kernel, steps, train[:, 0])
+        return kernel[::-1] if reverse else kernel
+
+    def lead_positions(self, kernel):
+        """Lead-axle positions of every column of a train effect."""
+        return np.arange(len(self.positions) + len(kernel) - 1) * self.step
+
+    def train_effect(self, lines, kernel, method=None, spectra=None):
+        """Effect of the train at every lead-axle position: (S, N + K) array.
+
+        Column j has the lead axle at j * step; axles off the span add nothing.
+        `spectra` (a dict) keeps the FFT of `lines` for further trains.
+        """
+        n = lines.shape[1]
+        method = method or pick_method(kernel, n)
+        width = n + len(kernel) - 1
+        if method == "shifted":
+            effect = np.zeros((lines.shape[0], width))
+            for k in np.flatnonzero(kernel):
+                effect[:, k:k + n] += kernel[k] * lines
+            return effect
+        if method == "fft":
+            size = fft_size(width)
+            spectra = {} if spectra is None else spectra
+            if size not in spectra:
+                spectra[size] = np.fft.rfft(lines, size, axis=1)
+            kernel_spectrum = _kernel_spectrum(np.ascontiguousarray(kernel, dtype=float).tobytes(), size)
+            return np.fft.irfft(spectra[size] * kernel_spectrum, size, axis=1)[:, :width]
+        raise ValueError(f"Unknown method '{method}' (use shifted or fft)")
+
+    def envelope(self, train, both_ways=False, method=None, chunk=CHUNK):
+        """Max/min shear and moment at every section under the moving train.
+
+        Returns a dict of (S,) arrays: V_max, V_min, M_max, M_min and the
+        lead-axle position of each (V_max_at, ...).  With `both_ways` the
+        positions of the reversed run are given from the fixed end as
+        negative numbers (-position) so the two runs can be told apart.
+        """
+        kernel = self.kernel(train)
+        kernels = [(kernel, self.lead_positions(kernel))]
+        if both_ways:
+            # Reversed run: mirror the span, the lead axle enters at the fixed end
+            reverse = self.kernel(train, reverse=True)
+            kernels.append((reverse, -(self.span - self.lead_positions(reverse) + self.step * (len(reverse) - 1))))
+        keys = ("V_max", "V_min", "M_max", "M_min")
+        result = {key: np.empty(len(self.x)) for key in keys}
+        result.update({f"{key}_at": np.empty(len(self.x)) for key in keys})
+        for lo in range(0, len(self.x), chunk):
+            block = slice(lo, lo + chunk)
+            best = {}
+            for name, lines in (("V", self.shear[block]), ("M", self.moment[block])):
+                spectra = {}
+                for kernel, lead in kernels:
+                    effect = self.train_effect(lines, kernel, method, spectra)
+                    rows = np.arange(len(effect))
+                    for key, pick in ((f"{name}_max", np.argmax), (f"{name}_min", np.argmin)):
+                        idx = pick(effect, axis=1)
+                        value, at = effect[rows, idx], lead[idx]
+                        if key in best:
+                            old_value, old_at = best[key]
+                            better = value > old_value if key.endswith("max") else value < old_value
+                            value, at = np.where(better, value, old_value), np.where(better, at, old_at)
+                        best[key] = (value, at)
+            for key, (value, at) in best.items():
+                result[key][block] = value
+                result[f"{key}_at"][block] = at
+        return result
+
+
+def brute_force(span, x, train, lead):
+    """Effect of the train with its lead axle at `lead` by direct summation."""
+    axles = [[p, lead - d] for p, d in train if 0.0 <= lead - d <= span]
+    v, m = case_effects(x, [{"point": axles}])
+    return v[:, 0], m[:, 0]
+
+
+TRAINS = {
+    "crane (2 wheels)": [(120.0, 0.0), (120.0, 3.5)],
+    "truck (5 axles)": [(40.0, 0.0), (110.0, 3.0), (110.0, 4.5), (90.0, 9.0), (90.0, 10.5)],
+    "train (80 axles)": [(200.0, 2.5 * i) for i in range(80)],
+}
+
+
+if __name__ == "__main__":
+    n_sections = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_positions = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    span = 40.0
+
+    # Spot check against placing the train by hand on a small grid
+    small = InfluenceLines(span, sections(span, 40), 400)
+    for name, train in TRAINS.items():
+        kernel = small.kernel(train)
+        lead = small.lead_positions(kernel)
+        for method in ("shifted", "fft"):
+            v = small.train_effect(small.shear, kernel, method)
+            m = small.train_effect(small.moment, kernel, method)
+            for j in (0, len(lead) // 3, len(lead) // 2, len(lead) - 1):
+                v_ref, m_ref = brute_force(span, small.x, train, lead[j])
+                if not (np.allclose(v[:, j], v_ref) and np.allclose(m[:, j], m_ref)):
+                    print(f"❌ {name} ({method}) differs from direct summation at lead = {lead[j]:.2f}")
+                    sys.exit(1)
+    print("✅ shifted sums and FFT match direct summation")
+
+    start = time.perf_counter()
+    lines = InfluenceLines(span, sections(span, n_sections - 1), n_positions)
+    print(f"Influence lines: {n_sections:,} sections x {n_positions + 1:,} positions in "
+          f"{time.perf_counter() - start:.3f} s")
+    for name, train in TRAINS.items():
+        start = time.perf_counter()
+        env = lines.envelope(train, both_ways=True)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<17} {elapsed:7.3f} s   fixed end M_min = {env['M_min'][-1]:12.1f} "
+              f"(lead axle at {env['M_min_at'][-1]:.2f})")
@@ -0,0 +1,136 @@
+"""Load test of the beam service against the CGI + gnuplot path.
+
+A request is what a browser does after submitting form.html: fetch the
+result page (following redirects, as the CGI answers with Location:
+index.sh) and then every image on it.  Requests cycle through `distinct`
+random load sets, so with fewer distinct inputs than requests the service
+cache is exercised.  Reports requests per second and p50/p99 latency.
+
+Targets:
+  (default)     service.py started in this process on a free port
+  --url URL     any server, e.g. the CGI install http://host/~user/civil/main
+  --cgi PATH    the src/main binary and gnuplot run directly per request,
+                as the web server would fork them, in a scratch directory each
+
+Usage: python loadtest.py [-n requests] [-c concurrency] [--distinct N] [--url URL] [--cgi src/main]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin
+
+import numpy as np
+
+from service import ROOT, make_server
+
+IMAGE = re.compile(r"""<img\s+src=["']([^"']+)["']""")
+
+
+def random_queries(count, rng):
+    """Form submissions like form.html sends: repeated p/ac and wu/au/lu fields."""
+    queries = []
+    for _ in range(count):
+        span = float(rng.integers(2, 20))
+        nc, nu = int(rng.integers(0, 5)), int(rng.integers(0, 3))
+        fields = [("nc", nc), ("nu", nu), ("spanbeam", span), ("noseg", int(rng.integers(5, 200)))]
+        fields += [("p", round(rng.uniform(1, 20), 2)) for _ in range(nc)]
+        fields += [("ac", round(rng.uniform(0, span), 2)) for _ in range(nc)]
+        starts = [round(rng.uniform(0, span / 2), 2) for _ in range(nu)]
+        fields += [("wu", round(rng.uniform(1, 10), 2)) for _ in range(nu)]
+        fields += [("au", a) for a in starts]
+        fields += [("lu", round(rng.uniform(0, span - a), 2)) for a in starts]
+        fields.append(("initialparameter", "Submit"))
+        queries.append(urlencode(fields))
+    return queries
+
+
+def http_request(base, query):
+    """Result page and its images; returns the bytes received."""
+    with urllib.request.urlopen(f"{base}?{query}") as response:
+        page = response.read()
+        final = response.geturl()
+    size = len(page)
+    for src in IMAGE.findall(page.decode(errors="replace")):
+        with urllib.request.urlopen(urljoin(final, src)) as response:
+            size += len(response.read())
+    return size
+
+
+def cgi_request(binary, query):
+    """src/main then gnuplot.sh, as index.sh runs them, in a scratch directory."""
+    with tempfile.TemporaryDirectory() as work:
+        for name in ("header.html", "form.html", "footer.html", "output.html", "gnuplot.sh"):
+            shutil.copy(os.path.join(ROOT, name), work)
+        env = dict(os.environ, QUERY_STRING=query, REQUEST_METHOD="GET", GATEWAY_INTERFACE="CGI/1.1")
+        subprocess.run([binary], cwd=work, env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(os.path.join(work, "gnuplot.sh"), "rb") as script:
+            subprocess.run(["gnuplot"], cwd=work, stdin=script, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return sum(os.path.getsize(os.path.join(work, name)) for name in ("BM.png", "SF.png"))
+
+
+def run(request, queries, count, concurrency):
+    latencies = np.empty(count)
+    errors = []
+
+    def one(n):
+        start = time.perf_counter()
+        try:
+            request(queries[n % len(queries)])
+        except Exception as e:
+            errors.append(e)
+        latencies[n] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(count)))
+    elapsed = time.perf_counter() - start
+    return elapsed, latencies, errors
+
+
+def report(label, count, elapsed, latencies, errors):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    status = "✅" if not errors else f"⚠️ {len(errors)} failed ({errors[0]})"
+    print(f"{label:<8} {count:>6} requests in {elapsed:6.2f} s: {count / elapsed:8.1f} req/s, "
+          f"p50 {p50:7.1f} ms, p99 {p99:7.1f} ms {status}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the beam service and the CGI path")
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--distinct", type=int, default=50, help="different inputs to cycle through")
+    parser.add_argument("--url", help="test this server instead of an in-process service.py")
+    parser.add_argument("--cgi", help="also run this CGI binary (src/main) with gnuplot directly")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    queries = random_queries(args.distinct, np.random.default_rng(args.seed))
+
+    server = None
+    base = args.url
+    if base is None:
+        server = make_server(port=0, cache_size=max(args.distinct, 1))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}/"
+    report("service", args.requests, *run(lambda q: http_request(base, q), queries, args.requests, args.concurrency))
+    if server is not None:
+        stats = server.RequestHandlerClass.cache.stats()
+        print(f"         cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_ratio']:.0%})")
+        server.shutdown()
+
+    if args.cgi:
+        binary = os.path.abspath(args.cgi)
+        if not os.access(binary, os.X_OK) or shutil.which("gnuplot") is None:
+            print(f"❌ CGI path needs an executable {args.cgi} (make -C src) and gnuplot on PATH")
+            sys.exit(1)
+        report("cgi", args.requests, *run(lambda q: cgi_request(binary, q), queries, args.requests, args.concurrency))
@@ -0,0 +1,278 @@
+"""Cantilever beam web service: the form.html flow without CGI or gnuplot.
+
+Serves the same page as src/main (header.html, form.html, footer.html) and
+accepts the same fields: nc, nu, spanbeam, noseg and the load lists p, ac
+(point loads) and wu, au, lu (UDLs).  Shear force and bending moment are
+computed in-process with cantilever.py and the plots are drawn in memory
+with matplotlib; nothing is written to disk, so concurrent users cannot
+overwrite each other's cantbm.out / cantsf.out / BM.png / SF.png.
+
+Results are cached by a hash of the normalized inputs (numbers parsed, load
+order ignored) in an LRU cache, so repeated requests skip the computation
+and the rendering.
+
+  GET /?initialparameter=...&nc=..  result page (the output.html images)
+  GET /BM.png?... /SF.png?...       plots
+  GET /cantbm.out?... /cantsf.out?...  the tables cantBMOutput writes
+  GET /beam.json?...                x, V, M as JSON
+  GET /stats                        cache statistics
+
+Usage: python service.py [--host 127.0.0.1] [--port 8000] [--cache 1024]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+import queue
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from cantilever import analyse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CACHE_SIZE = 1024
+MAX_SEGMENTS = 100_000
+MAX_LOADS = 1000
+FIGSIZE = (6.4, 4.8)  # gnuplot's default 640x480 png
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _number(fields, name, index=0, convert=float):
+    values = fields.get(name, [])
+    if index >= len(values):
+        raise BadRequest(f"Missing value {index + 1} of '{name}'")
+    try:
+        value = convert(values[index])
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a number, got '{values[index]}'") from None
+    if not math.isfinite(value):
+        # float() takes nan and inf, which would poison the analysis and the cache key
+        raise BadRequest(f"'{name}' must be a finite number, got '{values[index]}'")
+    return value
+
+
+def normalize(fields):
+    """Canonical inputs from the form fields ({name: [values]})."""
+    nc = _number(fields, "nc", convert=int)
+    nu = _number(fields, "nu", convert=int)
+    span = _number(fields, "spanbeam")
+    segments = _number(fields, "noseg", convert=int)
+    if span <= 0:
+        raise BadRequest("The span of the beam must be positive")
+    if not 1 <= segments <= MAX_SEGMENTS:
+        raise BadRequest(f"The number of segments must be between 1 and {MAX_SEGMENTS}")
+    if not (0 <= nc <= MAX_LOADS and 0 <= nu <= MAX_LOADS):
+        raise BadRequest(f"Between 0 and {MAX_LOADS} loads of each kind")
+    point = sorted([_number(fields, "p", i), _number(fields, "ac", i)] for i in range(nc))
+    udl = sorted([_number(fields, "wu", i), _number(fields, "au", i), _number(fields, "lu", i)] for i in range(nu))
+    return {"span": span, "segments": segments, "point": point, "udl": udl}
+
+
+def input_key(inputs):
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def output_rows(x, v, m, point_loads):
+    """(x, V) and (x, M) rows like cantBMOutput: a second row at each point load."""
+    sf, bm = [], []
+    for xi, vi, mi in zip(x, v, m):
+        sf.append((xi, vi))
+        bm.append((xi, mi))
+        for p, a in point_loads:
+            if np.isclose(xi, a):
+                sf.append((xi, vi + p))
+                bm.append((xi, mi))
+    return sf, bm
+
+
+def table(rows):
+    return "".join(f"{x:5.0f} {y:10.3f}\n" for x, y in rows).encode()
+
+
+class Plotter:
+    """One diagram figure, reused for every plot it draws."""
+
+    def __init__(self):
+        self.figure = Figure(figsize=FIGSIZE, dpi=100)
+        FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot()
+        self.line, = ax.plot([], [], color="green", marker="+", linewidth=1)
+        ax.set_xlabel("x axis", color="black")
+        ax.set_ylabel("y axis", color="red")
+        for spine in ax.spines.values():
+            spine.set_edgecolor("grey")
+
+    def plot(self, rows, title):
+        """PNG bytes of one diagram, styled after gnuplot.sh."""
+        x, y = zip(*rows)
+        self.line.set_data(x, y)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(title, color="blue")
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format="png")
+        return buffer.getvalue()
+
+
+# Idle plotters; the server starts a thread per request, so they are pooled
+_plotters = queue.SimpleQueue()
+
+
+def plot(rows, title):
+    try:
+        plotter = _plotters.get_nowait()
+    except queue.Empty:
+        plotter = Plotter()
+    try:
+        return plotter.plot(rows, title)
+    finally:
+        _plotters.put(plotter)
+
+
+class LRUCache:
+    """Thread-safe mapping that forgets the least recently used entries."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key, make):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return self.data[key]
+            self.misses += 1
+        # Computed outside the lock; two threads may build the same entry once each
+        value = make()
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {"entries": len(self.data), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "hit_ratio": self.hits / total if total else 0.0}
+
+
+class Result:
+    """Analysis of one input; plots and tables are made on first use."""
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.x, self.v, self.m = analyse(inputs["span"], inputs["segments"], inputs["point"], inputs["udl"])
+        self.sf, self.bm = output_rows(self.x, self.v, self.m, inputs["point"])
+        self.files = {}
+        self.lock = threading.Lock()
+
+    def file(self, name):
+        with self.lock:
+            if name not in self.files:
+                self.files[name] = {
+                    "BM.png": lambda: plot(self.bm, "BM"),
+                    "SF.png": lambda: plot(self.sf, "SF"),
+                    "cantbm.out": lambda: table(self.bm),
+                    "cantsf.out": lambda: table(self.sf),
+                    "beam.json": lambda: json.dumps({"x": self.x.tolist(), "V": self.v.tolist(),
+                                                     "M": self.m.tolist()}).encode(),
+                }[name]()
+            return self.files[name]
+
+
+CONTENT_TYPES = {".png": "image/png", ".out": "text/plain", ".json": "application/json"}
+FILES = ("BM.png", "SF.png", "cantbm.out", "cantsf.out", "beam.json")
+
+
+def page(*names, body=""):
+    parts = []
+    for name in names:
+        with open(os.path.join(ROOT, name)) as f:
+            parts.append(f.read())
+    return "".join(parts[:-1]) + body + parts[-1]
+
+
+class BeamHandler(BaseHTTPRequestHandler):
+    cache = LRUCache()
+
+    def result(self, fields):
+        inputs = normalize(fields)
+        return self.cache.get(input_key(inputs), lambda: Result(inputs))
+
+    def send(self, status, body, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        fields = parse_qs(url.query, keep_blank_values=True)
+        name = url.path.lstrip("/")
+        try:
+            if name in FILES:
+                self.send(200, self.result(fields).file(name), CONTENT_TYPES[os.path.splitext(name)[1]])
+            elif name == "stats":
+                self.send(200, json.dumps(self.cache.stats()).encode(), CONTENT_TYPES[".json"])
+            elif name in ("", "main"):
+                if "initialparameter" in fields:
+                    self.result(fields)
+                    # output.html points at the CGI's photos directory; use this request's plots
+                    query = url.query
+                    images = (f'<h1 style="text-align:center;">Output Images</h1>\n<div class="container well">\n'
+                              f'\t<img src="BM.png?{query}" class=\'img-polaroid\' />\n'
+                              f'\t<img src="SF.png?{query}" class=\'img-polaroid\' />\n</div>\n')
+                    self.send(200, page("header.html", "footer.html", body=images).encode())
+                else:
+                    self.send(200, page("header.html", "form.html", "footer.html").encode())
+            else:
+                self.send(404, b"Not found", "text/plain")
+        except BadRequest as e:
+            self.send(400, str(e).encode(), "text/plain")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8000, cache_size=CACHE_SIZE, verbose=False):
+    """A ready-to-run server; port 0 picks a free port (server.server_address)."""
+    handler = type("Handler", (BeamHandler,), {"cache": LRUCache(cache_size)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cantilever beam SF/BM web service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache", type=int, default=CACHE_SIZE, help="results kept in the LRU cache")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.cache, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,178 @@
+"""Benchmark harness: scaling of every generator on synthetic inputs.
+
+Runs the workloads of workloads.py over a ladder of sizes and records, for
+each size, the median wall time of `repeat` runs, the peak memory of one more
+run under tracemalloc (Python and NumPy allocations; buffers allocated
+inside C libraries such as Agg are not seen) and the size of the output.
+
+Results are saved as JSON and can be compared with a baseline saved
+earlier on the same machine: a time or memory that grew by more than the
+threshold is a regression and the run exits with status 1.  A time that
+grew is measured once more first and counts only if it is slow again; times
+under --min-time are too noisy to compare and are skipped.
+
+Usage: python bench.py [workload...] [--quick] [--repeat N] [-o results.json]
+                       [--baseline baseline.json] [--save-baseline baseline.json]
+                       [--threshold 0.25] [--plot scaling.png]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from workloads import WORKLOADS
+
+THRESHOLD = 0.25  # Allowed growth over the baseline (25 %)
+MIN_TIME = 0.02  # s; faster runs are not compared
+REPEAT = 5  # Runs per size; their median is the time
+
+
+def measure(prepare, size, repeat=REPEAT):
+    """{"time", "peak", "output"} of one workload size."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        run = prepare(size, work_dir)
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            output = run()
+            times.append(time.perf_counter() - start)
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"time": statistics.median(times), "peak": peak, "output": output}
+
+
+def run_benchmarks(names, quick=False, repeat=REPEAT, report=print):
+    results = {}
+    for name in names:
+        prepare, unit, sizes, quick_sizes = WORKLOADS[name]
+        results[name] = {"unit": unit, "sizes": {}}
+        for size in quick_sizes if quick else sizes:
+            result = measure(prepare, size, repeat)
+            results[name]["sizes"][str(size)] = result
+            report(f"{name:18s} {size:>7,} {unit:14s} {result['time'] * 1000:10.1f} ms "
+                   f"{result['peak'] / 1e6:9.2f} MB {result['output'] / 1e3:11.1f} kB")
+    return results
+
+
+def _slower(old, new, threshold, min_time):
+    return max(old["time"], new["time"]) >= min_time and new["time"] > old["time"] * (1 + threshold)
+
+
+def confirm(results, baseline, threshold=THRESHOLD, min_time=MIN_TIME, repeat=REPEAT, report=print):
+    """Measures every size that got slower than `baseline` once more and keeps
+    the faster time, so one noisy run is not a regression."""
+    for name, workload in results.items():
+        prepare, unit, sizes, quick_sizes = WORKLOADS[name]
+        measured = {str(size): size for size in sizes + quick_sizes}
+        old_sizes = baseline.get(name, {}).get("sizes", {})
+        for key, new in workload["sizes"].items():
+            old, size = old_sizes.get(key), measured[key]
+            if old and _slower(old, new, threshold, min_time):
+                again = measure(prepare, size, repeat)["time"]
+                report(f"{name:18s} {size:>7,} {unit:14s} {new['time'] * 1000:10.1f} ms, again {again * 1000:.1f} ms")
+                new["time"] = min(new["time"], again)
+
+
+def compare(results, baseline, threshold=THRESHOLD, min_time=MIN_TIME):
+    """Regressions of `results` against `baseline` as readable lines."""
+    regressions = []
+    for name, workload in results.items():
+        old_sizes = baseline.get(name, {}).get("sizes", {})
+        for size, new in workload["sizes"].items():
+            old = old_sizes.get(size)
+            if not old:
+                continue
+            if _slower(old, new, threshold, min_time):
+                regressions.append(f"{name} {size} {workload['unit']}: time {old['time'] * 1000:.1f} -> "
+                                   f"{new['time'] * 1000:.1f} ms (+{new['time'] / old['time'] - 1:.0%})")
+            if old["peak"] and new["peak"] > old["peak"] * (1 + threshold):
+                regressions.append(f"{name} {size} {workload['unit']}: peak {old['peak'] / 1e6:.2f} -> "
+                                   f"{new['peak'] / 1e6:.2f} MB (+{new['peak'] / old['peak'] - 1:.0%})")
+    return regressions
+
+
+def plot_scaling(results, filename):
+    """Log-log time and peak-memory curves of every workload."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(12, 5), dpi=100)
+    FigureCanvasAgg(figure)
+    time_ax, peak_ax = figure.subplots(1, 2)
+    for name, workload in results.items():
+        sizes = [int(s) for s in workload["sizes"]]
+        label = f"{name} ({workload['unit']})"
+        time_ax.plot(sizes, [r["time"] for r in workload["sizes"].values()], marker="o", label=label)
+        peak_ax.plot(sizes, [r["peak"] / 1e6 for r in workload["sizes"].values()], marker="o", label=label)
+    for ax, title in ((time_ax, "Wall time (s)"), (peak_ax, "Peak memory (MB)")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("size (workload units)")
+        ax.set_title(title)
+        ax.grid(True, which="both", linestyle="--", alpha=0.5)
+    time_ax.legend(fontsize=8)
+    figure.tight_layout()
+    figure.savefig(filename)
+
+
+def save(results, filename):
+    with open(filename, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.platform(),
+                   "workloads": results}, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generators on synthetic inputs")
+    parser.add_argument("workloads", nargs="*", help=f"default: all ({', '.join(WORKLOADS)})")
+    parser.add_argument("--quick", action="store_true", help="two small sizes per workload")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("-o", "--output", help="save the results as JSON")
+    parser.add_argument("--baseline", help="compare with this results JSON")
+    parser.add_argument("--save-baseline", help="save the results as the baseline for later runs")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed growth, 0.25 = 25 %%")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="do not compare runs faster than this (s)")
+    parser.add_argument("--plot", help="scaling curves as .png/.svg")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.workloads if name not in WORKLOADS]
+    if unknown:
+        print(f"❌ Unknown workload(s): {', '.join(unknown)} (use {', '.join(WORKLOADS)})")
+        sys.exit(1)
+
+    results = run_benchmarks(args.workloads or list(WORKLOADS), args.quick, args.repeat)
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["workloads"]
+        confirm(results, baseline, args.threshold, args.min_time, args.repeat)
+    for filename in (args.output, args.save_baseline):
+        if filename:
+            save(results, filename)
+    if args.plot:
+        plot_scaling(results, args.plot)
+        print(f"Scaling curves: {args.plot}")
+    if args.baseline:
+        if baseline is None:
+            print(f"⚠️ No baseline at {args.baseline}; save one with --save-baseline")
+            sys.exit(0)
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        print(f"{'❌' if regressions else '✅'} {len(regressions)} regression(s) over {args.threshold:.0%} "
+              f"against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
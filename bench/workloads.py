@@ -0,0 +1,196 @@
+"""Synthetic, size-parameterized workloads for the generators.
+
+Every workload is a function prepare(size, work_dir) that writes or builds
+its synthetic input and returns run(), a callable that does the measured
+work once and returns the size in bytes of what it produced.  `size` is
+the workload's own unit (see WORKLOADS):
+
+  gate              vertical pipes (the gate is made as wide as they need)
+  building-convert  walls in building.txt (8 segments, 4 openings each)
+  building-segments segments per wall (10 walls)
+  plan              walls in the plan DXF (converted from building.txt)
+  wall-csv          walls in the wall/opening CSV (4 openings each), planned
+                    and run on build_plan's recording backend
+  kitchen-layouts   kitchen plans rendered to PNG
+  hatch-union       overlapping rectangles merged into DXF hatches
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+WALL_WINDOW = os.path.join(ROOT, "FreeCADMacros", "BIM", "Wall_Window")
+
+
+def use(*parts):
+    path = os.path.join(ROOT, *parts)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@contextlib.contextmanager
+def patched(module, **values):
+    """Temporarily replaces module constants (the generators read them as globals)."""
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def quiet(function, *args):
+    """Calls function without its progress prints."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+# ------------------------------- Inputs ------------------------------------
+
+def building_txt(walls, segments=8, openings=4):
+    """building.txt text of `walls` zig-zag walls with `segments` segments each."""
+    lines = [
+        "# DEFAULTS", "brick = 230", "wall_height = 3000", "wall_thickness = 1",
+        "lintel_level = 2100", "sill_level = 900",
+        "# DOOR_TYPES", "D1 = Simple door, 900",
+        "# WINDOW_TYPES", "W1 = Open 2-pane, 1000", "W2 = Fixed, 1500, 2000",
+        "# WALL_DATA",
+    ]
+    headings = ("E", "N", "E", "S")
+    for w in range(walls):
+        path = " ".join(f"4000{headings[s % 4]}" for s in range(segments))
+        lines.append(f"Wall{w}: {(w % 50) * 40000},{(w // 50) * 10000} {path}")
+    lines.append("# OPENING_DATA")
+    for w in range(walls):
+        cuts = " ".join(f"{s % segments}: 1000 {'D1' if s % 4 == 0 else 'W1'}" for s in range(min(openings, segments)))
+        lines.append(f"Wall{w}: {cuts}")
+    return "\n".join(lines) + "\n"
+
+
+def wall_csv_rows(walls, openings=4):
+    """Wall/opening CSV rows (see Walls_n_Windows.py) of `walls` walls."""
+    presets = (("Simple door", 900, 2000, 0), ("Open 2-pane", 1000, 1200, 900), ("Fixed", 1500, 1200, 900))
+    for w in range(walls):
+        yield [f"Wall {w}", str(w * 10), "0", "0", "0", str(1200 * openings + 600), "230", "3000"]
+        for i in range(openings):
+            preset, width, height, z = presets[i % len(presets)]
+            yield ["", f"W{w}_{i}", preset, str(width), str(height), str(300 + i * 1200), str(z)]
+
+
+# ------------------------------ Workloads ----------------------------------
+
+def gate(pipes, work_dir):
+    use("dxf")
+    import gate as module
+    # Pipe pitch repeats SPACING_PATTERN; make the three panels wide enough for `pipes` of them
+    pattern = module.SPACING_PATTERN
+    pitch = module.PVH + sum(pattern) / len(pattern)
+    width = 2 * module.EDGE_SPACING + pipes * pitch
+    panels = [(width - sum(module.gap)) / 3] * 3
+    filename = os.path.join(work_dir, "gate.dxf")
+
+    def run():
+        with patched(module, PHL=panels, X_TOTAL=width):
+            quiet(module.main, filename)
+        return os.path.getsize(filename)
+    return run
+
+
+def _building(walls, segments, work_dir):
+    use("FreeCADMacros", "BIM", "Wall_Window", "2")
+    from building_txt2json import convert_building_txt_to_json
+    txt = os.path.join(work_dir, "building.txt")
+    out = os.path.join(work_dir, "parseddata.json")
+    with open(txt, "w") as f:
+        f.write(building_txt(walls, segments))
+
+    def run():
+        quiet(convert_building_txt_to_json, txt, out)
+        return os.path.getsize(out)
+    return run
+
+
+def building_convert(walls, work_dir):
+    return _building(walls, 8, work_dir)
+
+
+def building_segments(segments, work_dir):
+    return _building(10, segments, work_dir)
+
+
+def plan(walls, work_dir):
+    _building(walls, 8, work_dir)()
+    use("dxf")
+    from plan import export_plan
+    source = os.path.join(work_dir, "parseddata.json")
+    filename = os.path.join(work_dir, "plan.dxf")
+
+    def run():
+        quiet(export_plan, source, filename)
+        return os.path.getsize(filename)
+    return run
+
+
+def wall_csv(walls, work_dir):
+    use("FreeCADMacros", "BIM", "Wall_Window")
+    from build_plan import RecordingBackend, execute_plan, plan_from_rows
+    rows = list(wall_csv_rows(walls))
+
+    def run():
+        ops = plan_from_rows(rows)
+        execute_plan(ops, RecordingBackend(keep=False))
+        return len(json.dumps(ops))
+    return run
+
+
+def kitchen_layouts(count, work_dir):
+    use("Kitchen")
+    from Layout import default_layout
+    from render import LayoutRenderer
+    base = default_layout()
+    island = base["island"]
+    layouts = [dict(base, island=(island[0] - (n % 8) * 0.25, *island[1:]), title=f"Layout {n + 1}")
+               for n in range(count)]
+    filenames = [os.path.join(work_dir, f"layout_{n + 1:04d}.png") for n in range(count)]
+
+    def run():
+        renderer = LayoutRenderer(dpi=100)
+        for layout, filename in zip(layouts, filenames):
+            renderer.render(layout, filename)
+        return sum(os.path.getsize(f) for f in filenames)
+    return run
+
+
+def hatch_union(rects, work_dir):
+    use("dxf")
+    import ezdxf
+    import numpy as np
+    from polygon import add_hatches, rect_union
+    rng = np.random.default_rng(rects)
+    corner = rng.uniform(0, 1000 * np.sqrt(rects), (rects, 2))
+    boxes = np.column_stack((corner, corner + rng.uniform(10, 1000, (rects, 2))))
+    filename = os.path.join(work_dir, "hatches.dxf")
+
+    def run():
+        doc = ezdxf.new("R2018")
+        add_hatches(doc.modelspace(), "0", rect_union(boxes))
+        doc.saveas(filename)
+        return os.path.getsize(filename)
+    return run
+
+
+# name: (prepare, unit, sizes, quick sizes)
+WORKLOADS = {
+    "gate": (gate, "pipes", [50, 100, 200, 400, 800], [50, 200]),
+    "building-convert": (building_convert, "walls", [10, 100, 1000, 5000], [10, 100]),
+    "building-segments": (building_segments, "segments/wall", [4, 16, 64, 256, 1024], [4, 64]),
+    "plan": (plan, "walls", [10, 50, 200, 500], [10, 50]),
+    "wall-csv": (wall_csv, "walls", [100, 1000, 10000, 50000], [100, 1000]),
+    "kitchen-layouts": (kitchen_layouts, "layouts", [5, 10, 20, 40], [2, 5]),
+    "hatch-union": (hatch_union, "rectangles", [1000, 10000, 100000], [1000, 10000]),
+}
@@ -0,0 +1,336 @@
+"""One entry point for the CivilCoding tools.
+
+Every subcommand imports its tool (and ezdxf, matplotlib, NumPy...) only
+when it runs, so `--help` and light commands start without them.  The
+tools stay importable on their own: each subcommand calls the same
+functions their scripts do.
+
+    gate, dimension, hatch     gate and sample DXF drawings (dxf/)
+    plan                       2D plan DXFs from parseddata.json
+    building-convert           building.txt -> parseddata.json
+    takeoff                    wall footprint areas of parseddata.json
+    kitchen, kitchen-plot      outputs / 2D plan of a kitchen spec (Kitchen/)
+    kitchen-optimize           search kitchen layouts for a room
+    mesh                       glTF/OBJ/STL of the gate or a kitchen (mesh/)
+    beam, beam-serve           cantilever SF/BM table and web service (beam/)
+    bench                      scaling benchmarks of the generators (bench/)
+    run                        resumable batch of jobs from a manifest (jobs/)
+    startup                    measure the start-up time of this CLI
+
+Usage: python civilcoding.py <command> [options]   (python civilcoding.py <command> --help)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+WALL_WINDOW = ("FreeCADMacros", "BIM", "Wall_Window")
+STARTUP_BUDGET = 100  # ms for `civilcoding.py --help`, interpreter start-up included
+DXF_FORMATS = ("ascii", "binary", "gzip", "zstd")  # dxf/output.py, not imported for --help
+
+
+def use(*parts):
+    """Puts a tool directory on sys.path (the tools import their neighbours by name)."""
+    path = os.path.join(ROOT, *parts)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+# ------------------------------- DXF ---------------------------------------
+
+def gate(args):
+    use("dxf")
+    from gate import main
+    main(args.output, args.format)
+
+
+def dimension(args):
+    use("dxf")
+    from dimension import draw_gate_dxf
+    draw_gate_dxf(args.output, args.format)
+
+
+def hatch(args):
+    use("dxf")
+    from HatchedTriangle import create_dxf_with_layers_and_triangle
+    create_dxf_with_layers_and_triangle(args.output, args.format)
+
+
+def plan(args):
+    use("dxf")
+    from plan import export_plans, print_reports
+    start = time.perf_counter()
+    reports = export_plans(args.json_files, args.out_dir, args.jobs, args.format or "ascii")
+    print_reports(reports, time.perf_counter() - start, args.bundle)
+
+
+# ----------------------------- Building ------------------------------------
+
+def building_convert(args):
+    use(*WALL_WINDOW, "2")
+    from building_txt2json import convert_building_txt_to_json
+    convert_building_txt_to_json(args.input, args.output)
+
+
+def takeoff(args):
+    import json
+    use(*WALL_WINDOW)
+    from footprint import building_footprints, footprint_area
+    with open(args.json_file) as f:
+        data = json.load(f)
+    footprints = building_footprints(data, openings=not args.gross)
+    total = 0.0
+    for wall, polygons in zip(data["walls"], footprints):
+        area = footprint_area(polygons) / 1e6
+        total += area
+        print(f"{wall['label']:20s} {area:10.3f} m²")
+    print(f"{'Total':20s} {total:10.3f} m² ({'gross' if args.gross else 'net of openings'})")
+
+
+# ------------------------------ Kitchen ------------------------------------
+
+def kitchen(args):
+    use("Kitchen")
+    from spec import build_catalogue, load_models, FORMATS
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = sorted(set(formats) - set(FORMATS))
+    if unknown:
+        sys.exit(f"❌ Unknown output format(s): {', '.join(unknown)} (use {', '.join(FORMATS)})")
+    start = time.perf_counter()
+    models = load_models(args.spec)
+    results = build_catalogue(models, args.out_dir, formats, args.jobs)
+    clashing = sum(1 for count in results.values() if count)
+    print(f"{len(results)} kitchen(s) in {time.perf_counter() - start:.2f} s, "
+          f"{clashing} with clashes; outputs in {args.out_dir}")
+
+
+def kitchen_plot(args):
+    use("Kitchen")
+    from spec import load_spec, plan_layout
+    from render import render_layout
+    render_layout(plan_layout(load_spec(args.spec)), args.output, args.dpi)
+    print(f"Plan saved: {args.output}")
+
+
+def kitchen_optimize(args):
+    use("Kitchen")
+    from optimizer import breakdown, optimize, to_layout
+    room = {"kitchen_width": args.size[0], "kitchen_length": args.size[1]} if args.size else {}
+    best = optimize(room, top=args.top, step=args.step, workers=args.jobs, distinct=args.distinct)
+    if not best:
+        sys.exit("❌ No layout fits this room")
+    for rank, (total, params) in enumerate(best, 1):
+        parts = ", ".join(f"{k} {v:.2f}" for k, v in breakdown(params, room).items() if v > 0.005)
+        print(f"#{rank} score {total:.2f}: " + ", ".join(f"{k}={v:.2f}" for k, v in params.items()) + f" ({parts})")
+        if args.out_dir:
+            from Layout import plot_layout
+            os.makedirs(args.out_dir, exist_ok=True)
+            filename = os.path.join(args.out_dir, f"layout_{rank}.png")
+            plot_layout(to_layout(params, room, title=f"Layout #{rank} (score {total:.2f})"), filename)
+            print(f"  saved {filename}")
+
+
+# ------------------------------- Mesh --------------------------------------
+
+def mesh(args):
+    use("mesh")
+    from box_mesh import export, load_boxes
+    boxes = load_boxes(args.source)
+    for filename in args.outputs:
+        size = export(boxes, filename)
+        print(f"Mesh saved: {filename} ({len(boxes)} boxes, {size / 1024:.1f} KiB)")
+
+
+# ------------------------------- Beam --------------------------------------
+
+def _loads(values, width, name):
+    loads = []
+    for value in values:
+        try:
+            numbers = [float(v) for v in value.split(",")]
+        except ValueError:
+            numbers = []
+        if len(numbers) != width:
+            sys.exit(f"❌ --{name} takes {width} comma-separated numbers, got '{value}'")
+        loads.append(numbers)
+    return loads
+
+
+def beam(args):
+    use("beam")
+    from cantilever import analyse
+    x, v, m = analyse(args.span, args.segments, _loads(args.point, 2, "point"), _loads(args.udl, 3, "udl"))
+    print(f"{'x':>8} {'SF':>12} {'BM':>12}")
+    for row in zip(x, v, m):
+        print(f"{row[0]:8.3f} {row[1]:12.3f} {row[2]:12.3f}")
+
+
+def beam_serve(args):
+    use("beam")
+    from service import make_server
+    server = make_server(args.host, args.port, args.cache)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# ------------------------------ Benchmarks ---------------------------------
+
+def bench(args):
+    use("bench")
+    from bench import main
+    main(args.argv)
+
+
+def run(args):
+    use("jobs")
+    from runner import main
+    main(args.argv)
+
+
+# ------------------------------ Start-up -----------------------------------
+
+def measure_startup(argv=("--help",), runs=5):
+    """Best wall time (s) of `python civilcoding.py *argv` over `runs` and its imports.
+
+    The imports are the top-level entries of `-X importtime` (a separate run,
+    since the tracing itself takes time) as (cumulative µs, module), slowest first.
+    """
+    import subprocess
+    command = [sys.executable, os.path.abspath(__file__), *argv]
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    traced = subprocess.run([sys.executable, "-X", "importtime", *command[1:]],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in traced.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Nested imports are indented
+            imports.append((int(cumulative), name.strip()))
+    return best, sorted(imports, reverse=True)
+
+
+def startup(args):
+    argv = args.argv or ["--help"]
+    elapsed, imports = measure_startup(argv, args.runs)
+    total = sum(us for us, _ in imports)
+    print(f"civilcoding.py {' '.join(argv)}: {elapsed * 1000:.1f} ms wall, {total / 1000:.1f} ms in imports")
+    for us, name in imports[:args.top]:
+        print(f"  {us / 1000:8.2f} ms  {name}")
+    ok = elapsed * 1000 <= args.budget
+    print(f"{'✅' if ok else '❌'} budget {args.budget:g} ms")
+    sys.exit(0 if ok else 1)
+
+
+# ------------------------------- CLI ---------------------------------------
+
+class RoomSize(argparse.Action):
+    """Kitchen width and length, or neither."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if len(values) not in (0, 2):
+            parser.error("size takes both the kitchen width and length, or neither")
+        setattr(namespace, self.dest, values)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="civilcoding", description="CivilCoding tools")
+    commands = parser.add_subparsers(dest="command", metavar="<command>", required=True)
+
+    def command(name, handler, help):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(handler=handler)
+        return sub
+
+    def dxf_format(sub):
+        sub.add_argument("-f", "--format", default=None, choices=DXF_FORMATS,
+                         help="DXF encoding (default: from the file name, .gz gzip, .zst zstd, else ascii)")
+
+    sub = command("gate", gate, "three-panel gate plan and elevation DXF")
+    sub.add_argument("output", help="output .dxf")
+    dxf_format(sub)
+    sub = command("dimension", dimension, "dimensioned gate outline DXF")
+    sub.add_argument("output", help="output .dxf")
+    dxf_format(sub)
+    sub = command("hatch", hatch, "hatched triangle sample DXF")
+    sub.add_argument("output", nargs="?", default="triangle_with_hatch.dxf")
+    dxf_format(sub)
+    sub = command("plan", plan, "2D plan DXFs from parseddata.json files")
+    sub.add_argument("json_files", nargs="+")
+    sub.add_argument("-o", "--out-dir", default=".")
+    sub.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    dxf_format(sub)
+    sub.add_argument("--bundle", default=None, metavar="ZIP", help="pack the plans into this zip")
+
+    sub = command("building-convert", building_convert, "building.txt to parseddata.json")
+    sub.add_argument("input", nargs="?", default="building.txt")
+    sub.add_argument("output", nargs="?", default="parseddata.json")
+    sub = command("takeoff", takeoff, "wall footprint areas of a parseddata.json")
+    sub.add_argument("json_file")
+    sub.add_argument("--gross", action="store_true", help="do not deduct door and window openings")
+
+    default_spec = os.path.join(ROOT, "Kitchen", "kitchens", "c_shape.json")
+    sub = command("kitchen", kitchen, "outputs of a kitchen spec or catalogue")
+    sub.add_argument("spec", nargs="?", default=default_spec, help="spec or catalogue (.json/.toml)")
+    sub.add_argument("-o", "--out-dir", default=".")
+    sub.add_argument("-f", "--formats", default="png,glb,json", help="comma-separated: png,svg,glb,obj,stl,json")
+    sub.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    sub = command("kitchen-plot", kitchen_plot, "2D plan of a kitchen spec")
+    sub.add_argument("spec", nargs="?", default=default_spec)
+    sub.add_argument("-o", "--output", default="kitchen_layout.png", help=".png or .svg")
+    sub.add_argument("--dpi", type=int, default=300)
+    sub = command("kitchen-optimize", kitchen_optimize, "search kitchen layouts for a room size")
+    sub.add_argument("size", nargs="*", type=float, action=RoomSize, help="kitchen width and length in feet")
+    sub.add_argument("--top", type=int, default=3)
+    sub.add_argument("--step", type=float, default=0.25, help="search grid in feet")
+    sub.add_argument("--distinct", type=float, default=1.0,
+                     help="feet a layout must differ from a better one to be listed (0: list all)")
+    sub.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    sub.add_argument("-o", "--out-dir", default=None, help="render the best layouts as PNGs here")
+
+    sub = command("mesh", mesh, "glTF/OBJ/STL of box models")
+    sub.add_argument("source", help="gate, kitchen or a boxes .json")
+    sub.add_argument("outputs", nargs="+", help="output .glb/.obj/.stl files")
+
+    sub = command("beam", beam, "cantilever shear force and bending moment table")
+    sub.add_argument("span", type=float)
+    sub.add_argument("segments", type=int)
+    sub.add_argument("--point", action="append", default=[], metavar="P,A", help="point load P at A from the free end")
+    sub.add_argument("--udl", action="append", default=[], metavar="W,START,LENGTH", help="uniformly distributed load")
+    sub = command("beam-serve", beam_serve, "cantilever beam web service")
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--port", type=int, default=8000)
+    sub.add_argument("--cache", type=int, default=1024, help="results kept in the LRU cache")
+
+    # Everything after `bench` or `run` goes to the tool's own parser (see main)
+    command("bench", bench, "scaling benchmarks of the generators (civilcoding bench --help)")
+    command("run", run, "run a manifest of jobs, resuming from its journal (civilcoding run --help)")
+
+    sub = command("startup", startup, "measure the start-up time of a civilcoding command")
+    sub.add_argument("argv", nargs=argparse.REMAINDER, help="command to time (default: --help)")
+    sub.add_argument("--runs", type=int, default=5)
+    sub.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    sub.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="fail above this many ms")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    passthrough = {"bench": bench, "run": run}
+    if argv[:1] and argv[0] in passthrough:
+        return passthrough[argv[0]](argparse.Namespace(argv=argv[1:]))
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
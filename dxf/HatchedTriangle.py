@@ -1,6 +1,8 @@
 import ezdxf
 
-def create_dxf_with_layers_and_triangle():
+from output import describe, save
+
+def create_dxf_with_layers_and_triangle(file_name="triangle_with_hatch.dxf", fmt=None):
     # Create a new DXF document with setup for default styles
     doc = ezdxf.new('R2018', setup=True)
     msp = doc.modelspace()
@@ -34,9 +36,7 @@ def create_dxf_with_layers_and_triangle():
     hatch.set_solid_fill(color=ezdxf.colors.GREEN)
 
     # Save DXF file
-    file_name = "triangle_with_hatch.dxf"
-    doc.saveas(file_name)
-    print(f"DXF file '{file_name}' created successfully.")
+    print(f"DXF file {describe(save(doc, file_name, fmt))} created successfully.")
 
 if __name__ == "__main__":
     create_dxf_with_layers_and_triangle()
@@ -1,6 +1,8 @@
 import ezdxf
 from ezdxf.math import Vec2
 
+from output import describe, save
+
 # Dimension Style Parameters
 DIM_STYLE_NAME = "GATE_DIM"
 ARROW_SIZE = 5.0       # Arrow size
@@ -30,7 +32,7 @@ def create_dimstyle(doc):
     else:
         print(f"Dimstyle '{DIM_STYLE_NAME}' already exists")
 
-def draw_gate_dxf(output_path):
+def draw_gate_dxf(output_path, fmt=None):
     doc = ezdxf.new(setup=True)
     msp = doc.modelspace()
 
@@ -59,12 +61,11 @@ def draw_gate_dxf(output_path):
     ).render()
 
     # Save the DXF
-    doc.saveas(output_path)
-    print(f"DXF saved at {output_path}")
+    print(f"DXF saved at {describe(save(doc, output_path, fmt))}")
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python generate_gate_dxf.py output.dxf")
+        print("Usage: python generate_gate_dxf.py output.dxf [ascii|binary|gzip|zstd]")
     else:
-        draw_gate_dxf(sys.argv[1])
+        draw_gate_dxf(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -2,15 +2,14 @@ import ezdxf
 import sys
 import locale
 
-# Set locale for decimal separator
-locale.setlocale(locale.LC_NUMERIC, 'C')
+from output import describe, save
+from polygon import add_hatches, difference, rect_union
 
 INCH = 25.4
 
 PHL = [59.625 * INCH, 59.5 * INCH, 56.5 * INCH]
 gap = [2 / 8 * INCH, 1 / 8 * INCH]
 X_TOTAL = sum(PHL) + sum(gap)
-print(f"Total gate width (X_TOTAL): {X_TOTAL:.3f} mm")
 
 PHW = 40
 PHH = 80
@@ -66,14 +65,14 @@ DIM_STYLES = {
     },
 }
 
-def setup_layers(doc):
-    for name, color in LAYER_DEFS.items():
+def setup_layers(doc, layer_defs=LAYER_DEFS):
+    for name, color in layer_defs.items():
         if name not in doc.layers:
             layer = doc.layers.new(name)
             layer.color = color
 
-def setup_dimstyles(doc):
-    for name, attrs in DIM_STYLES.items():
+def setup_dimstyles(doc, dim_styles=DIM_STYLES):
+    for name, attrs in dim_styles.items():
         if name not in doc.dimstyles:
             doc.dimstyles.new(name=name, dxfattribs=attrs)
 
@@ -104,7 +103,11 @@ def add_linear_dim(msp, layer, dimstyle, p1, p2, base, angle=0, location=None):
     )
     dim.render()
 
-def main(filename):
+def main(filename, fmt=None):
+    # Set locale for decimal separator
+    locale.setlocale(locale.LC_NUMERIC, 'C')
+    print(f"Total gate width (X_TOTAL): {X_TOTAL:.3f} mm")
+
     doc = ezdxf.new(setup=True, dxfversion="R2018")
     msp = doc.modelspace()
     setup_layers(doc)
@@ -182,7 +185,6 @@ def main(filename):
             (x, y)
         ]
         msp.add_lwpolyline(pts + [pts[0]], dxfattribs={"layer": "PlanBot", "color": 3})
-        hatch_rect(msp, "PlanBot", pts, color=3)
         vertical_pipe_x.append(x)
         x += PVH + SPACING_PATTERN[i_pat % PATTERN_LEN]
         i_pat += 1
@@ -225,17 +227,8 @@ def main(filename):
         angle=0
     )
 
-    # Square pipe (20x20mm) hatch
-    sq_x = vertical_pipe_x[0]
-    sq_y = y - PVW
-    sq_pts = [
-        (sq_x, sq_y),
-        (sq_x + PVW, sq_y),
-        (sq_x + PVW, sq_y + PVW),
-        (sq_x, sq_y + PVW)
-    ]
-    msp.add_lwpolyline(sq_pts + [sq_pts[0]], dxfattribs={"layer": "PlanBot", "color": 3})
-    hatch_rect(msp, "PlanBot", sq_pts, color=3)
+    # Square pipe (20x20mm) hatch, every square filled once
+    add_hatches(msp, "PlanBot", rect_union([(xp, y - PVW, xp + PVW, y) for xp in vertical_pipe_x]), color=3)
 
     right_x = X_TOTAL
     add_linear_dim(
@@ -247,6 +240,8 @@ def main(filename):
 
     # --- ELEVATION (Now with vertical 80x40 red members and mid horizontal) ---
     y = Y_ELEV
+    # Hatched in this order, each layer less the ones before it
+    members = {"ElevationVert80": [], "Elevation": [], "ElevationMid": []}
     for i in range(3):
         x0 = panels_x[i]
         width = PHL[i]
@@ -254,14 +249,14 @@ def main(filename):
 
         # Bottom member
         pts = draw_rectangle(msp, "Elevation", x0, y_base, width, PHH, color=1)
-        hatch_rect(msp, "Elevation", pts, color=1)
+        members["Elevation"].append((*pts[0], *pts[2]))
         # Top member
         pts2 = draw_rectangle(msp, "Elevation", x0, y_base + Z_OFFSET, width, PHH, color=1)
-        hatch_rect(msp, "Elevation", pts2, color=1)
+        members["Elevation"].append((*pts2[0], *pts2[2]))
         # Middle member
         mid_y = y_base + Z_OFFSET / 2 - PHH / 2
         pts3 = draw_rectangle(msp, "ElevationMid", x0, mid_y, width, PHH, color=1)
-        hatch_rect(msp, "ElevationMid", pts3, color=1)
+        members["ElevationMid"].append((*pts3[0], *pts3[2]))
         # Vertical left: 80x40, red, on new layer
         vleft_pts = [
             (x0, y_base),
@@ -270,7 +265,7 @@ def main(filename):
             (x0, y_base + Z_OFFSET + PHH)
         ]
         msp.add_lwpolyline(vleft_pts + [vleft_pts[0]], dxfattribs={"layer": "ElevationVert80", "color": 1})
-        hatch_rect(msp, "ElevationVert80", vleft_pts, color=1)
+        members["ElevationVert80"].append((*vleft_pts[0], *vleft_pts[2]))
         # Vertical right: 80x40, red, on new layer
         x1 = x0 + width
         vright_pts = [
@@ -280,8 +275,18 @@ def main(filename):
             (x1 - PHH, y_base + Z_OFFSET + PHH)
         ]
         msp.add_lwpolyline(vright_pts + [vright_pts[0]], dxfattribs={"layer": "ElevationVert80", "color": 1})
-        hatch_rect(msp, "ElevationVert80", vright_pts, color=1)
-
+        members["ElevationVert80"].append((*vright_pts[0], *vright_pts[2]))
+
+    # The verticals overlap the horizontal members: hatch each layer's members
+    # as one union on that layer, less what is already hatched, and the pipes
+    # only where no member covers them
+    done = []
+    for layer, rects in members.items():
+        own = rect_union(rects)
+        add_hatches(msp, layer, difference(own, rect_union(done)) if done else own, color=1)
+        done += rects
+    red = rect_union(done)
+    pipes = []
     for xp in vertical_pipe_x:
         elev_pts = [
             (xp, y + Z_BOTTOM),
@@ -290,7 +295,8 @@ def main(filename):
             (xp, y + Z_BOTTOM + PVL)
         ]
         msp.add_lwpolyline(elev_pts + [elev_pts[0]], dxfattribs={"layer": "Elevation", "color": 3})
-        hatch_rect(msp, "Elevation", elev_pts, color=3)
+        pipes.append(elev_pts)
+    add_hatches(msp, "Elevation", difference(rect_union([(*p[0], *p[2]) for p in pipes]), red), color=3)
 
     # ----- ELEVATION DIMENSIONS (unchanged from your last working version) -----
     elev_y_max = y + Z_BASE + PHH + Z_OFFSET + 80
@@ -323,11 +329,10 @@ def main(filename):
         angle=90
     )
 
-    doc.saveas(filename)
-    print(f"DXF file saved: {filename}")
+    print(f"DXF file saved: {describe(save(doc, filename, fmt))}")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python generate_gate_dxf.py output_filename.dxf")
+        print("Usage: python generate_gate_dxf.py output_filename.dxf [ascii|binary|gzip|zstd]")
         sys.exit(1)
-    main(sys.argv[1])
+    main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,254 @@
+"""DXF output in smaller encodings than plain ASCII, with time and size.
+
+doc.saveas writes ASCII DXF, and the fence and elevation drawings run to
+tens of MB of it.  save() writes a document as
+
+  ascii    plain ASCII DXF, as doc.saveas (.dxf)
+  binary   binary DXF, read by AutoCAD and ezdxf like ASCII (.dxf)
+  gzip     ASCII DXF compressed while it is written (.dxf.gz)
+  zstd     the same with Zstandard (.dxf.zst, needs the zstandard package)
+
+and reports the bytes written and the time taken; bundle() packs the
+drawings of a batch into one zip.  load() reads any of them back and
+verify() checks that a written file holds the same entities as the
+document, tag for tag.
+
+Usage: python output.py drawing.dxf [out_dir]   (writes it in every format, reads each back)
+"""
+
+import gzip
+import io
+import os
+import sys
+import time
+import zipfile
+from contextlib import contextmanager
+
+import ezdxf
+from ezdxf.document import Drawing
+from ezdxf.filemanagement import dxf_stream_info
+from ezdxf.lldxf.tagger import binary_tags_loader
+from ezdxf.lldxf.tagwriter import TagCollector
+
+# format: file name ending
+FORMATS = {"ascii": ".dxf", "binary": ".dxf", "gzip": ".dxf.gz", "zstd": ".dxf.zst"}
+BINARY_SENTINEL = b"AutoCAD Binary DXF\r\n\x1a\x00"
+MAGIC = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}  # leading bytes of compressed files
+GZIP_LEVEL = 6  # gzip's own default: most of level 9's size at a fraction of its time
+ZSTD_LEVEL = 3
+ZIP_LEVEL = 6
+
+
+def format_of(filename):
+    """Format implied by a file name (.gz: gzip, .zst: zstd, anything else ascii)."""
+    name = str(filename).lower()
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith(".zst"):
+        return "zstd"
+    return "ascii"
+
+
+def output_name(filename, fmt):
+    """`filename` with the ending of `fmt` (plan.dxf -> plan.dxf.gz)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown DXF format '{fmt}' (use {', '.join(FORMATS)})")
+    base = str(filename)
+    for ending in (".gz", ".zst", ".dxf"):
+        if base.lower().endswith(ending):
+            base = base[:-len(ending)]
+    return base + FORMATS[fmt]
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd output needs the zstandard package (pip install zstandard)") from None
+    return zstandard
+
+
+@contextmanager
+def _writer(filename, fmt):
+    """Binary stream that ends up in `filename` encoded as `fmt`."""
+    with open(filename, "wb") as f:
+        if fmt == "gzip":
+            # No name or mtime in the header: the same drawing gives the same bytes
+            with gzip.GzipFile(filename="", mode="wb", fileobj=f, compresslevel=GZIP_LEVEL, mtime=0) as stream:
+                yield stream
+        elif fmt == "zstd":
+            with _zstandard().ZstdCompressor(level=ZSTD_LEVEL).stream_writer(f, closefd=False) as stream:
+                yield stream
+        else:
+            yield f
+
+
+def save(doc, filename, fmt=None):
+    """Writes `doc` as `fmt` (default: from the file name); returns a report
+    {"file", "format", "bytes", "seconds"}.
+
+    A name whose ending says another format gets the ending of `fmt` (g.dxf
+    as gzip is written to g.dxf.gz); "file" in the report is the file written.
+    """
+    fmt = fmt or format_of(filename)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown DXF format '{fmt}' (use {', '.join(FORMATS)})")
+    if format_of(filename) != ("ascii" if fmt == "binary" else fmt):
+        filename = output_name(filename, fmt)
+    if fmt == "zstd":
+        _zstandard()  # Before the file is created
+    start = time.perf_counter()
+    with _writer(filename, fmt) as stream:
+        if fmt == "binary":
+            doc.write(stream, fmt="bin")
+        else:
+            text = io.TextIOWrapper(stream, encoding=doc.output_encoding, errors="dxfreplace")
+            doc.write(text)
+            text.flush()
+            text.detach()
+    doc.filename = str(filename)
+    return {"file": str(filename), "format": fmt, "bytes": os.path.getsize(filename),
+            "seconds": time.perf_counter() - start}
+
+
+def bundle(filenames, zip_path, remove=False):
+    """Packs written drawings into one zip (already compressed ones are stored
+    as they are); returns a report like save()."""
+    start = time.perf_counter()
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_LEVEL) as archive:
+        for filename in filenames:
+            stored = _encoding(filename) != "ascii"
+            archive.write(filename, os.path.basename(filename),
+                          compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+    if remove:
+        for filename in filenames:
+            os.remove(filename)
+    return {"file": str(zip_path), "format": "zip", "bytes": os.path.getsize(zip_path),
+            "seconds": time.perf_counter() - start}
+
+
+def _size(count):
+    for unit in ("B", "kB", "MB"):
+        if count < 1000 or unit == "MB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1000
+
+
+def describe(report):
+    """'gate.dxf.gz (gzip, 1.2 MB in 85 ms)' for a save() or bundle() report."""
+    return f"{report['file']} ({report['format']}, {_size(report['bytes'])} in {report['seconds'] * 1000:.0f} ms)"
+
+
+# ------------------------------ Reading back -------------------------------
+
+def _sniff(head):
+    """Format of a file from its leading bytes: gzip, zstd, binary or ascii."""
+    for magic, fmt in MAGIC.items():
+        if head.startswith(magic):
+            return fmt
+    return "binary" if head.startswith(BINARY_SENTINEL) else "ascii"
+
+
+def _encoding(filename):
+    with open(filename, "rb") as f:
+        return _sniff(f.read(len(BINARY_SENTINEL)))
+
+
+@contextmanager
+def _reader(filename, member=None):
+    """Decoded binary stream of a drawing (or of `member` of a bundle); the
+    encoding comes from the content, not the name, so a gzip file saved as
+    plan.dxf still reads."""
+    if member is not None:
+        with zipfile.ZipFile(filename) as archive, archive.open(member) as raw:
+            # Unpacked in memory: zip members can't seek back after the sniff
+            data = io.BytesIO(raw.read())
+    else:
+        data = open(filename, "rb")
+    with data as f:
+        fmt = _sniff(f.read(len(BINARY_SENTINEL)))
+        f.seek(0)
+        with _decoder(f, fmt) as stream:
+            yield stream
+
+
+@contextmanager
+def _decoder(f, fmt):
+    if fmt == "gzip":
+        with gzip.GzipFile(fileobj=f, mode="rb") as stream:
+            yield stream
+    elif fmt == "zstd":
+        with _zstandard().ZstdDecompressor().stream_reader(f, closefd=False) as stream:
+            yield stream
+    else:
+        yield f
+
+
+def load(filename, member=None):
+    """Reads a drawing written by save() in any format (or `member` of a bundle)."""
+    with _reader(filename, member) as stream:
+        data = stream.read()
+    if data.startswith(BINARY_SENTINEL):
+        doc = Drawing.load(binary_tags_loader(data))
+    else:
+        info = dxf_stream_info(io.StringIO(data[:1 << 16].decode("utf-8", errors="ignore")))
+        doc = ezdxf.read(io.StringIO(data.decode(info.encoding, errors="surrogateescape")))
+    doc.filename = str(filename)
+    return doc
+
+
+def fingerprint(doc):
+    """{handle: DXF tags} of the entities of every layout and block."""
+    tags = {}
+    for block in doc.blocks:
+        for entity in block:
+            collector = TagCollector(dxfversion=doc.dxfversion)
+            entity.export_dxf(collector)
+            tags[entity.dxf.handle] = collector.tags
+    return tags
+
+
+def verify(doc, filename, member=None):
+    """Entities of `doc` that differ in the written file, as
+    ['handle (TYPE): reason', ...]; empty when the file round-trips."""
+    written, read = fingerprint(doc), fingerprint(load(filename, member))
+    problems = []
+    for handle, tags in written.items():
+        dxftype = tags[0].value
+        if handle not in read:
+            problems.append(f"{handle} ({dxftype}): missing")
+        elif read[handle] != tags:
+            problems.append(f"{handle} ({dxftype}): {len(tags)} tags written, {len(read[handle])} read, not equal")
+    problems.extend(f"{handle}: not in the document" for handle in read.keys() - written.keys())
+    return problems
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python output.py drawing.dxf [out_dir]")
+        sys.exit(1)
+    source = sys.argv[1]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else "."
+    os.makedirs(out_dir, exist_ok=True)
+    doc = load(source)
+    base = os.path.join(out_dir, os.path.basename(output_name(source, "ascii"))[:-len(".dxf")])
+    reports = []
+    for fmt in FORMATS:
+        filename = f"{base}.{fmt}{FORMATS[fmt]}"
+        try:
+            report = save(doc, filename, fmt)
+        except ImportError as e:
+            print(f"⚠️ {fmt}: {e}")
+            continue
+        problems = verify(doc, filename)
+        print(("✅ " if not problems else "❌ ") + describe(report)
+              + ("" if not problems else f": {len(problems)} entities differ, first {problems[0]}"))
+        reports.append(report)
+    report = bundle([r["file"] for r in reports if r["format"] == "ascii"], f"{base}.zip")
+    problems = verify(doc, report["file"], os.path.basename(reports[0]["file"]))
+    print(("✅ " if not problems else "❌ ") + describe(report))
+
+    ascii_bytes = reports[0]["bytes"]
+    print(f"\n{'format':8s} {'bytes':>12s} {'ratio':>7s} {'write':>9s}")
+    for r in reports + [report]:
+        print(f"{r['format']:8s} {r['bytes']:12,d} {ascii_bytes / r['bytes']:6.1f}x {r['seconds'] * 1000:7.0f} ms")
@@ -0,0 +1,189 @@
+import ezdxf
+import argparse
+import json
+import locale
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gate import setup_layers, setup_dimstyles
+from output import FORMATS, bundle, describe, output_name, save
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FreeCADMacros", "BIM", "Wall_Window"))
+from footprint import ALIGN_OFFSETS, wall_footprint
+
+# 2D floor plan straight from parseddata.json (see building_txt2json.py):
+# wall outlines with opening gaps, door swings and chain dimensions per segment.
+
+LAYER_DEFS = {
+    "PlanWalls": 7,
+    "PlanWallHatch": 8,
+    "PlanWindows": 4,
+    "PlanDoors": 3,
+    "DimPlanChain": 5,
+}
+
+DIM_STYLE_PLAN = "PLAN_DIM"
+DIM_STYLES = {
+    DIM_STYLE_PLAN: {
+        "dimscale": 50.0,
+        "dimtxsty": "STANDARD",
+        "dimtxt": 2.5,
+        "dimexo": 1.5,
+        "dimasz": 2.5,
+        "dimexe": 1.0
+    },
+}
+
+WALL_HATCH_COLOR = 8
+DIM_GAP = 400  # Distance of the chain dimension line from the wall face
+ALIGN = "Center"  # Arch.makeWall default, as used by building.FCMacro
+
+def draw_polygon(msp, layer, ring, holes=(), hatch_color=None):
+    pts = [tuple(p) for p in ring]
+    msp.add_lwpolyline(pts, close=True, dxfattribs={"layer": layer})
+    for hole in holes:
+        msp.add_lwpolyline([tuple(p) for p in hole], close=True, dxfattribs={"layer": layer})
+    if hatch_color is not None:
+        hatch = msp.add_hatch(color=hatch_color, dxfattribs={"layer": "PlanWallHatch"})
+        hatch.paths.add_polyline_path(pts, is_closed=True, flags=ezdxf.const.BOUNDARY_PATH_EXTERNAL)
+        for hole in holes:
+            hatch.paths.add_polyline_path([tuple(p) for p in hole], is_closed=True)
+
+def add_aligned_dim(msp, layer, dimstyle, p1, p2, distance):
+    dim = msp.add_aligned_dim(
+        p1=p1, p2=p2, distance=distance,
+        dimstyle=dimstyle,
+        dxfattribs={"layer": layer}
+    )
+    dim.render()
+
+def segment_frame(path, index):
+    (x0, y0), (x1, y1) = path[index][:2], path[index + 1][:2]
+    length = math.hypot(x1 - x0, y1 - y0)
+    ux, uy = (x1 - x0) / length, (y1 - y0) / length
+    return (x0, y0), (ux, uy), (-uy, ux), length
+
+def draw_opening(msp, path, thickness, segment, position, width, is_door):
+    (x0, y0), (ux, uy), (nx, ny), _ = segment_frame(path, segment)
+    left, right = (f * thickness for f in ALIGN_OFFSETS[ALIGN])
+
+    def at(s, d):
+        return (x0 + ux * s + nx * d, y0 + uy * s + ny * d)
+
+    if is_door:
+        # Leaf drawn open at 90 degrees, hinged at the start of the gap on the left face
+        hinge = at(position, left)
+        leaf = (hinge[0] + nx * width, hinge[1] + ny * width)
+        msp.add_line(hinge, leaf, dxfattribs={"layer": "PlanDoors"})
+        start = math.degrees(math.atan2(uy, ux))
+        msp.add_arc(hinge, width, start, start + 90, dxfattribs={"layer": "PlanDoors"})
+    else:
+        # Two glass lines across the gap
+        for d in (left + (right - left) / 3, left + 2 * (right - left) / 3):
+            msp.add_line(at(position, d), at(position + width, d), dxfattribs={"layer": "PlanWindows"})
+
+def draw_chain_dims(msp, path, thickness, cuts):
+    """One chain per segment: segment ends and both edges of every opening."""
+    left, _ = (f * thickness for f in ALIGN_OFFSETS[ALIGN])
+    for segment in range(len(path) - 1):
+        (x0, y0), (ux, uy), _, length = segment_frame(path, segment)
+        stations = {0.0, round(length, 4)}
+        for seg, position, width in cuts:
+            if seg == segment:
+                stations.update((round(position, 4), round(min(position + width, length), 4)))
+        stations = sorted(stations)
+        for a, b in zip(stations, stations[1:]):
+            if b - a > 1e-6:
+                add_aligned_dim(
+                    msp, "DimPlanChain", DIM_STYLE_PLAN,
+                    p1=(x0 + ux * a, y0 + uy * a),
+                    p2=(x0 + ux * b, y0 + uy * b),
+                    distance=left + DIM_GAP
+                )
+
+def draw_plan(msp, data):
+    window_types = data.get("window_types", {})
+    door_types = data.get("door_types", {})
+    for wall in data["walls"]:
+        path = wall["path"]
+        thickness = wall.get("thickness", 230)
+        cuts = []
+        for opening in wall.get("openings", []):
+            types = window_types if opening["type"] == "window" else door_types
+            preset = types.get(opening["ref"])
+            if not preset:
+                print(f"⚠️ No preset found for {opening['ref']} in {wall['label']}")
+                continue
+            cut = (opening["segment_index"], opening["position"], preset["width"])
+            draw_opening(msp, path, thickness, *cut, is_door=opening["type"] == "door")
+            cuts.append(cut)
+        for ring, holes in wall_footprint(path, thickness, ALIGN, wall.get("closed", False), cuts):
+            draw_polygon(msp, "PlanWalls", ring, holes, hatch_color=WALL_HATCH_COLOR)
+        draw_chain_dims(msp, path, thickness, cuts)
+
+def export_plan(json_file, filename, fmt=None):
+    """Writes the plan DXF for one parsed building file; returns the save()
+    report with the whole time taken as "total"."""
+    start = time.perf_counter()
+    locale.setlocale(locale.LC_NUMERIC, 'C')
+    with open(json_file) as f:
+        data = json.load(f)
+
+    doc = ezdxf.new(setup=True, dxfversion="R2018")
+    msp = doc.modelspace()
+    setup_layers(doc, LAYER_DEFS)
+    setup_dimstyles(doc, DIM_STYLES)
+    draw_plan(msp, data)
+    report = save(doc, filename, fmt)
+    report["total"] = time.perf_counter() - start
+    return report
+
+def plan_names(json_files):
+    """Output names for the input files: the file name, prefixed with as many
+    parent directories as it takes to tell them apart
+    (rev1/parseddata.json, rev2/parseddata.json -> rev1_parseddata, rev2_parseddata)."""
+    parts = [os.path.splitext(os.path.abspath(f))[0].strip(os.sep).split(os.sep) for f in json_files]
+    depth = [1] * len(parts)
+    while True:
+        names = ["_".join(p[-d:]) for p, d in zip(parts, depth)]
+        clashing = [i for i, name in enumerate(names) if names.count(name) > 1]
+        if not clashing:
+            return names
+        for i in clashing:
+            if depth[i] == len(parts[i]):
+                raise ValueError(f"{json_files[i]} is given more than once")
+            depth[i] += 1
+
+def export_plans(json_files, out_dir, workers=None, fmt="ascii"):
+    """Exports many plans in parallel; returns {output file: export_plan report}."""
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = [output_name(os.path.join(out_dir, name), fmt) for name in plan_names(json_files)]
+    if len(json_files) == 1 or workers == 1:
+        return {out: export_plan(f, out, fmt) for f, out in zip(json_files, outputs)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(outputs, pool.map(export_plan, json_files, outputs, [fmt] * len(outputs))))
+
+def print_reports(reports, elapsed, bundle_path=None):
+    """One line per plan and a total; with `bundle_path` the plans are moved into that zip."""
+    for report in reports.values():
+        print(f"DXF file saved: {describe(report)}, {report['total'] * 1000:.0f} ms in all")
+    total = sum(report["bytes"] for report in reports.values())
+    print(f"{len(reports)} plan(s), {total / 1e6:.2f} MB in {elapsed:.2f} s ({len(reports) / elapsed * 60:.0f} per minute)")
+    if bundle_path:
+        print(f"Bundle saved: {describe(bundle(list(reports), bundle_path, remove=True))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write 2D plan DXFs from parseddata.json files")
+    parser.add_argument("json_files", nargs="+")
+    parser.add_argument("-o", "--out-dir", default=".")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-f", "--format", default="ascii", choices=list(FORMATS), help="DXF encoding")
+    parser.add_argument("--bundle", default=None, metavar="ZIP", help="pack the plans into this zip")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reports = export_plans(args.json_files, args.out_dir, args.jobs, args.format)
+    print_reports(reports, time.perf_counter() - start, args.bundle)
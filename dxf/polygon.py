@@ -0,0 +1,752 @@
+"""Polygon union, boolean operations and triangulation for DXF fills.
+
+Overlapping members drawn and hatched one by one give stacked hatches; the
+functions here merge them first so that every covered area is filled once:
+
+  rect_union    union of axis-aligned rectangles (x0, y0, x1, y1), the common
+                case of pipes and members; a sweep over x with a segment tree
+                of the covered y-intervals, 10^5 rectangles in a few seconds
+  boolean       union / intersection / difference / xor of arbitrary
+                polygons; a sweep over y that cuts the plane into slabs with
+                no vertex or edge crossing inside and fills each slab by the
+                nonzero winding rule
+  triangulate   ear clipping of a polygon with holes, for SOLID fills
+
+Results are lists of (ring, holes) polygons as in footprint.py: rings are
+(N, 2) arrays without the closing point, counter-clockwise, holes clockwise,
+simple (no vertex visited twice) and with no repeated or collinear
+vertices, so a hatch gets the fewest boundary points.  add_hatches and
+add_solids write them to a DXF modelspace.
+
+Usage: python polygon.py [rectangles]   (times rect_union on random rectangles)
+"""
+
+import sys
+import time
+
+import ezdxf
+import numpy as np
+
+# Points closer than this are treated as the same vertex (mm)
+TOLERANCE = 1e-6
+
+
+def polygon_area(ring):
+    """Signed (shoelace) area of a closed ring given without its closing point."""
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def _rings(polygons):
+    """Rings of rings/(ring, holes) polygons, outer rings CCW and holes CW."""
+    for polygon in polygons:
+        ring, holes = polygon if isinstance(polygon, tuple) else (polygon, ())
+        ring = np.asarray(ring, dtype=float)[:, :2]
+        yield ring if polygon_area(ring) >= 0 else ring[::-1]
+        for hole in holes:
+            hole = np.asarray(hole, dtype=float)[:, :2]
+            yield hole if polygon_area(hole) <= 0 else hole[::-1]
+
+
+def _inside(point, ring):
+    """Crossing-number test of a point against a ring (points on the ring are undefined)."""
+    x, y = point
+    xa, ya = ring[:, 0], ring[:, 1]
+    xb, yb = np.roll(xa, -1), np.roll(ya, -1)
+    span = (ya > y) != (yb > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cross = xa + (y - ya) * (xb - xa) / (yb - ya)
+    return bool(np.count_nonzero(span & (cross > x)) % 2)
+
+
+def _split(ring):
+    """Simple rings of a ring that passes through a vertex more than once (a
+    hole touching itself, an outer ring pinched around a hole), cut there."""
+    ring = np.asarray(ring, dtype=float).reshape(-1, 2)
+    points = list(map(tuple, ring.tolist()))
+    if len(set(points)) == len(points):
+        yield ring
+        return
+    stack = [points]
+    while stack:
+        points = stack.pop()
+        seen = {}
+        for j, p in enumerate(points):
+            if p in seen:
+                i = seen[p]
+                stack += [points[i:j], points[j:] + points[:i]]
+                break
+            seen[p] = j
+        else:
+            yield np.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def _assemble(rings):
+    """(ring, holes) polygons from CCW outer rings and CW holes: each hole goes
+    to the smallest outer ring around the midpoint of its longest edge."""
+    outers, holes = [], []
+    for ring in rings:
+        area = polygon_area(ring)
+        if abs(area) > TOLERANCE ** 2:
+            (outers if area > 0 else holes).append((abs(area), ring))
+    outers.sort(key=lambda item: item[0])
+    boxes = np.array([np.r_[ring.min(axis=0), ring.max(axis=0)] for _, ring in outers]).reshape(-1, 4)
+    result = [(ring, []) for _, ring in outers]
+    for _, hole in holes:
+        edges = np.roll(hole, -1, axis=0) - hole
+        i = int(np.argmax(np.hypot(edges[:, 0], edges[:, 1])))
+        point = hole[i] + edges[i] / 2
+        candidates = np.flatnonzero((boxes[:, 0] <= point[0]) & (boxes[:, 2] >= point[0])
+                                    & (boxes[:, 1] <= point[1]) & (boxes[:, 3] >= point[1]))
+        for j in candidates:
+            if _inside(point, result[j][0]):
+                result[j][1].append(hole)
+                break
+    return result
+
+
+# ------------------------------ Rectangles ---------------------------------
+
+def rect_union(rects):
+    """Union of axis-aligned rectangles (x0, y0, x1, y1) as (ring, holes) polygons.
+
+    A sweep line moves over x; a segment tree over the distinct y values
+    counts how often every y-interval is covered.  Adding a rectangle's
+    start collects the leaves it newly covers and removing its end the
+    leaves it leaves uncovered, in the same walk down the tree: those are
+    the vertical boundary edges.  Starts at an x go before ends, so
+    rectangles that abut leave no edge between them.  Ends of vertical
+    edges at the same y pair up left to right into the horizontal edges, and
+    every ring closes without looking up points.  Each vertical edge also
+    records the nearest boundary edge to its left, which tells a hole which
+    outer ring it is in.
+    """
+    r = np.asarray(rects, dtype=float).reshape(-1, 4)
+    x0, x1 = np.minimum(r[:, 0], r[:, 2]), np.maximum(r[:, 0], r[:, 2])
+    y0, y1 = np.minimum(r[:, 1], r[:, 3]), np.maximum(r[:, 1], r[:, 3])
+    keep = (x1 - x0 > TOLERANCE) & (y1 - y0 > TOLERANCE)
+    x0, x1, y0, y1 = x0[keep], x1[keep], y0[keep], y1[keep]
+    n = len(x0)
+    if not n:
+        return []
+
+    ys, leaf = np.unique(np.concatenate((y0, y1)), return_inverse=True)
+    lo, hi = leaf[:n].tolist(), leaf[n:].tolist()
+    size = 1
+    while size < len(ys) - 1:
+        size *= 2
+    count = [0] * (2 * size)    # rectangles covering a node's whole range
+    covered = [0] * (2 * size)  # leaves covered below a node
+    stamp = [-1] * (2 * size)   # last boundary edge painted over a node's whole range
+
+    def uncovered(node, a, b, out):
+        if count[node] or covered[node] == b - a:
+            return
+        if not covered[node]:
+            if out and out[-1][1] == a:
+                out[-1][1] = b
+            else:
+                out.append([a, b])
+            return
+        mid = (a + b) // 2
+        uncovered(2 * node, a, mid, out)
+        uncovered(2 * node + 1, mid, b, out)
+
+    def update(node, a, b, l, r, delta, hidden, out):
+        # `hidden`: an ancestor covers the node, so nothing below it changes
+        if l <= a and b <= r:
+            if delta > 0 and not hidden:
+                uncovered(node, a, b, out)
+            count[node] += delta
+        else:
+            hidden = hidden or count[node] > 0
+            mid = (a + b) // 2
+            if l < mid:
+                update(2 * node, a, mid, l, r, delta, hidden, out)
+            if r > mid:
+                update(2 * node + 1, mid, b, l, r, delta, hidden, out)
+        if count[node]:
+            covered[node] = b - a
+        elif node >= size:
+            covered[node] = 0
+        else:
+            covered[node] = covered[2 * node] + covered[2 * node + 1]
+        if delta < 0 and not hidden and l <= a and b <= r:
+            uncovered(node, a, b, out)
+
+    xs = np.concatenate((x0, x1))
+    order = np.lexsort((np.arange(2 * n) >= n, xs))
+    xs_sorted = xs[order]
+    starts = np.flatnonzero(np.r_[True, xs_sorted[1:] != xs_sorted[:-1]]).tolist() + [2 * n]
+    order = order.tolist()
+
+    # Vertical edges: x, first leaf, end leaf (exclusive), up (interior on the left)
+    edge_x, edge_a, edge_b, edge_up, left_of = [], [], [], [], []
+    for g in range(len(starts) - 1):
+        group = order[starts[g]:starts[g + 1]]
+        down, up = [], []
+        for i in group:
+            if i < n:
+                update(1, 0, size, lo[i], hi[i], 1, False, down)
+            else:
+                update(1, 0, size, lo[i - n], hi[i - n], -1, False, up)
+        x = float(xs_sorted[starts[g]])
+        first = len(edge_x)
+        for runs, is_up in ((down, False), (up, True)):
+            if len(group) > 1:
+                runs = _merge(runs)
+            for a, b in runs:
+                edge_x.append(x)
+                edge_a.append(a)
+                edge_b.append(b)
+                edge_up.append(is_up)
+                if is_up:
+                    node, found = a + size, -1
+                    while node:
+                        found = max(found, stamp[node])
+                        node >>= 1
+                    left_of.append(found)
+                else:
+                    left_of.append(-1)
+        for edge in range(first, len(edge_x)):
+            a, b = edge_a[edge] + size, edge_b[edge] + size
+            while a < b:
+                if a & 1:
+                    stamp[a] = edge
+                    a += 1
+                if b & 1:
+                    b -= 1
+                    stamp[b] = edge
+                a >>= 1
+                b >>= 1
+
+    return _link_rectilinear(ys, np.asarray(edge_x), np.asarray(edge_a, dtype=int), np.asarray(edge_b, dtype=int),
+                             np.asarray(edge_up, dtype=bool), np.asarray(left_of, dtype=int))
+
+
+def _merge(runs):
+    """Sorted runs [a, b) with touching and overlapping ones joined."""
+    merged = []
+    for a, b in sorted(runs):
+        if merged and a <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    return merged
+
+
+def _subtract(runs, other):
+    """Pieces of the sorted runs [a, b) that are not in the sorted runs `other`."""
+    result = []
+    j = 0
+    for a, b in runs:
+        while j < len(other) and other[j][1] <= a:
+            j += 1
+        k = j
+        while k < len(other) and other[k][0] < b:
+            if other[k][0] > a:
+                result.append((a, other[k][0]))
+            a = max(a, other[k][1])
+            k += 1
+        if a < b:
+            result.append((a, b))
+    return result
+
+
+def _link_rectilinear(ys, x, a, b, up, left_of):
+    """Rings of the vertical boundary edges of a rectilinear union."""
+    count = len(x)
+    if not count:
+        return []
+    # An up edge runs a -> b, a down edge b -> a
+    start_leaf, end_leaf = np.where(up, a, b), np.where(up, b, a)
+
+    # Ends of vertical edges at the same y, left to right, pair into the
+    # horizontal edges.  Where two rings touch at a corner the up edge goes
+    # first, which keeps the rings apart.
+    vertex_edge = np.r_[np.arange(count), np.arange(count)]
+    vertex_is_end = np.r_[np.zeros(count, bool), np.ones(count, bool)]
+    vertex_leaf = np.r_[start_leaf, end_leaf]
+    order = np.lexsort((~np.r_[up, up], np.r_[x, x], vertex_leaf))
+    left, right = order[0::2], order[1::2]
+    if np.any(vertex_leaf[left] != vertex_leaf[right]) or np.any(vertex_is_end[left] == vertex_is_end[right]):
+        raise ValueError("Inconsistent rectilinear boundary")
+    end, start = np.where(vertex_is_end[left], left, right), np.where(vertex_is_end[left], right, left)
+    following = np.empty(count, dtype=int)
+    following[vertex_edge[end]] = vertex_edge[start]
+
+    following = following.tolist()
+    ring_of = [-1] * count
+    walk, offsets = [], [0]
+    for first in range(count):
+        if ring_of[first] >= 0:
+            continue
+        ring = len(offsets) - 1
+        edge = first
+        while ring_of[edge] < 0:
+            ring_of[edge] = ring
+            walk.append(edge)
+            edge = following[edge]
+        offsets.append(len(walk))
+    ring_of = np.asarray(ring_of)
+    walk = np.asarray(walk)
+    points = np.empty((2 * count, 2))
+    points[0::2, 0] = points[1::2, 0] = x[walk]
+    points[0::2, 1] = ys[start_leaf[walk]]
+    points[1::2, 1] = ys[end_leaf[walk]]
+    rings = np.split(points, 2 * np.asarray(offsets[1:-1]))
+    # Signed area is the sum of x dy over the vertical edges
+    areas = np.bincount(ring_of, weights=x * (ys[end_leaf] - ys[start_leaf]), minlength=len(rings))
+
+    # A hole's leftmost edge looks left into the covered area it is cut from;
+    # the edge seen there is on its outer ring or on another hole of it.
+    candidates = np.flatnonzero(up & (areas[ring_of] < 0))
+    candidates = candidates[np.lexsort((x[candidates], ring_of[candidates]))]
+    holes, first = np.unique(ring_of[candidates], return_index=True)
+    leftmost = candidates[first]
+    parent = {}
+    for i, edge in sorted(zip(holes.tolist(), leftmost.tolist()), key=lambda item: x[item[1]]):
+        seen = left_of[edge]
+        if seen < 0:
+            raise ValueError("Hole outside every ring")
+        j = int(ring_of[seen])
+        parent[i] = parent.get(j, j)
+    polygons = {i: (rings[i], []) for i in np.flatnonzero(areas > 0).tolist()}
+    for i in holes.tolist():
+        polygons[parent[i]][1].append(rings[i])
+    result = []
+    for ring, holes in polygons.values():
+        pieces = [list(_split(r)) for r in [ring, *holes]]
+        if all(len(p) == 1 for p in pieces):
+            result.append((ring, holes))
+        else:
+            # A ring touches itself: its pieces are outer rings and holes of their own
+            result.extend(_assemble(_simplify(piece) for group in pieces for piece in group))
+    return result
+
+
+# ------------------------------- Polygons ----------------------------------
+
+def _edges(polygons, operand):
+    """Non-horizontal edges as (x0, y0, x1, y1, winding, operand), y0 < y1."""
+    rows = []
+    for ring in _rings(polygons):
+        a, b = ring, np.roll(ring, -1, axis=0)
+        upward = b[:, 1] > a[:, 1]
+        keep = a[:, 1] != b[:, 1]
+        low, high = np.where(upward[:, None], a, b), np.where(upward[:, None], b, a)
+        rows.append(np.column_stack((low, high, np.where(upward, 1.0, -1.0), np.full(len(a), operand)))[keep])
+    return np.vstack(rows) if rows else np.empty((0, 6))
+
+
+OPERATIONS = {
+    "union": lambda a, b: a | b,
+    "intersection": lambda a, b: a & b,
+    "difference": lambda a, b: a & ~b,
+    "xor": lambda a, b: a ^ b,
+}
+
+
+def boolean(subject, clip=(), op="union"):
+    """`op` of two groups of polygons (rings or (ring, holes)) as (ring, holes) polygons.
+
+    Overlaps inside a group count once (nonzero winding), so
+    boolean(polygons) alone is their union.  The plane is cut at every
+    vertex and edge crossing y into slabs where the edges do not cross; in a
+    slab the edges sort by x and the winding numbers of both groups give the
+    inside runs.  Edges where a run starts or ends are boundary; where the
+    runs of neighbouring slabs differ, the difference is a horizontal edge.
+    """
+    inside = OPERATIONS[op]
+    e = np.vstack((_edges(subject, 0), _edges(clip, 1)))
+    if not len(e):
+        return []
+    ex0, ey0, ex1, ey1, winding, operand = e.T
+    slope = (ex1 - ex0) / (ey1 - ey0)
+
+    def x_at(idx, y):
+        return np.where(ey1[idx] == y, ex1[idx], ex0[idx] + (y - ey0[idx]) * slope[idx])
+
+    ys = np.unique(np.concatenate((ey0, ey1)))
+    by_start = np.argsort(ey0, kind="stable")
+    start_y = ey0[by_start]
+    active = set()
+    segments = []  # (x0, y0, x1, y1) boundary pieces
+    growing = {}   # edge: [x_lo, y_lo, x_hi, y_hi, down] of its boundary piece still growing upwards
+    top_runs, top_y = [], None  # inside runs at the top of the last slab
+
+    def level(y, below, above):
+        """Horizontal boundary where the runs under and over y differ; returns its end xs."""
+        ends = set()
+        for a, b in _subtract(below, above):
+            segments.append((b, y, a, y))
+            ends.update((a, b))
+        for a, b in _subtract(above, below):
+            segments.append((a, y, b, y))
+            ends.update((a, b))
+        return ends
+
+    def close(edge):
+        x_lo, y_lo, x_hi, y_hi, down = growing.pop(edge)
+        segments.append((x_hi, y_hi, x_lo, y_lo) if down else (x_lo, y_lo, x_hi, y_hi))
+
+    for k in range(len(ys) - 1):
+        ya, yb = ys[k], ys[k + 1]
+        active.update(by_start[np.searchsorted(start_y, ya):np.searchsorted(start_y, ya, "right")].tolist())
+        active = {i for i in active if ey1[i] > ya}
+        if not active:
+            continue
+        idx = np.fromiter(active, dtype=int, count=len(active))
+        xa, xb = x_at(idx, ya), x_at(idx, yb)
+
+        # Edges that cross inside the slab cut it further
+        cuts = [ya, yb]
+        order = np.lexsort((xb, xa))
+        if np.any(np.diff(xb[order]) < 0):
+            da, db = xa[:, None] - xa[None, :], xb[:, None] - xb[None, :]
+            crossing = np.triu(da * db < 0, 1)
+            t = da[crossing] / (da[crossing] - db[crossing])
+            cuts = np.unique(np.r_[ya, ya + t[(t > 0) & (t < 1)] * (yb - ya), yb])
+
+        for y_lo, y_hi in zip(cuts[:-1], cuts[1:]):
+            if y_hi <= y_lo:
+                continue
+            lo_x, hi_x = x_at(idx, y_lo), x_at(idx, y_hi)
+            order = np.argsort(lo_x + hi_x, kind="stable")
+            lo_x, hi_x = lo_x[order], hi_x[order]
+            w, op_of = winding[idx[order]], operand[idx[order]]
+            # Edges on top of each other are one transition at one position;
+            # tiny float inversions are flattened so runs never overlap
+            same = (np.abs(np.diff(lo_x)) <= TOLERANCE) & (np.abs(np.diff(hi_x)) <= TOLERANCE)
+            last = np.r_[np.flatnonzero(~same), len(lo_x) - 1]
+            first = np.r_[0, last[:-1] + 1]
+            edge_of = idx[order][first].tolist()
+            lo_x = np.maximum.accumulate(lo_x[first]).tolist()
+            hi_x = np.maximum.accumulate(hi_x[first]).tolist()
+            wind_a = np.cumsum(np.where(op_of == 0, w, 0))[last]
+            wind_b = np.cumsum(np.where(op_of == 1, w, 0))[last]
+            state = inside(wind_a != 0, wind_b != 0)
+            changes = np.flatnonzero(state != np.r_[False, state[:-1]]).tolist()
+
+            boundary = {}
+            runs_lo, runs_hi = [], []
+            for i in changes:
+                # Inside to the right: the boundary runs down
+                boundary[edge_of[i]] = (lo_x[i], hi_x[i], bool(state[i]))
+                if state[i]:
+                    runs_lo.append([lo_x[i], None])
+                    runs_hi.append([hi_x[i], None])
+                else:
+                    runs_lo[-1][1] = lo_x[i]
+                    runs_hi[-1][1] = hi_x[i]
+
+            if top_y != y_lo:
+                if top_y is not None:
+                    level(top_y, top_runs, [])
+                for edge in list(growing):
+                    close(edge)
+                top_runs = []
+            ends = level(y_lo, top_runs, runs_lo)
+            # A boundary edge grows on through y unless a horizontal edge starts there
+            for edge, piece in list(growing.items()):
+                b = boundary.get(edge)
+                if b is None or b[2] != piece[4] or b[0] != piece[2] or piece[2] in ends:
+                    close(edge)
+            for edge, (x_lo, x_hi, down) in boundary.items():
+                piece = growing.get(edge)
+                if piece:
+                    piece[2], piece[3] = x_hi, y_hi
+                else:
+                    growing[edge] = [x_lo, y_lo, x_hi, y_hi, down]
+            top_runs, top_y = runs_hi, y_hi
+
+    if top_y is not None:
+        level(top_y, top_runs, [])
+    for edge in list(growing):
+        close(edge)
+    return _assemble(_simplify(ring) for ring in _link(segments))
+
+
+def _link(segments):
+    """Closed simple rings of directed boundary segments; at a vertex shared
+    by two rings the sharpest left turn is taken, which keeps them apart, and
+    a ring that still comes back to a vertex is cut there."""
+    outgoing = {}
+    for s, (xa, ya, xb, yb) in enumerate(segments):
+        outgoing.setdefault((xa, ya), []).append(s)
+    used = [False] * len(segments)
+    for first in range(len(segments)):
+        if used[first]:
+            continue
+        ring = []
+        s = first
+        while True:
+            used[s] = True
+            xa, ya, xb, yb = segments[s]
+            ring.append((xa, ya))
+            options = [o for o in outgoing.get((xb, yb), []) if not used[o] or o == first]
+            if not options:
+                break
+            if len(options) > 1:
+                dx, dy = xb - xa, yb - ya
+
+                def turn(o):
+                    ox, oy = segments[o][2] - xb, segments[o][3] - yb
+                    return np.arctan2(dx * oy - dy * ox, dx * ox + dy * oy)
+                options.sort(key=turn, reverse=True)
+            s = options[0]
+            if s == first:
+                break
+        yield from _split(ring)
+
+
+def _simplify(ring):
+    """Ring without repeated points and collinear middle points."""
+    points = []
+    for x, y in map(tuple, ring):
+        if not points or abs(x - points[-1][0]) + abs(y - points[-1][1]) > TOLERANCE:
+            points.append((x, y))
+    while len(points) > 1 and abs(points[0][0] - points[-1][0]) + abs(points[0][1] - points[-1][1]) <= TOLERANCE:
+        points.pop()
+    changed = True
+    while changed and len(points) >= 3:
+        changed = False
+        kept = []
+        n = len(points)
+        for i in range(n):
+            (ax, ay), (bx, by) = kept[-1] if kept else points[i - 1], points[i]
+            cx, cy = points[(i + 1) % n]
+            ux, uy, vx, vy = bx - ax, by - ay, cx - bx, cy - by
+            if abs(ux * vy - uy * vx) <= TOLERANCE * (abs(ux) + abs(uy) + abs(vx) + abs(vy)):
+                changed = True
+                continue
+            kept.append(points[i])
+        points = kept
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def union(polygons):
+    return boolean(polygons, (), "union")
+
+
+def difference(subject, clip):
+    return boolean(subject, clip, "difference")
+
+
+# ---------------------------- Triangulation --------------------------------
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _in_triangle(p, a, b, c):
+    """Whether p is inside or on the triangle abc, in either orientation."""
+    d = (_cross(a, b, p), _cross(b, c, p), _cross(c, a, p))
+    return not (min(d) < 0 < max(d))
+
+
+def _locally_inside(points, i, b):
+    """Whether the direction from vertex i to point b starts inside the ring
+    at i (between its edges), which tells apart copies of one vertex."""
+    n = len(points)
+    prev, a, following = points[i - 1], points[i], points[(i + 1) % n]
+    if _cross(prev, a, following) > 0:
+        return _cross(a, following, b) >= 0 and _cross(a, b, prev) >= 0
+    return _cross(a, b, prev) > 0 or _cross(a, following, b) > 0
+
+
+def _sector_contains(points, i, j):
+    """Whether the corner at vertex j lies within the corner at vertex i (same point)."""
+    n = len(points)
+    return _cross(points[i - 1], points[i], points[j - 1]) > 0 and \
+        _cross(points[(j + 1) % n], points[i], points[(i + 1) % n]) > 0
+
+
+def _hole_bridge(points, point):
+    """Index of the vertex of `points` that `point` M, a hole's rightmost
+    vertex, sees: the ray from M to +x hits an edge, whose right end is
+    visible unless vertices inside the triangle M, hit, end hide it; then the
+    one at the smallest angle to the ray is (the copy whose corner M is in,
+    when a vertex appears more than once)."""
+    n = len(points)
+    hx, hy = point
+    qx, m = np.inf, None
+    for i in range(n):
+        (ax, ay), (bx, by) = points[i], points[(i + 1) % n]
+        # Edges facing M from the right run upwards
+        if ay <= hy <= by and ay != by:
+            x = ax + (hy - ay) * (bx - ax) / (by - ay)
+            if hx <= x < qx:
+                qx, m = x, (i if ax > bx else (i + 1) % n)
+                if x == hx:
+                    return m  # M lies on the edge
+    if m is None:
+        raise ValueError("Hole outside its ring")
+    mx, my = points[m]
+    tan_min = np.inf
+    for i in range(m, m + n):
+        i %= n
+        px, py = points[i]
+        if hx <= px <= mx and px != hx and _in_triangle((px, py), (hx, hy), (qx, hy), (mx, my)):
+            tan = abs(hy - py) / (px - hx)
+            if _locally_inside(points, i, point) and (
+                    tan < tan_min or (tan == tan_min and (px < points[m][0] or (
+                        px == points[m][0] and _sector_contains(points, m, i))))):
+                m, tan_min = i, tan
+    return m
+
+
+def _bridge(ring, holes):
+    """One ring with every hole joined to it, as ear clipping needs.
+
+    Rings that share a vertex (holes touching the ring or each other) are
+    joined there first; each hole left is joined by a cut from its rightmost
+    vertex to a vertex it can see.  Those go right to left, so a cut only
+    crosses holes that are already joined.
+    """
+    rings = [[tuple(p) for p in ring]] + [[tuple(p) for p in np.asarray(hole, dtype=float)] for hole in holes]
+    rings = _join_touching(rings)
+    points, holes = rings[0], rings[1:]
+    rightmost = [_rightmost(hole) for hole in holes]
+    for k in sorted(range(len(holes)), key=lambda k: (-holes[k][rightmost[k]][0], holes[k][rightmost[k]][1])):
+        hole, m = holes[k], rightmost[k]
+        visible = _hole_bridge(points, hole[m])
+        points = points[:visible + 1] + hole[m:] + hole[:m + 1] + points[visible:]
+    return points
+
+
+def _rightmost(hole):
+    """Index of the rightmost vertex of a hole, the lowest of several; of a
+    vertex the hole visits twice, the copy that faces +x."""
+    x, y = max(hole, key=lambda p: (p[0], -p[1]))
+    copies = [i for i, p in enumerate(hole) if p == (x, y)]
+    return next((i for i in copies if _locally_inside(hole, i, (x + 1.0, y))), copies[0])
+
+
+def _touching(points, other):
+    """(index in points, index in other) of a vertex the two rings share, at
+    the copies where the other ring lies in the corner of the first."""
+    at = {}
+    for i, p in enumerate(points):
+        at.setdefault(p, []).append(i)
+    n = len(other)
+    shared = [(i, h) for h, p in enumerate(other) for i in at.get(p, ())]
+    for i, h in shared:
+        if _locally_inside(points, i, other[h - 1]) and _locally_inside(points, i, other[(h + 1) % n]):
+            return i, h
+    return shared[0]
+
+
+def _join_touching(rings):
+    """Rings (the outer one first) with every pair that shares a vertex
+    joined into one ring there, the later ring spliced into the earlier."""
+    rings = list(rings)
+    while len(rings) > 1:
+        owner = {}
+        pair = None
+        for r, points in enumerate(rings):
+            for p in points:
+                o = owner.setdefault(p, r)
+                if o != r:
+                    pair = o, r
+                    break
+            if pair:
+                break
+        if pair is None:
+            break
+        a, b = pair
+        i, h = _touching(rings[a], rings[b])
+        rings[a] = rings[a][:i] + rings[b][h:] + rings[b][:h] + rings[a][i:]
+        del rings[b]
+    return rings
+
+
+def _is_ear(points, index, i):
+    """Whether the corner at index[i] can be cut off: convex, and no other
+    vertex in or on the triangle.  A copy of one of its corners (where the
+    ring touches itself or a hole is joined) blocks it only if the ring goes
+    on from there into the triangle."""
+    n = len(index)
+    near = ((i - 1) % n, i, (i + 1) % n)
+    a, b, c = (points[index[j]] for j in near)
+    if _cross(a, b, c) <= 0:
+        return False
+    corners = ((a, b, c), (b, c, a), (c, a, b))  # corner, next, previous
+    for j in range(n):
+        if j in near:
+            continue
+        p = points[index[j]]
+        for corner, following, previous in corners:
+            if p == corner:
+                if any(_cross(corner, following, q) > 0 and _cross(corner, q, previous) > 0
+                       for q in (points[index[j - 1]], points[index[(j + 1) % n]])):
+                    return False
+                break
+        else:
+            if _in_triangle(p, a, b, c):
+                return False
+    return True
+
+
+def triangulate(ring, holes=()):
+    """Triangles (T, 3, 2) of a CCW ring with CW holes by ear clipping.
+
+    Ear clipping takes quadratic time, which suits fills of a few thousand
+    vertices; large rectilinear unions are better hatched.
+    """
+    points = _bridge(np.asarray(ring, dtype=float), holes)
+    index = list(range(len(points)))
+    triangles = []
+    i, stalled = 0, 0
+    while len(index) > 3:
+        n = len(index)
+        i %= n
+        if _is_ear(points, index, i):
+            triangles.append(tuple(points[index[j % n]] for j in (i - 1, i, i + 1)))
+            del index[i]
+            stalled = 0
+        elif stalled > n:
+            # No ear left: only corners without area (spikes, straight runs) may go
+            flat = [j for j in range(n)
+                    if _cross(points[index[j - 1]], points[index[j]], points[index[(j + 1) % n]]) == 0]
+            if not flat:
+                raise ValueError("Cannot triangulate a ring that crosses itself")
+            del index[flat[0]]
+            stalled = 0
+        else:
+            i += 1
+            stalled += 1
+    if len(index) == 3 and _cross(*(points[j] for j in index)) > 0:
+        triangles.append(tuple(points[j] for j in index))
+    return np.asarray(triangles, dtype=float).reshape(-1, 3, 2)
+
+
+# --------------------------------- DXF -------------------------------------
+
+def add_hatches(msp, layer, polygons, color=256):
+    """One solid HATCH per polygon, its holes as inner boundary paths."""
+    for ring, holes in polygons:
+        hatch = msp.add_hatch(color=color, dxfattribs={"layer": layer})
+        hatch.paths.add_polyline_path(ring.tolist(), is_closed=True, flags=ezdxf.const.BOUNDARY_PATH_EXTERNAL)
+        for hole in holes:
+            hatch.paths.add_polyline_path(hole.tolist(), is_closed=True)
+
+
+def add_solids(msp, layer, polygons, color=256):
+    """Polygons filled with triangular SOLID entities."""
+    for ring, holes in polygons:
+        for a, b, c in triangulate(ring, holes).tolist():
+            msp.add_solid([a, b, c], dxfattribs={"layer": layer, "color": color})
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(1)
+    corner = rng.uniform(0, 1000 * np.sqrt(count), (count, 2))
+    rects = np.column_stack((corner, corner + rng.uniform(10, 1000, (count, 2))))
+    start = time.perf_counter()
+    polygons = rect_union(rects)
+    elapsed = time.perf_counter() - start
+    vertices = sum(len(ring) + sum(len(h) for h in holes) for ring, holes in polygons)
+    print(f"{count} rectangles -> {len(polygons)} polygon(s), "
+          f"{sum(len(holes) for _, holes in polygons)} hole(s), {vertices} vertices in {elapsed:.2f} s")
@@ -0,0 +1,63 @@
+"""Round trip of output.save/bundle through load/verify in every format.
+
+Usage: python -m pytest dxf/test_output.py
+"""
+
+import os
+
+import pytest
+import ezdxf
+
+from output import FORMATS, bundle, load, output_name, save, verify
+
+
+@pytest.fixture
+def doc():
+    doc = ezdxf.new("R2010")
+    doc.layers.add("Elevation", color=1)
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (1200, 0), dxfattribs={"layer": "Elevation"})
+    msp.add_lwpolyline([(0, 0), (50, 0), (50, 1800), (0, 1800)], close=True)
+    msp.add_text("Gate 1200 x 1800", dxfattribs={"height": 25}).set_placement((0, -60))
+    hatch = msp.add_hatch(color=3)
+    hatch.paths.add_polyline_path([(10, 10), (40, 10), (40, 1790), (10, 1790)])
+    return doc
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_round_trip(doc, tmp_path, fmt):
+    if fmt == "zstd":
+        pytest.importorskip("zstandard")
+    filename = output_name(tmp_path / "gate", fmt)
+    report = save(doc, filename, fmt)
+    assert report["format"] == fmt and report["bytes"] > 0
+    assert verify(doc, filename) == []
+
+
+@pytest.mark.parametrize("fmt, written", [("gzip", "gate.dxf.gz"), ("binary", "gate.dxf"), ("ascii", "gate.dxf")])
+def test_name_follows_format(doc, tmp_path, fmt, written):
+    # civilcoding gate gate.dxf -f gzip writes gate.dxf.gz and says so
+    report = save(doc, tmp_path / "gate.dxf", fmt)
+    assert report["file"] == str(tmp_path / written)
+    assert sorted(os.listdir(tmp_path)) == [written]
+    report = save(doc, tmp_path / "gate.dxf.gz", fmt)
+    assert report["file"] == str(tmp_path / "gate.dxf.gz" if fmt == "gzip" else tmp_path / "gate.dxf")
+
+
+@pytest.mark.parametrize("fmt", ["gzip", "binary"])
+def test_content_decides_over_name(doc, tmp_path, fmt):
+    # A gzip or binary drawing renamed to plain .dxf still reads
+    filename = tmp_path / "gate.dxf"
+    os.replace(save(doc, tmp_path / "gate", fmt)["file"], filename)
+    assert verify(doc, filename) == []
+
+
+def test_bundle(doc, tmp_path):
+    files = [save(doc, output_name(tmp_path / f"gate_{fmt}", fmt), fmt)["file"]
+             for fmt in ("ascii", "binary", "gzip")]
+    report = bundle(files, tmp_path / "gates.zip")
+    assert report["format"] == "zip"
+    for filename in files:
+        member = os.path.basename(filename)
+        assert verify(doc, report["file"], member) == []
+    assert len(load(report["file"], "gate_ascii.dxf").modelspace()) == len(doc.modelspace())
@@ -0,0 +1,123 @@
+"""rect_union, boolean and triangulate against a brute-force raster, and the
+DXF entities of add_hatches/add_solids through a save and reload.
+
+Usage: python -m pytest dxf/test_polygon.py
+"""
+
+import ezdxf
+import numpy as np
+import pytest
+
+from polygon import add_hatches, add_solids, boolean, difference, polygon_area, rect_union, triangulate
+
+SIZE = 50
+SEEDS = range(40)
+
+
+def random_rects(seed, count=(20, 120)):
+    rng = np.random.default_rng(seed)
+    corner = rng.integers(0, SIZE - 8, (rng.integers(*count), 2))
+    return np.column_stack((corner, corner + rng.integers(1, 7, corner.shape)))
+
+
+def box(x0, y0, x1, y1):
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=float)
+
+
+def raster(rects):
+    """Unit cells covered by integer rectangles."""
+    grid = np.zeros((SIZE, SIZE), dtype=int)
+    for x0, y0, x1, y1 in rects:
+        grid[y0:y1, x0:x1] = 1
+    return grid
+
+
+def coverage(polygons):
+    """How many triangles cover each unit cell, sampled just off its centre."""
+    x, y = np.meshgrid(np.arange(SIZE) + 0.5137, np.arange(SIZE) + 0.5071)
+    grid = np.zeros((SIZE, SIZE), dtype=int)
+    for ring, holes in polygons:
+        for a, b, c in triangulate(ring, holes):
+            d = [(q[0] - p[0]) * (y - p[1]) - (q[1] - p[1]) * (x - p[0]) for p, q in ((a, b), (b, c), (c, a))]
+            grid += ((d[0] > 0) & (d[1] > 0) & (d[2] > 0)) | ((d[0] < 0) & (d[1] < 0) & (d[2] < 0))
+    return grid
+
+
+def area(polygons):
+    return sum(polygon_area(ring) + sum(polygon_area(hole) for hole in holes) for ring, holes in polygons)
+
+
+def assert_simple(polygons):
+    for ring, holes in polygons:
+        assert polygon_area(ring) > 0
+        for r in (ring, *holes):
+            assert len({tuple(p) for p in r.tolist()}) == len(r)
+        assert all(polygon_area(hole) < 0 for hole in holes)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rect_union(seed):
+    rects = random_rects(seed)
+    polygons = rect_union(rects)
+    assert_simple(polygons)
+    assert area(polygons) == pytest.approx(raster(rects).sum())
+    assert np.array_equal(coverage(polygons), raster(rects))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_boolean_union(seed):
+    rects = random_rects(seed)
+    polygons = boolean([box(*r) for r in rects])
+    assert_simple(polygons)
+    assert area(polygons) == pytest.approx(raster(rects).sum())
+    assert np.array_equal(coverage(polygons), raster(rects))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_boolean_difference(seed):
+    rects = random_rects(seed)
+    subject, clip = rects[::2], rects[1::2]
+    polygons = difference([box(*r) for r in subject], [box(*r) for r in clip])
+    exact = raster(subject) & (1 - raster(clip))
+    assert_simple(polygons)
+    assert area(polygons) == pytest.approx(exact.sum())
+    assert np.array_equal(coverage(polygons), exact)
+
+
+def test_holes_with_the_same_rightmost_x():
+    triangles = triangulate(box(0, 0, 10, 10), [box(2, 2, 4, 4)[::-1], box(2, 6, 4, 8)[::-1]])
+    assert sum(abs(polygon_area(t)) for t in triangles) == pytest.approx(92)
+
+
+@pytest.mark.parametrize("union", [rect_union, lambda rects: boolean([box(*r) for r in rects])])
+@pytest.mark.parametrize("empty", [
+    [(1, 1), (2, 2)],  # two holes touching at a corner: one self-touching hole ring
+    [(0, 1), (1, 2)],  # a hole touching the outside at a corner
+    [(1, 1), (2, 2), (1, 3)],  # a chain of them
+])
+def test_touching_holes(union, empty):
+    cells = [(x, y, x + 1, y + 1) for x in range(4) for y in range(5) if (x, y) not in empty]
+    polygons = union(np.array(cells))
+    assert_simple(polygons)
+    assert np.array_equal(coverage(polygons), raster(cells))
+
+
+def test_dxf_round_trip(tmp_path):
+    polygons = rect_union(random_rects(3))
+    doc = ezdxf.new("R2010")
+    doc.layers.add("Fill")
+    doc.layers.add("Solid")
+    add_hatches(doc.modelspace(), "Fill", polygons, color=3)
+    add_solids(doc.modelspace(), "Solid", polygons)
+    doc.saveas(tmp_path / "polygons.dxf")
+
+    msp = ezdxf.readfile(tmp_path / "polygons.dxf").modelspace()
+    hatches, solids = msp.query("HATCH"), msp.query("SOLID")
+    assert len(hatches) == len(polygons)
+    assert {h.dxf.layer for h in hatches} == {"Fill"}
+    assert [len(h.paths) for h in hatches] == [1 + len(holes) for _, holes in polygons]
+    assert len(solids) == sum(len(triangulate(ring, holes)) for ring, holes in polygons)
+    assert {s.dxf.layer for s in solids} == {"Solid"}
+    # SOLID stores a triangle as four points, the last one repeated
+    assert sum(abs(polygon_area(np.array([(v.x, v.y) for v in s.vertices()[:3]]))) for s in solids) == \
+        pytest.approx(area(polygons))
@@ -0,0 +1,281 @@
+"""Resumable batch runs of the CivilCoding tools from a manifest.
+
+A manifest (JSON) lists jobs; each runs a civilcoding.py command
+("command": ["gate", "build/gate.dxf"]) or any program ("run": [...]) and
+declares the files it reads and writes:
+
+    {"jobs": [
+        {"name": "building", "command": ["building-convert", "building.txt", "build/parseddata.json"],
+         "inputs": ["building.txt"], "outputs": ["build/parseddata.json"]},
+        {"name": "takeoff", "command": ["takeoff", "build/parseddata.json"],
+         "inputs": ["build/parseddata.json"], "stdout": "build/takeoff.txt", "timeout": 60}
+    ]}
+
+Paths are relative to the manifest.  A job that reads another job's output
+runs after it (extra ordering can be given with "after": [names]); the
+jobs form a DAG that is executed on `workers` parallel processes, each job
+in its own process so that it can be killed when it exceeds its timeout.
+
+Every finished job is appended to a journal next to the manifest with a
+hash of its command and input files.  A job is skipped when the journal
+has a success with the same hash and its outputs still exist, so an
+interrupted run picks up where it stopped and a re-run only redoes jobs
+whose inputs changed.  When a job fails, the jobs that need it are
+blocked and the others carry on.
+
+Usage: python runner.py manifest.json [job...] [-j workers] [--force] [--timeout s]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CLI = os.path.join(ROOT, "civilcoding.py")
+TIMEOUT = 600  # s per job unless the job or the command line says otherwise
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def load_manifest(path, timeout=TIMEOUT):
+    """Jobs of a manifest by name, with argv, command, inputs, outputs, after, timeout, stdout."""
+    with open(path) as f:
+        manifest = json.load(f)
+    jobs = {}
+    for spec in manifest.get("jobs", []):
+        name = spec.get("name")
+        if not name:
+            raise ManifestError(f"Job without a name: {spec}")
+        if name in jobs:
+            raise ManifestError(f"Duplicate job name '{name}'")
+        if ("command" in spec) == ("run" in spec):
+            raise ManifestError(f"Job '{name}' needs either 'command' (civilcoding) or 'run' (a program)")
+        argv = [sys.executable, CLI, *spec["command"]] if "command" in spec else list(spec["run"])
+        outputs = list(spec.get("outputs", []))
+        if spec.get("stdout"):
+            outputs.append(spec["stdout"])
+        jobs[name] = {
+            "name": name,
+            "argv": [str(a) for a in argv],
+            "command": spec.get("command", spec.get("run")),
+            "inputs": [os.path.normpath(p) for p in spec.get("inputs", [])],
+            "outputs": [os.path.normpath(p) for p in outputs],
+            "after": list(spec.get("after", [])),
+            "timeout": spec.get("timeout", manifest.get("timeout", timeout)),
+            "stdout": spec.get("stdout"),
+        }
+    return jobs
+
+
+def build_dag(jobs):
+    """{job: set of jobs it waits for}; raises ManifestError on unknown jobs and cycles."""
+    producers = {}
+    for job in jobs.values():
+        for output in job["outputs"]:
+            if output in producers:
+                raise ManifestError(f"'{output}' is written by both '{producers[output]}' and '{job['name']}'")
+            producers[output] = job["name"]
+    deps = {}
+    for name, job in jobs.items():
+        unknown = [a for a in job["after"] if a not in jobs]
+        if unknown:
+            raise ManifestError(f"Job '{name}' runs after unknown job(s): {', '.join(unknown)}")
+        deps[name] = {producers[i] for i in job["inputs"] if i in producers} | set(job["after"])
+        deps[name].discard(name)
+
+    # Kahn's algorithm: whatever is left over sits on a cycle
+    waiting = {name: set(d) for name, d in deps.items()}
+    ready = [name for name, d in waiting.items() if not d]
+    while ready:
+        done = ready.pop()
+        del waiting[done]
+        for name, d in waiting.items():
+            if done in d:
+                d.discard(done)
+                if not d:
+                    ready.append(name)
+    cycle = sorted(waiting)
+    if cycle:
+        raise ManifestError(f"Dependency cycle between jobs: {', '.join(cycle)}")
+    return deps
+
+
+def with_dependencies(targets, deps):
+    """`targets` and every job they need, directly or not."""
+    selected = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in deps:
+            raise ManifestError(f"Unknown job '{name}'")
+        if name not in selected:
+            selected.add(name)
+            stack.extend(deps[name])
+    return selected
+
+
+def file_digest(path, cache={}):
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in cache:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        cache[key] = digest.hexdigest()
+    return cache[key]
+
+
+def input_key(job, base):
+    """Hash of the job's command and the contents of its inputs (None if one is missing)."""
+    digest = hashlib.sha1(json.dumps([job["command"], job["stdout"]]).encode())
+    for path in job["inputs"]:
+        full = os.path.join(base, path)
+        if not os.path.isfile(full):
+            return None
+        digest.update(f"{path}:{file_digest(full)}".encode())
+    return digest.hexdigest()
+
+
+def read_journal(path):
+    """Last journal record of every job."""
+    records = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by an interrupted run
+                records[record["job"]] = record
+    return records
+
+
+def run_job(job, base):
+    """Runs one job in its own process; returns (status, seconds, message)."""
+    for output in job["outputs"]:
+        os.makedirs(os.path.join(base, os.path.dirname(output)) or base, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(job["argv"], cwd=base, capture_output=True, text=True, timeout=job["timeout"])
+    except subprocess.TimeoutExpired:
+        return "timeout", time.perf_counter() - start, f"killed after {job['timeout']} s"
+    except OSError as e:
+        return "failed", time.perf_counter() - start, str(e)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        lines = (proc.stderr or proc.stdout).strip().splitlines()
+        return "failed", elapsed, lines[-1] if lines else f"exit status {proc.returncode}"
+    if job["stdout"]:
+        with open(os.path.join(base, job["stdout"]), "w") as f:
+            f.write(proc.stdout)
+    missing = [o for o in job["outputs"] if not os.path.exists(os.path.join(base, o))]
+    if missing:
+        return "failed", elapsed, f"did not write {', '.join(missing)}"
+    return "done", elapsed, ""
+
+
+def run_manifest(path, targets=(), workers=None, force=False, timeout=TIMEOUT, report=print):
+    """Runs the jobs of a manifest (or `targets` and what they need); returns {job: result}."""
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = load_manifest(path, timeout)
+    deps = build_dag(jobs)
+    selected = with_dependencies(targets, deps) if targets else set(jobs)
+    journal_path = os.path.splitext(os.path.abspath(path))[0] + ".journal"
+    journal = {} if force else read_journal(journal_path)
+    workers = workers or os.cpu_count() or 1
+
+    results = {}
+    running = {}
+    pending = set(selected)
+    with open(journal_path, "a") as log, ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Block the jobs that need a failed one
+            for name in sorted(pending):
+                failed = [d for d in deps[name] if results.get(d, {}).get("status") in ("failed", "timeout", "blocked")]
+                if failed:
+                    pending.discard(name)
+                    results[name] = {"status": "blocked", "seconds": 0.0, "message": f"needs {', '.join(failed)}"}
+                    report(f"⚠️ {name}: blocked ({results[name]['message']})")
+            ready = sorted(name for name in pending if all(d in results for d in deps[name]))
+            for name in ready:
+                pending.discard(name)
+                job = jobs[name]
+                key = input_key(job, base)
+                previous = journal.get(name)
+                if (key and previous and previous["status"] == "done" and previous["key"] == key
+                        and all(os.path.exists(os.path.join(base, o)) for o in job["outputs"])):
+                    results[name] = {"status": "cached", "seconds": 0.0, "message": ""}
+                    report(f"⏭️ {name}: unchanged")
+                    continue
+                if key is None:
+                    missing = [i for i in job["inputs"] if not os.path.isfile(os.path.join(base, i))]
+                    results[name] = {"status": "failed", "seconds": 0.0, "message": f"missing {', '.join(missing)}"}
+                    report(f"❌ {name}: {results[name]['message']}")
+                    continue
+                running[pool.submit(run_job, job, base)] = (name, key)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = running.pop(future)
+                status, seconds, message = future.result()
+                # Hash again: a job may rewrite its own inputs
+                key = input_key(jobs[name], base) or key
+                results[name] = {"status": status, "seconds": seconds, "message": message}
+                log.write(json.dumps({"job": name, "status": status, "key": key, "seconds": round(seconds, 3),
+                                      "finished": datetime.datetime.now().isoformat(timespec="seconds"),
+                                      "message": message}) + "\n")
+                log.flush()
+                icon = "✅" if status == "done" else "❌"
+                report(f"{icon} {name}: {status} in {seconds:.2f} s" + (f" ({message})" if message else ""))
+    return results
+
+
+def summary(results, elapsed):
+    lines = [f"{'job':24s} {'status':8s} {'time':>9s}"]
+    for name, result in sorted(results.items(), key=lambda item: -item[1]["seconds"]):
+        seconds = f"{result['seconds']:8.2f}s" if result["status"] in ("done", "failed", "timeout") else "        -"
+        lines.append(f"{name:24s} {result['status']:8s} {seconds}")
+    counts = {}
+    for result in results.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    busy = sum(result["seconds"] for result in results.values())
+    lines.append(f"{len(results)} job(s): " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+                 + f" in {elapsed:.2f} s ({busy:.2f} s of job time)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a manifest of jobs, resuming from its journal")
+    parser.add_argument("manifest")
+    parser.add_argument("jobs", nargs="*", help="run only these jobs and the jobs they need")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="parallel jobs (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the journal and run everything")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per job unless the manifest says")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        results = run_manifest(args.manifest, args.jobs, args.workers, args.force, args.timeout)
+    except (ManifestError, OSError, ValueError) as e:
+        print(f"❌ {args.manifest}: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted: finished jobs are in the journal, run again to resume")
+        sys.exit(130)
+    print()
+    print(summary(results, time.perf_counter() - start))
+    sys.exit(1 if any(r["status"] in ("failed", "timeout", "blocked") for r in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
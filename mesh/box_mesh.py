@@ -0,0 +1,252 @@
+"""Mesh export for models made of axis-aligned boxes, without FreeCAD.
+
+Boxes are the dicts of Kitchen/kitchen_model.py and
+FreeCADMacros/GateWindow/gate_boxes.py (name, x, y, z, length, width,
+height, color).  Vertex and index buffers for all boxes are built in one
+NumPy pass and written as:
+
+  - .glb: binary glTF 2.0 for the web viewer.  Boxes of the same size and
+    colour share one mesh and are placed by their node's translation; one
+    material per colour.  Units are converted to metres, Z up to Y up.
+  - .obj: Wavefront OBJ with a .mtl file holding the colours.
+  - .stl: binary STL (no colours).
+
+Usage: python box_mesh.py {gate|kitchen|boxes.json} output.{glb|obj|stl}...
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+# Unit cube faces: outward normal and corners counter-clockwise from outside
+FACES = (
+    ((-1, 0, 0), ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0))),
+    ((1, 0, 0), ((1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1))),
+    ((0, -1, 0), ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1))),
+    ((0, 1, 0), ((0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0))),
+    ((0, 0, -1), ((0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0))),
+    ((0, 0, 1), ((0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1))),
+)
+# 24 vertices (4 per face, so each face has its own normal) and 12 triangles
+CUBE_POSITIONS = np.array([corner for _, corners in FACES for corner in corners], dtype=np.float32)
+CUBE_NORMALS = np.repeat(np.array([normal for normal, _ in FACES], dtype=np.float32), 4, axis=0)
+CUBE_INDICES = np.array([[f * 4, f * 4 + 1, f * 4 + 2, f * 4, f * 4 + 2, f * 4 + 3] for f in range(6)],
+                        dtype=np.uint32).ravel()
+# 8 shared corners for formats without normals
+CORNERS = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float32)
+CORNER_INDEX = {tuple(c): n for n, c in enumerate(CORNERS.astype(int).tolist())}
+CORNER_TRIANGLES = np.array([CORNER_INDEX[corners[k]] for _, corners in FACES for k in (0, 1, 2, 0, 2, 3)],
+                            dtype=np.uint32)
+
+# Model units are mm; glTF is metres with Y up
+GLTF_ROOT = {"rotation": [-0.7071068, 0.0, 0.0, 0.7071068], "scale": [0.001, 0.001, 0.001]}
+
+
+def box_arrays(boxes):
+    """(origins, sizes, colors) arrays of shape (n, 3)."""
+    origin = np.array([(b["x"], b["y"], b["z"]) for b in boxes], dtype=float).reshape(-1, 3)
+    size = np.array([(b["length"], b["width"], b["height"]) for b in boxes], dtype=float).reshape(-1, 3)
+    color = np.array([b.get("color", (0.8, 0.8, 0.8)) for b in boxes], dtype=float).reshape(-1, 3)
+    return origin, size, color
+
+
+def box_buffers(origin, size):
+    """Merged flat-shaded buffers: positions, normals (n*24, 3) and indices (n*36,)."""
+    n = len(origin)
+    positions = (origin[:, None, :] + CUBE_POSITIONS[None] * size[:, None, :]).reshape(-1, 3)
+    normals = np.tile(CUBE_NORMALS, (n, 1))
+    indices = (CUBE_INDICES[None] + 24 * np.arange(n, dtype=np.uint32)[:, None]).ravel()
+    return positions.astype(np.float32), normals, indices
+
+
+def instance_groups(size, color):
+    """Distinct (size, colour) rows and, for every box, the index of its row."""
+    keys = np.round(np.hstack((size, color)), 6)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return unique, inverse.ravel()
+
+
+def color_groups(color):
+    unique, inverse = np.unique(np.round(color, 6), axis=0, return_inverse=True)
+    return unique, inverse.ravel()
+
+
+class _GltfBuilder:
+    """Collects binary buffer views and accessors for a single-buffer .glb."""
+
+    def __init__(self):
+        self.chunks = []
+        self.length = 0
+        self.views = []
+        self.accessors = []
+
+    def add(self, array, target, component_type, kind, min_max=False):
+        data = np.ascontiguousarray(array).tobytes()
+        self.views.append({"buffer": 0, "byteOffset": self.length, "byteLength": len(data), "target": target})
+        self.chunks.append(data)
+        self.length += len(data)
+        pad = -self.length % 4
+        if pad:
+            self.chunks.append(b"\0" * pad)
+            self.length += pad
+        accessor = {
+            "bufferView": len(self.views) - 1,
+            "componentType": component_type,
+            "count": len(array),
+            "type": kind,
+        }
+        if min_max:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def add_indices(self, indices):
+        if indices.max() < 65536:
+            return self.add(indices.astype(np.uint16), 34963, 5123, "SCALAR")
+        return self.add(indices.astype(np.uint32), 34963, 5125, "SCALAR")
+
+    def add_mesh(self, positions, normals, indices, material):
+        """Mesh with one primitive; `normals` and `indices` may be accessor indices to share."""
+        if not isinstance(normals, int):
+            normals = self.add(normals, 34962, 5126, "VEC3")
+        if not isinstance(indices, int):
+            indices = self.add_indices(indices)
+        return {
+            "primitives": [{
+                "attributes": {
+                    "POSITION": self.add(positions, 34962, 5126, "VEC3", min_max=True),
+                    "NORMAL": normals,
+                },
+                "indices": indices,
+                "material": material,
+            }]
+        }
+
+
+def write_glb(boxes, filename, instancing=True):
+    origin, size, color = box_arrays(boxes)
+    colors, color_index = color_groups(color)
+    materials = [{
+        "pbrMetallicRoughness": {"baseColorFactor": c.tolist() + [1.0], "metallicFactor": 0.0, "roughnessFactor": 0.8},
+    } for c in colors]
+    gltf = _GltfBuilder()
+    meshes = []
+    nodes = [dict(GLTF_ROOT, children=[])]
+
+    if instancing:
+        shapes, shape_index = instance_groups(size, color)
+        # Material of each shape, in the order of `colors`
+        lookup = {tuple(c): n for n, c in enumerate(np.round(colors, 6).tolist())}
+        # Every cube has the same normals and triangles
+        normals = gltf.add(CUBE_NORMALS, 34962, 5126, "VEC3")
+        indices = gltf.add_indices(CUBE_INDICES)
+        for shape in shapes:
+            positions = (CUBE_POSITIONS * shape[:3]).astype(np.float32)
+            meshes.append(gltf.add_mesh(positions, normals, indices, lookup[tuple(shape[3:].tolist())]))
+        for b, mesh, base in zip(boxes, shape_index.tolist(), origin.tolist()):
+            nodes[0]["children"].append(len(nodes))
+            nodes.append({"name": b["name"], "mesh": mesh, "translation": base})
+    else:
+        for n in range(len(colors)):
+            members = np.flatnonzero(color_index == n)
+            positions, normals, indices = box_buffers(origin[members], size[members])
+            meshes.append(gltf.add_mesh(positions, normals, indices, n))
+            nodes[0]["children"].append(len(nodes))
+            nodes.append({"mesh": n})
+
+    document = {
+        "asset": {"version": "2.0", "generator": "civilcoding box_mesh"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": nodes,
+        "meshes": meshes,
+        "materials": materials,
+        "accessors": gltf.accessors,
+        "bufferViews": gltf.views,
+        "buffers": [{"byteLength": gltf.length}],
+    }
+    header = json.dumps(document, separators=(",", ":")).encode()
+    header += b" " * (-len(header) % 4)
+    with open(filename, "wb") as f:
+        f.write(struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(header) + 8 + gltf.length))
+        f.write(struct.pack("<II", len(header), 0x4E4F534A))
+        f.write(header)
+        f.write(struct.pack("<II", gltf.length, 0x004E4942))
+        for chunk in gltf.chunks:
+            f.write(chunk)
+
+
+def write_obj(boxes, filename):
+    """OBJ with 8 shared corners per box, faces grouped by colour material."""
+    origin, size, color = box_arrays(boxes)
+    colors, color_index = color_groups(color)
+    vertices = (origin[:, None, :] + CORNERS[None] * size[:, None, :]).reshape(-1, 3)
+    faces = (CORNER_TRIANGLES[None] + 8 * np.arange(len(boxes))[:, None] + 1).reshape(-1, 3)
+    mtl = os.path.splitext(filename)[0] + ".mtl"
+    with open(mtl, "w") as f:
+        for n, c in enumerate(colors):
+            f.write(f"newmtl color{n}\nKd {c[0]:.6g} {c[1]:.6g} {c[2]:.6g}\n\n")
+    with open(filename, "w") as f:
+        f.write(f"mtllib {os.path.basename(mtl)}\n")
+        np.savetxt(f, vertices, fmt="v %.6g %.6g %.6g")
+        triangles_of_box = faces.reshape(len(boxes), 12, 3)
+        for n in range(len(colors)):
+            f.write(f"usemtl color{n}\n")
+            np.savetxt(f, triangles_of_box[color_index == n].reshape(-1, 3), fmt="f %d %d %d")
+
+
+def write_stl(boxes, filename):
+    origin, size, _ = box_arrays(boxes)
+    positions, normals, indices = box_buffers(origin, size)
+    triangles = indices.reshape(-1, 3)
+    record = np.zeros(len(triangles), dtype=[("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+    record["normal"] = normals[triangles[:, 0]]
+    record["vertices"] = positions[triangles]
+    with open(filename, "wb") as f:
+        f.write(b"civilcoding box_mesh".ljust(80, b"\0"))
+        f.write(struct.pack("<I", len(triangles)))
+        record.tofile(f)
+
+
+WRITERS = {".glb": write_glb, ".obj": write_obj, ".stl": write_stl}
+
+
+def export(boxes, filename):
+    """Writes `boxes` in the format given by the file extension; returns the size in bytes."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unsupported mesh format '{ext}' (use {', '.join(WRITERS)})")
+    WRITERS[ext](boxes, filename)
+    return os.path.getsize(filename)
+
+
+def load_boxes(source):
+    """Boxes of a named model (gate, kitchen) or of a JSON file holding a list of boxes."""
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    if source == "gate":
+        sys.path.append(os.path.join(root, "FreeCADMacros", "GateWindow"))
+        from gate_boxes import gate_boxes
+        return gate_boxes()
+    if source == "kitchen":
+        sys.path.append(os.path.join(root, "Kitchen"))
+        from kitchen_model import c_shape_kitchen
+        return c_shape_kitchen()
+    with open(source) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python box_mesh.py {gate|kitchen|boxes.json} output.{glb|obj|stl}...")
+        sys.exit(1)
+    boxes = load_boxes(sys.argv[1])
+    for filename in sys.argv[2:]:
+        start = time.perf_counter()
+        size = export(boxes, filename)
+        elapsed = time.perf_counter() - start
+        print(f"Mesh saved: {filename} ({len(boxes)} boxes, {size / 1024:.1f} KiB, {elapsed * 1000:.1f} ms)")
@@ -0,0 +1,42 @@
+"""Start-up cost of the civilcoding CLI: `--help` stays light and within budget.
+
+Usage: python -m pytest test_civilcoding.py
+"""
+
+import os
+import subprocess
+import sys
+
+from civilcoding import STARTUP_BUDGET, measure_startup
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "civilcoding.py")
+HEAVY = ("ezdxf", "matplotlib", "numpy")
+
+# Runs the CLI as a script and lists the heavy modules loaded on the way,
+# nested imports included
+LOADED = f"""
+import runpy, sys
+sys.argv = [{CLI!r}, *sys.argv[1:]]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+print(" ".join(m for m in {HEAVY!r} if m in sys.modules))
+"""
+
+
+def heavy_imports(*argv):
+    result = subprocess.run([sys.executable, "-c", LOADED, *argv], capture_output=True, text=True, check=True)
+    return result.stdout.split("\n")[-2].split()
+
+
+def test_help_imports_nothing_heavy():
+    assert heavy_imports("--help") == []
+    assert heavy_imports("gate", "--help") == []
+    _, imports = measure_startup(["--help"], runs=1)
+    assert not [name for _, name in imports if name.split(".")[0] in HEAVY]
+
+
+def test_help_within_budget():
+    elapsed, _ = measure_startup(["--help"])
+    assert elapsed * 1000 <= STARTUP_BUDGET